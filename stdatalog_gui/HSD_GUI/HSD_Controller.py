@@ -21,16 +21,18 @@ import os
 import json
 import copy
 from threading import Thread, Event
+from concurrent.futures import Future
 from functools import partial
 import sys
 from enum import Enum
 
-from PySide6.QtCore import Qt, Signal, QThread, QObject
+import numpy as np
+
+from PySide6.QtCore import Qt, Signal, QThread, QObject, QTimer
 from PySide6.QtWidgets import QFileDialog
 
 from stdatalog_pnpl.DTDL.device_template_manager import DeviceCatalogManager
 from stdatalog_pnpl.PnPLCmd import PnPLCMDManager
-from stdatalog_pnpl.DTDL.device_template_model import ContentSchema, SchemaEnum
 from stdatalog_pnpl.DTDL.dtdl_utils import UnitMap
 import stdatalog_pnpl.DTDL.dtdl_utils as DTDLUtils
 
@@ -39,6 +41,9 @@ from stdatalog_core.HSD_utils.DataReader import DataReader
 
 from stdatalog_gui.STDTDL_Controller import ComponentType, STDTDL_Controller
 from stdatalog_gui.HSD_GUI.Widgets.HSDPlotLinesWidget import HSDPlotLinesWidget
+from stdatalog_gui.Utils.DataFileWriter import DataFileWriter, FlushPolicy
+from stdatalog_gui.Utils.AcquisitionScheduler import AcquisitionScheduler
+from stdatalog_gui.Utils.PnPLExecutor import PnPLCommandExecutor
 from stdatalog_gui.Utils.PlotParams import AnomalyDetectorModelPlotParams, ClassificationModelPlotParams, FFTAlgPlotParams, LinesPlotParams, MCTelemetriesPlotParams, PlotCheckBoxParams, PlotGaugeParams, PlotLabelParams, PlotPAmbientParams, PlotPMotionParams, PlotPObjectParams, PlotPPresenceParams, SensorLightPlotParams, SensorMemsPlotParams, SensorAudioPlotParams, SensorPowerPlotParams, SensorPresenscePlotParams, SensorRangingPlotParams, SensorPlotParams, PlotHeatMapParams
 
 from stdatalog_core.HSD.HSDatalog import HSDatalog
@@ -96,6 +101,8 @@ class WavConversionThread(QThread):
 
 class HSD_Controller(STDTDL_Controller):
     MAX_HSD_BANDWIDTH = 6000000
+    # Components whose status is changed by the FW itself (never served from the status cache)
+    UNCACHED_COMPONENTS = ["acquisition_info", "log_controller"]
     # Signals
     sig_is_waiting_auto_start = Signal(bool)
     sig_is_waiting_idle = Signal(bool)
@@ -103,6 +110,8 @@ class HSD_Controller(STDTDL_Controller):
     sig_is_auto_started_inner = Signal(bool)
     sig_tag_done = Signal(bool, str) #(on|off),tag_label
     sig_hsd_bandwidth_exceeded = Signal(bool)
+    sig_hsd_bandwidth_updated = Signal(float, float) #predicted, safe limit [bit/s]
+    sig_hsd_throughput_updated = Signal(float, float) #predicted, measured [bit/s]
     sig_lock_start_button = Signal(bool, str)
     sig_streaming_error = Signal(bool, str)
 
@@ -122,12 +131,134 @@ class HSD_Controller(STDTDL_Controller):
 
         def feed_data(self, data):
             if self.controller.dt_plugins_folder_path is not None:
+                # Shallow copy: the (immutable) payload bytes are shared with the Data Toolkit, not duplicated
                 a_data = copy.copy(data)
                 self.controller.sig_new_spt_data_ready.emit(a_data)
             super().feed_data(data)
 
-    class SensorAcquisitionThread(Thread):
-        def __init__(self, event, hsd_link, data_reader, d_id, comp_name, sensor_data_file, usb_dps, sig_streaming_error = None):
+    class ComponentAcquisition(object):
+        DEFAULT_POLL_INTERVAL = 0.02
+        MIN_POLL_INTERVAL = 0.005
+        MAX_POLL_INTERVAL = 0.1
+
+        def __init__(self, hsd_link, data_reader, d_id, comp_name, sensor_data_file, usb_dps, sig_streaming_error = None, batch_mode = True, data_rate = None):
+            """
+            Data acquisition (USB packets splitting, counters check, decoding and saving) of a streaming component.
+            Args:
+                hsd_link (HSDLink): link used to get the component data
+                data_reader (DataReader): reader used to decode the component data
+                d_id (int): device id
+                comp_name (str): component name
+                sensor_data_file (file object): .dat file (None if data are not saved)
+                usb_dps (int): USB packet payload size
+                sig_streaming_error (Signal): signal used to notify streaming errors
+                batch_mode (bool): if True the USB packets are processed in a single vectorized operation
+                data_rate (float): expected component data rate [bytes/s], used to tune the polling period
+            """
+            self.hsd_link = hsd_link
+            self.data_reader = data_reader
+            self.d_id = d_id
+            self.comp_name = comp_name
+            self.sensor_data_file = sensor_data_file
+            self.sig_streaming_error = sig_streaming_error
+            self.usb_dps = usb_dps
+            self.over_proto = 0
+            self.t0 = 0
+            self.prev_cnt = 0
+            # Batch mode: view the whole USB buffer as an array of [int32 counter | usb_dps payload] packets
+            self.batch_mode = batch_mode and usb_dps is not None and usb_dps > 0
+            self.packet_dtype = np.dtype([("cnt", "=i4"), ("payload", "u1", (usb_dps,))]) if self.batch_mode else None
+            self.poll_interval = self.get_poll_interval(data_rate)
+            self.received_bytes = 0
+
+        def get_poll_interval(self, data_rate):
+            # Poll about once per USB packet (time needed to fill usb_dps bytes at the expected data rate)
+            if data_rate is None or data_rate <= 0 or not self.usb_dps:
+                return HSD_Controller.ComponentAcquisition.DEFAULT_POLL_INTERVAL
+            return min(max(self.usb_dps / data_rate, HSD_Controller.ComponentAcquisition.MIN_POLL_INTERVAL), HSD_Controller.ComponentAcquisition.MAX_POLL_INTERVAL)
+
+        def raise_empty_data_error(self):
+            error_msg = "No data from {} Component.\nRestart the acquisition lowering component ODR to acquire data correctly.\nHave a look in {} log file for more detailed info.".format(self.comp_name, log_file_name if log_file_name is not None else "application")
+            log.error(error_msg)
+            if self.sig_streaming_error is not None:
+                self.sig_streaming_error.emit(True, error_msg)
+        
+        def report_streaming_error(self, nof_lost_packets, lost_bytes, byte_offset = None):
+            offset_str = "" if byte_offset is None else " at byte offset {}".format(byte_offset)
+            error_msg = "Streaming errors in {} component!\n{} USB packets ({} bytes) lost{}.\nHave a look in {} log file for more detailed info.".format(self.comp_name, nof_lost_packets, lost_bytes, offset_str, log_file_name if log_file_name is not None else "application")
+            if self.sig_streaming_error is not None:
+                self.sig_streaming_error.emit(True, error_msg)
+            log.error(error_msg)
+
+        def check_packet_counters(self, counters):
+            """
+            Check all the USB packet counters of a buffer in one vectorized operation.
+            Each counter must be incremented by usb_dps w.r.t. the previous one (0 marks the stream start).
+            Args:
+                counters (np.ndarray): int32 counters of the USB packets contained in the buffer
+            Returns:
+                (np.ndarray, np.ndarray): indexes of the packets that follow a gap and the related counter deltas
+            """
+            prev_cnts = np.empty(len(counters), dtype=np.int64)
+            prev_cnts[0] = self.prev_cnt
+            prev_cnts[1:] = counters[:-1]
+            diffs = counters.astype(np.int64) - prev_cnts
+            gaps = np.flatnonzero((counters != 0) & (diffs != self.usb_dps))
+            return gaps, diffs[gaps]
+
+        def feed_packets_batch(self, raw_data):
+            packet_size = self.usb_dps + 4
+            nof_usb_packet = len(raw_data) // packet_size
+            if nof_usb_packet == 0:
+                return
+            packets = np.frombuffer(raw_data, dtype=self.packet_dtype, count=nof_usb_packet)
+            counters = packets["cnt"]
+            gaps, diffs = self.check_packet_counters(counters)
+            if len(gaps) > 0:
+                for p, diff in zip(gaps.tolist(), diffs.tolist()):
+                    log.error("{} streaming gap at byte offset {}: counter delta {} (expected {})".format(self.comp_name, p * packet_size, diff, self.usb_dps))
+                lost_bytes = int(diffs.sum())
+                self.report_streaming_error(int(lost_bytes // self.usb_dps), lost_bytes, int(gaps[0]) * packet_size)
+            self.prev_cnt = int(counters[-1])
+            # Counters stripped with a single copy: the whole payload is decoded with one feed_data call
+            self.data_reader.feed_data(DataClass(self.comp_name, packets["payload"].tobytes()))
+
+        def feed_packets(self, raw_data):
+            raw_data = memoryview(raw_data) # zero-copy packet slicing
+            nof_usb_packet = len(raw_data)/(self.usb_dps + 4)
+            for p in range(int(nof_usb_packet)):
+                curr_cnt = struct.unpack_from("=i", raw_data, p*(self.usb_dps + 4))[0]
+                diff = curr_cnt - self.prev_cnt
+                if curr_cnt != 0 and diff != self.usb_dps:
+                    self.report_streaming_error(int(diff//self.usb_dps), diff)
+                self.prev_cnt = curr_cnt
+
+                self.data_reader.feed_data(DataClass(self.comp_name, raw_data[p*(self.usb_dps + 4)+4: (p+1)*(self.usb_dps+4)]))
+
+        def get_payload_bytes(self):
+            # Received bytes without the USB packet counters, comparable with the predicted sensor bandwidth
+            if self.usb_dps:
+                return self.received_bytes * self.usb_dps // (self.usb_dps + 4)
+            return self.received_bytes
+
+        def process_sensor_data(self, raw_data):
+            self.received_bytes += len(raw_data)
+            if self.batch_mode:
+                self.feed_packets_batch(raw_data)
+            else:
+                self.feed_packets(raw_data)
+            if self.sensor_data_file is not None:
+                self.sensor_data_file.write(raw_data)
+
+        def poll(self):
+            sensor_data = self.hsd_link.get_sensor_data(self.d_id, self.comp_name)
+            if sensor_data is None:
+                return 0
+            self.process_sensor_data(sensor_data[1])
+            return max(len(sensor_data[1]), 1)
+
+    class SensorAcquisitionThread(Thread, ComponentAcquisition):
+        def __init__(self, event, hsd_link, data_reader, d_id, comp_name, sensor_data_file, usb_dps, sig_streaming_error = None, batch_mode = True):
 
             class EmptyDataTimer(QObject):
                 timeout_signal = Signal()
@@ -144,52 +275,22 @@ class HSD_Controller(STDTDL_Controller):
                         self.timeout_signal.emit()
             
             Thread.__init__(self)
+            HSD_Controller.ComponentAcquisition.__init__(self, hsd_link, data_reader, d_id, comp_name, sensor_data_file, usb_dps, sig_streaming_error, batch_mode)
             self.name = comp_name
             self.stopped = event
-            self.hsd_link = hsd_link
-            self.data_reader = data_reader
-            self.d_id = d_id
-            self.comp_name = comp_name
-            self.sensor_data_file = sensor_data_file
-            self.sig_streaming_error = sig_streaming_error
-            self.usb_dps = usb_dps
-            self.over_proto = 0
-            self.t0 = 0
-            self.prev_cnt = 0
 
             self.objThread = QThread()
             self.obj = EmptyDataTimer(comp_name)
             self.obj.moveToThread(self.objThread)
             self.obj.timeout_signal.connect(self.raise_empty_data_error)
             self.objThread.started.connect(self.obj.run_wait)
-        
-        def raise_empty_data_error(self):
-            error_msg = "No data from {} Component.\nRestart the acquisition lowering component ODR to acquire data correctly.\nHave a look in {} log file for more detailed info.".format(self.comp_name, log_file_name if log_file_name is not None else "application")
-            log.error(error_msg)
-            if self.sig_streaming_error is not None:
-                self.sig_streaming_error.emit(True, error_msg)
-        
+
         def run(self):
             while not self.stopped.wait(0.02):
             # while not self.stopped.wait(1):
-                sensor_data = self.hsd_link.get_sensor_data(self.d_id, self.comp_name)
-                if sensor_data is not None:
+                if self.poll() > 0:
                     if self.objThread.isRunning():
                         self.obj.interrupt_event.set()
-                    nof_usb_packet = len(sensor_data[1])/(self.usb_dps + 4)
-                    for p in range(int(nof_usb_packet)):
-                        curr_cnt = struct.unpack("=i",sensor_data[1][p*(self.usb_dps + 4): p*(self.usb_dps + 4)+4])[0]
-                        diff = curr_cnt - self.prev_cnt
-                        if curr_cnt != 0 and diff != self.usb_dps:
-                            error_msg = "Streaming errors in {} component!\n{} USB packets ({} bytes) lost.\nHave a look in {} log file for more detailed info.".format(self.comp_name, int(diff//self.usb_dps), diff, log_file_name if log_file_name is not None else "application")
-                            if self.sig_streaming_error is not None:
-                                self.sig_streaming_error.emit(True, error_msg)
-                            log.error(error_msg)
-                        self.prev_cnt = curr_cnt
-
-                        self.data_reader.feed_data(DataClass(self.comp_name, sensor_data[1][p*(self.usb_dps + 4)+4: (p+1)*(self.usb_dps+4)]))
-                    if self.sensor_data_file is not None:
-                        self.sensor_data_file.write(sensor_data[1])
                 else:
                     self.objThread.start()
             if self.objThread.isRunning():
@@ -267,9 +368,39 @@ class HSD_Controller(STDTDL_Controller):
         self.automode_enabled = False #False:DISABLED, True:ENABLED
         self.automode_status = AutomodeStatus.AUTOMODE_UNSTARTED
         self.curr_bandwidth = 0
+        # Predicted bandwidth [bit/s] of each enabled sensor (curr_bandwidth is their sum, see update_component_bandwidth)
+        self.bandwidth_contributions = dict()
+        # Measured payload throughput [bit/s] of each streaming component (see __measure_throughput)
+        self.measured_throughput = dict()
+        self.peak_measured_bandwidth = 0
+        self.__throughput_samples = dict()
+        self.throughput_timer = QTimer(self)
+        self.throughput_timer.setInterval(1000)
+        self.throughput_timer.timeout.connect(self.__measure_throughput)
         self.config_error_dict = {}
+        # Component status cache (see get_component_status)
+        self.status_cache = dict()
+        self.status_cache_valid = False
+        self.stale_components = set()
+        self.status_reads_cnt = 0
+        # PnPL commands are serialized by a single worker thread (see send_command_async)
+        self.pnpl_executor = PnPLCommandExecutor(self)
         self.enabled_stream_comp_set = set()
         self.save_files_flag = True
+        self.acquisition_batch_mode = True
+        # Streaming components are polled by a shared AcquisitionScheduler (one thread per component if False)
+        self.use_acquisition_scheduler = True
+        self.acquisition_workers = 2
+        self.acquisition_scheduler = None
+        # .dat files write-behind settings (see DataFileWriter)
+        self.data_file_writer_params = {
+            "max_queue_size": 1024,
+            "coalesce_size": 4*1024*1024,
+            "flush_policy": FlushPolicy.ON_CLOSE,
+            "flush_interval": 1.0,
+            "fsync": False,
+            "block_when_full": False
+        }
         self.auto_started = False
         #Motor Control 
         self.mcp_is_connected = False
@@ -355,7 +486,7 @@ class HSD_Controller(STDTDL_Controller):
     def refresh(self):
         try:
             if self.hsd_link is not None:
-                self.hsd_link.close()
+                self.pnpl_executor.call(self.hsd_link.close, name="close")
             hsd_link_factory = HSDLink()
             self.hsd_link = hsd_link_factory.create_hsd_link()
             
@@ -372,10 +503,11 @@ class HSD_Controller(STDTDL_Controller):
         except Exception as err:
             log.error("Error: {}".format(err))
             if self.hsd_link is not None:
-                self.hsd_link.close()
+                self.pnpl_executor.call(self.hsd_link.close, name="close")
             self.is_hsd_link_up = False
             self.sig_com_init_error.emit()
         self.sensors_threads = []
+        self.acquisition_scheduler = None
         self.threads_stop_flags = []
         self.sensor_data_files = []
         self.data_readers = []
@@ -387,25 +519,68 @@ class HSD_Controller(STDTDL_Controller):
     def get_device_list(self):
         devices = []
         if self.hsd_link is not None:
-            devices = self.hsd_link.get_devices() 
+            devices = self.pnpl_executor.call(self.hsd_link.get_devices, name="get_devices")
         return devices
     
     def get_device_presentation_string(self, d_id = 0):
         if type(self.hsd_link) == HSDLink_v1:
             return None
-        return self.hsd_link.get_device_presentation_string(d_id)
+        return self.pnpl_executor.call(self.hsd_link.get_device_presentation_string, d_id, name="get_device_presentation_string")
 
     def get_device_info(self, d_id = 0):
-        return self.hsd_link.get_device_info(d_id)
+        return self.pnpl_executor.call(self.hsd_link.get_device_info, d_id, name="get_device_info")
     
     def get_firmware_info(self, d_id = 0):
-        return self.hsd_link.get_firmware_info(d_id)
+        return self.pnpl_executor.call(self.hsd_link.get_firmware_info, d_id, name="get_firmware_info")
     
     def get_acquisition_info(self, d_id = 0):
-        return self.hsd_link.get_acquisition_info(d_id)
+        return self.pnpl_executor.call(self.hsd_link.get_acquisition_info, d_id, name="get_acquisition_info")
     
     def get_device_status(self):
-        return self.hsd_link.get_device_status(self.device_id)
+        dev_status = self.pnpl_executor.call(self.hsd_link.get_device_status, self.device_id, name="get_device_status")
+        self.__update_status_cache(dev_status)
+        return dev_status
+
+    def __update_status_cache(self, dev_status):
+        try:
+            components = dev_status["devices"][self.device_id]["components"]
+        except (KeyError, IndexError, TypeError):
+            return
+        self.status_cache.clear()
+        for c in components:
+            self.status_cache.update(c)
+        self.stale_components.clear()
+        self.status_cache_valid = True
+
+    def refresh_status_cache(self):
+        """
+        Fill the component status cache with a single (bulk) device status read.
+        """
+        self.status_reads_cnt += 1
+        try:
+            self.get_device_status()
+        except Exception as e:
+            log.warning("Device status read failed: {}".format(e))
+
+    def invalidate_component_status(self, comp_name = None):
+        """
+        Mark the cached status of a component as stale (re-read at its next get_component_status).
+        Args:
+            comp_name (str): component name (None: whole cache, re-read with a single device status read)
+        """
+        if comp_name is None:
+            self.status_cache_valid = False
+            self.stale_components.clear()
+        else:
+            self.stale_components.add(comp_name)
+
+    def invalidate_sensor_status(self, comp_name):
+        # Sensor components sharing the same physical sensor (e.g. iis3dwb_acc and iis3dwb_mlc) are configured together
+        sensor_name = comp_name.split('_')[0]
+        for cn in self.components_dtdl:
+            if cn.split('_')[0] == sensor_name:
+                self.invalidate_component_status(cn)
+        self.invalidate_component_status(comp_name)
 
     def load_device_template(self, board_id, fw_id):
         self.sig_dtm_loading_started.emit()
@@ -413,7 +588,7 @@ class HSD_Controller(STDTDL_Controller):
         if dev_template_json == "":
             log.error("Connected device not supported (Unrecognized board_id, fw_id)")
         if isinstance(dev_template_json,dict):
-            fw_name = self.hsd_link.get_firmware_info(self.device_id).get("firmware_info").get("fw_name")
+            fw_name = self.pnpl_executor.call(self.hsd_link.get_firmware_info, self.device_id, name="get_firmware_info").get("firmware_info").get("fw_name")
             if fw_name is not None:
                 splitted_fw_name = fw_name.lower().split("-")
                 reformatted_fw_name = "".join([splitted_fw_name[0]] + [f.capitalize() for f in splitted_fw_name[1:]])
@@ -422,7 +597,7 @@ class HSD_Controller(STDTDL_Controller):
                     dev_template_json = dev_template_json[dt]
                     break        
         super().load_local_device_template(dev_template_json)
-        self.hsd_link.set_device_template(dev_template_json)
+        self.pnpl_executor.call(self.hsd_link.set_device_template, dev_template_json, name="set_device_template")
         self.sig_dtm_loading_completed.emit()
         
     def load_local_device_template(self, input_dt_file_path):
@@ -430,7 +605,7 @@ class HSD_Controller(STDTDL_Controller):
             dev_template_json = json.load(json_file)
             json_file.close()
         super().load_local_device_template(dev_template_json)
-        self.hsd_link.set_device_template(dev_template_json)
+        self.pnpl_executor.call(self.hsd_link.set_device_template, dev_template_json, name="set_device_template")
 
     def add_custom_device_template(self, input_dt_file_path, board_id = 255, fw_id = 255):
         with open(input_dt_file_path, 'r', encoding='utf-8') as json_file:
@@ -440,66 +615,89 @@ class HSD_Controller(STDTDL_Controller):
             DeviceCatalogManager.add_dtdl_model(board_id, fw_id, dtdl_model_name, str(dev_template_json))
 
     def is_sensor_enabled(self, comp_name, d_id = 0):
-        return self.hsd_link.get_sensor_enable(d_id, comp_name)
+        if d_id == self.device_id:
+            comp_status = self.get_component_status(comp_name)
+            if comp_status is not None and "enable" in comp_status.get(comp_name, {}):
+                return comp_status[comp_name]["enable"]
+        return self.pnpl_executor.call(self.hsd_link.get_sensor_enable, d_id, comp_name, name="get_sensor_enable")
     
     def get_component_status(self, comp_name):
-        return self.hsd_link.get_component_status(self.device_id, comp_name)
+        """
+        Component status, served from the status cache when possible (a USB PnPL round trip otherwise).
+        The cache is filled by a single device status read and kept up to date by send_command.
+        Returns:
+            dict: {comp_name: component status} (a copy: callers can modify it)
+        """
+        if type(self.hsd_link) != HSDLink_v1 and comp_name not in HSD_Controller.UNCACHED_COMPONENTS:
+            if not self.status_cache_valid:
+                self.refresh_status_cache()
+            if comp_name in self.status_cache and comp_name not in self.stale_components:
+                return {comp_name: copy.deepcopy(self.status_cache[comp_name])}
+        self.status_reads_cnt += 1
+        comp_status = self.pnpl_executor.call(self.hsd_link.get_component_status, self.device_id, comp_name, name="get_component_status")
+        self.__cache_component_status(comp_name, comp_status)
+        return comp_status
+
+    def get_component_status_async(self, comp_name, callback = None):
+        """
+        Non blocking get_component_status: callback is called on the GUI thread with the component status
+        (immediately, if it is served from the status cache).
+        Returns:
+            concurrent.futures.Future: {comp_name: component status}
+        """
+        if type(self.hsd_link) != HSDLink_v1 and comp_name not in HSD_Controller.UNCACHED_COMPONENTS \
+            and self.status_cache_valid and comp_name in self.status_cache and comp_name not in self.stale_components:
+            future = Future()
+            future.set_result({comp_name: copy.deepcopy(self.status_cache[comp_name])})
+            if callback is not None:
+                callback(future.result())
+            return future
+        self.status_reads_cnt += 1
+        return self.pnpl_executor.submit(self.hsd_link.get_component_status, self.device_id, comp_name, name="get_component_status",
+                                         callback=partial(self.__component_status_received, comp_name, callback))
+
+    def __component_status_received(self, comp_name, callback, comp_status):
+        self.__cache_component_status(comp_name, comp_status)
+        if callback is not None:
+            callback(comp_status)
+
+    def __cache_component_status(self, comp_name, comp_status):
+        if comp_status is not None and comp_name in comp_status:
+            self.status_cache[comp_name] = copy.deepcopy(comp_status[comp_name])
+            self.stale_components.discard(comp_name)
 
-    def __get_property_enum_value(self, prop_name, comp_status, comp_interface):
+    def get_pnpl_stats(self):
+        return self.pnpl_executor.get_stats()
+
+    def __get_property_enum_value(self, prop_name, comp_status, comp_schema):
         """
         Retrieve the value of a enumerative property from the component status and interface.
         Args:
             prop_name (str): The name of the property to retrieve.
             comp_status (dict): A dictionary containing the status of various components.
-            comp_interface (object): An object representing the component interface, which contains the property schema.
+            comp_schema (ComponentSchemaIndex): The indexed component interface, which contains the property schema.
         Returns:
             The value of the property if it exists and has an associated schema.
         """
         if prop_name in comp_status:
-            prop_index = comp_status[prop_name]
-            prop_schema = [c for c in comp_interface.contents if c.name == prop_name][0].schema
-            if not isinstance(prop_schema, ContentSchema):
-                return prop_index
-            prop_value = prop_schema.enum_values[prop_index].enum_value
-            return prop_value
+            return comp_schema.get_enum_value(prop_name, comp_status[prop_name])
         else:
             return None
 
-    def __get_hsd_comp_property_enum_number_value(self, prop_name, comp_status, comp_interface):
+    def __get_hsd_comp_property_enum_number_value(self, prop_name, comp_status, comp_schema):
         if prop_name in comp_status:
-            prop_index = comp_status[prop_name]
-            prop_schema = [c for c in comp_interface.contents if c.name == prop_name][0].schema
-            if not isinstance(prop_schema, ContentSchema):
-                return prop_index
-            prop_enum_dname = prop_schema.enum_values[prop_index].display_name
-            prop_enum_value_schema = prop_schema.value_schema            
-            prop_value = prop_enum_dname if isinstance(prop_enum_dname, str) else prop_enum_dname.en
-            prop_value = prop_value.replace(',','.')
-            if prop_enum_value_schema == SchemaEnum.INTEGER:
-                try:
-                    return float(prop_value)
-                except ValueError as e:
-                    print(e)
-                    return prop_index
-            else:
-                return prop_value
+            return comp_schema.get_enum_number(prop_name, comp_status[prop_name])
         else:
             return None
         
-    def __get_hsd_comp_property_enum_string_value(self, prop_name, comp_status, comp_interface):
+    def __get_hsd_comp_property_enum_string_value(self, prop_name, comp_status, comp_schema):
         if prop_name in comp_status:
-            prop_index = comp_status[prop_name]
-            prop_schema = [c for c in comp_interface.contents if c.name == prop_name][0].schema
-            if not isinstance(prop_schema, ContentSchema):
-                return prop_index
-            prop_enum_dname = prop_schema.enum_values[prop_index].display_name
-            prop_value = prop_enum_dname if isinstance(prop_enum_dname, str) else prop_enum_dname.en
-            return prop_value
+            return comp_schema.get_enum_display_name(prop_name, comp_status[prop_name])
         else:
             return None
 
-    def __get_mems_sensor_odr(self, comp_status, comp_interface):
-        ret = self.__get_hsd_comp_property_enum_number_value("odr", comp_status, comp_interface)
+    def __get_mems_sensor_odr(self, comp_status, comp_schema):
+        ret = self.__get_hsd_comp_property_enum_number_value("odr", comp_status, comp_schema)
         if ret is not None:
             return ret
         return 1
@@ -510,8 +708,8 @@ class HSD_Controller(STDTDL_Controller):
             return float(odr_value)
         return None
     
-    def __get_presence_sensor_odr(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_number_value("odr", comp_status, comp_interface)
+    def __get_presence_sensor_odr(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_number_value("odr", comp_status, comp_schema)
 
     def __get_light_sensor_odr(self, comp_status):
         if "intermeasurement_time" in comp_status:
@@ -523,43 +721,43 @@ class HSD_Controller(STDTDL_Controller):
                 return float(1/(extime_value + 6))
         return None
 
-    def __get_light_sensor_channel1_gain(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_number_value("channel1_gain", comp_status, comp_interface)
+    def __get_light_sensor_channel1_gain(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_number_value("channel1_gain", comp_status, comp_schema)
     
-    def __get_light_sensor_channel2_gain(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_number_value("channel2_gain", comp_status, comp_interface)
+    def __get_light_sensor_channel2_gain(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_number_value("channel2_gain", comp_status, comp_schema)
     
-    def __get_light_sensor_channel3_gain(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_number_value("channel3_gain", comp_status, comp_interface)
+    def __get_light_sensor_channel3_gain(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_number_value("channel3_gain", comp_status, comp_schema)
     
-    def __get_light_sensor_channel4_gain(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_number_value("channel4_gain", comp_status, comp_interface)
+    def __get_light_sensor_channel4_gain(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_number_value("channel4_gain", comp_status, comp_schema)
     
-    def __get_light_sensor_channel5_gain(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_number_value("channel5_gain", comp_status, comp_interface)
+    def __get_light_sensor_channel5_gain(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_number_value("channel5_gain", comp_status, comp_schema)
     
-    def __get_light_sensor_channel6_gain(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_number_value("channel6_gain", comp_status, comp_interface)
+    def __get_light_sensor_channel6_gain(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_number_value("channel6_gain", comp_status, comp_schema)
     
-    def __get_powermeter_sensor_odr(self, comp_status, comp_interface):
-        ret = self.__get_hsd_comp_property_enum_number_value("adc_conversion_time", comp_status, comp_interface)
+    def __get_powermeter_sensor_odr(self, comp_status, comp_schema):
+        ret = self.__get_hsd_comp_property_enum_number_value("adc_conversion_time", comp_status, comp_schema)
         if ret is not None:
             return float(1000000/float(ret))
         return None
 
-    def __get_audio_sensor_odr(self, comp_status, comp_interface):
-        return self.__get_mems_sensor_odr(comp_status, comp_interface)
+    def __get_audio_sensor_odr(self, comp_status, comp_schema):
+        return self.__get_mems_sensor_odr(comp_status, comp_schema)
     
-    def __get_mems_sensor_fs(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_number_value("fs", comp_status, comp_interface)
+    def __get_mems_sensor_fs(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_number_value("fs", comp_status, comp_schema)
     
-    def __get_audio_sensor_aop(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_number_value("aop", comp_status, comp_interface)
+    def __get_audio_sensor_aop(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_number_value("aop", comp_status, comp_schema)
 
-    def __get_sensor_unit(self, prop_w_unit_name, comp_status, comp_interface):
+    def __get_sensor_unit(self, prop_w_unit_name, comp_status, comp_schema):
         if prop_w_unit_name in comp_status:
-            prop_content = [c for c in comp_interface.contents if c.name == prop_w_unit_name][0]
-            
+            prop_content = comp_schema.get_content(prop_w_unit_name)
+            unit = ""
             if prop_content.unit is not None:
                 unit = prop_content.unit
             elif prop_content.display_unit is not None:
@@ -572,40 +770,40 @@ class HSD_Controller(STDTDL_Controller):
             return unit
         return ""
     
-    def __get_mems_sensor_unit(self, comp_status, comp_interface):
-        return self.__get_sensor_unit("fs", comp_status, comp_interface)
+    def __get_mems_sensor_unit(self, comp_status, comp_schema):
+        return self.__get_sensor_unit("fs", comp_status, comp_schema)
     
-    def __get_audio_sensor_unit(self, comp_status, comp_interface):
-        return self.__get_sensor_unit("aop", comp_status, comp_interface)
+    def __get_audio_sensor_unit(self, comp_status, comp_schema):
+        return self.__get_sensor_unit("aop", comp_status, comp_schema)
     
-    def __get_ranging_sensor_unit(self, comp_status, comp_interface):
+    def __get_ranging_sensor_unit(self, comp_status, comp_schema):
         return ""
     
-    def __get_ranging_sensor_resolution(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_string_value("resolution", comp_status, comp_interface)
+    def __get_ranging_sensor_resolution(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_string_value("resolution", comp_status, comp_schema)
     
-    def __get_ranging_sensor_ranging_mode(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_string_value("ranging_mode", comp_status, comp_interface)
+    def __get_ranging_sensor_ranging_mode(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_string_value("ranging_mode", comp_status, comp_schema)
     
-    def __get_presence_sensor_avg_tobject_num(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_number_value("avg_tobject_num", comp_status, comp_interface)
+    def __get_presence_sensor_avg_tobject_num(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_number_value("avg_tobject_num", comp_status, comp_schema)
     
-    def __get_presence_sensor_avg_tambient_num(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_number_value("avg_tambient_num", comp_status, comp_interface)
+    def __get_presence_sensor_avg_tambient_num(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_number_value("avg_tambient_num", comp_status, comp_schema)
     
-    def __get_presence_sensor_lpf_p_m_bandwidth(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_number_value("lpf_p_m_bandwidth", comp_status, comp_interface)
+    def __get_presence_sensor_lpf_p_m_bandwidth(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_number_value("lpf_p_m_bandwidth", comp_status, comp_schema)
     
-    def __get_presence_sensor_lpf_p_bandwidth(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_number_value("lpf_p_bandwidth", comp_status, comp_interface)
+    def __get_presence_sensor_lpf_p_bandwidth(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_number_value("lpf_p_bandwidth", comp_status, comp_schema)
     
-    def __get_presence_sensor_lpf_m_bandwidth(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_number_value("lpf_m_bandwidth", comp_status, comp_interface)
+    def __get_presence_sensor_lpf_m_bandwidth(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_number_value("lpf_m_bandwidth", comp_status, comp_schema)
     
-    def __get_presence_sensor_compensation_type(self, comp_status, comp_interface):
-        return self.__get_hsd_comp_property_enum_string_value("compensation_type", comp_status, comp_interface)
+    def __get_presence_sensor_compensation_type(self, comp_status, comp_schema):
+        return self.__get_hsd_comp_property_enum_string_value("compensation_type", comp_status, comp_schema)
     
-    def __get_mc_telemetry_unit(self, telemetry_status, comp_interface):
+    def __get_mc_telemetry_unit(self, telemetry_status, comp_schema):
         print(telemetry_status)
         pass
 
@@ -617,6 +815,7 @@ class HSD_Controller(STDTDL_Controller):
     def get_plot_params(self, comp_name, comp_type, comp_interface, comp_status):
         if comp_status is not None and comp_name in comp_status:
             if comp_type.name == ComponentType.SENSOR.name:
+                comp_schema = self.get_component_schema(comp_name)
                 comp_status_value = comp_status[comp_name]
                 enabled = comp_status_value["enable"]
                 s_category = comp_status_value.get("sensor_category")
@@ -624,12 +823,12 @@ class HSD_Controller(STDTDL_Controller):
                 dimension = comp_status_value.get("dim", 1)
 
                 if s_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_MEMS.value:
-                    odr = self.__get_mems_sensor_odr(comp_status_value, comp_interface)
-                    unit = self.__get_mems_sensor_unit(comp_status_value, comp_interface)
+                    odr = self.__get_mems_sensor_odr(comp_status_value, comp_schema)
+                    unit = self.__get_mems_sensor_unit(comp_status_value, comp_schema)
                     return SensorMemsPlotParams(comp_name, enabled, odr, dimension, unit)
                 elif s_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_AUDIO.value:
-                    odr = self.__get_audio_sensor_odr(comp_status_value, comp_interface)
-                    unit = self.__get_audio_sensor_unit(comp_status_value, comp_interface)
+                    odr = self.__get_audio_sensor_odr(comp_status_value, comp_schema)
+                    unit = self.__get_audio_sensor_unit(comp_status_value, comp_schema)
                     return SensorAudioPlotParams(comp_name, enabled, odr, dimension, unit)
                 elif s_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_RANGING.value:
                     resolution = comp_status_value.get("resolution")
@@ -656,10 +855,10 @@ class HSD_Controller(STDTDL_Controller):
                     plots_params_dict["Power"] = SensorPlotParams(comp_name, enabled, 1, "mW")
                     return SensorPowerPlotParams(comp_name, enabled, plots_params_dict)
                 else: #Maintain compatibility with OLD versions (< SensorManager v3 [NO SENSOR CATEGORIES])
-                    odr = self.__get_mems_sensor_odr(comp_status_value, comp_interface)
-                    unit = self.__get_mems_sensor_unit(comp_status_value, comp_interface)
+                    odr = self.__get_mems_sensor_odr(comp_status_value, comp_schema)
+                    unit = self.__get_mems_sensor_unit(comp_status_value, comp_schema)
                     if unit == "":
-                        unit = self.__get_audio_sensor_unit(comp_status_value, comp_interface)
+                        unit = self.__get_audio_sensor_unit(comp_status_value, comp_schema)
                     return SensorMemsPlotParams(comp_name, enabled, odr, dimension, unit)
             
             elif comp_type.name == ComponentType.ALGORITHM.name:
@@ -708,7 +907,7 @@ class HSD_Controller(STDTDL_Controller):
             if ct == ComponentType.SENSOR.name:
                 plot_params = self.get_plot_params(comp_name, comp_type, self.components_dtdl[comp_name], comp_status)
                 self.sig_sensor_component_updated.emit(comp_name, plot_params)
-                self.check_hsd_bandwidth()
+                self.check_hsd_bandwidth(comp_name)
             elif  ct == ComponentType.ALGORITHM.name:
                 plot_params = self.get_plot_params(comp_name, comp_type, self.components_dtdl[comp_name], comp_status)
                 self.sig_algorithm_component_updated.emit(comp_name, plot_params)
@@ -721,46 +920,46 @@ class HSD_Controller(STDTDL_Controller):
         if self.data_pipeline is not None:
                 components_status_exp = copy.deepcopy(self.components_status)
                 for cs in components_status_exp:
-                    comp_interface = self.components_dtdl[cs]
+                    comp_schema = self.get_component_schema(cs)
                     comp_status_value = self.components_status[cs]
                     s_category = comp_status_value.get("sensor_category")
 
                     if s_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_MEMS.value:
-                        components_status_exp[cs]["odr"] = self.__get_mems_sensor_odr(comp_status_value, comp_interface)
-                        components_status_exp[cs]["fs"] = self.__get_mems_sensor_fs(comp_status_value, comp_interface)
+                        components_status_exp[cs]["odr"] = self.__get_mems_sensor_odr(comp_status_value, comp_schema)
+                        components_status_exp[cs]["fs"] = self.__get_mems_sensor_fs(comp_status_value, comp_schema)
                     elif s_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_AUDIO.value:
-                        components_status_exp[cs]["odr"] = self.__get_audio_sensor_odr(comp_status_value, comp_interface)
-                        components_status_exp[cs]["aop"] = self.__get_audio_sensor_aop(comp_status_value, comp_interface)
+                        components_status_exp[cs]["odr"] = self.__get_audio_sensor_odr(comp_status_value, comp_schema)
+                        components_status_exp[cs]["aop"] = self.__get_audio_sensor_aop(comp_status_value, comp_schema)
                     elif s_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_RANGING.value:
-                        components_status_exp[cs]["resolution"] = self.__get_ranging_sensor_resolution(comp_status_value, comp_interface)
-                        components_status_exp[cs]["ranging_mode"] = self.__get_ranging_sensor_ranging_mode(comp_status_value, comp_interface)
+                        components_status_exp[cs]["resolution"] = self.__get_ranging_sensor_resolution(comp_status_value, comp_schema)
+                        components_status_exp[cs]["ranging_mode"] = self.__get_ranging_sensor_ranging_mode(comp_status_value, comp_schema)
                     elif s_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_LIGHT.value:
-                        components_status_exp[cs]["channel1_gain"] = self.__get_light_sensor_channel1_gain(comp_status_value, comp_interface)
-                        components_status_exp[cs]["channel2_gain"] = self.__get_light_sensor_channel2_gain(comp_status_value, comp_interface)
-                        components_status_exp[cs]["channel3_gain"] = self.__get_light_sensor_channel3_gain(comp_status_value, comp_interface)
-                        components_status_exp[cs]["channel4_gain"] = self.__get_light_sensor_channel4_gain(comp_status_value, comp_interface)
-                        components_status_exp[cs]["channel5_gain"] = self.__get_light_sensor_channel5_gain(comp_status_value, comp_interface)
-                        components_status_exp[cs]["channel6_gain"] = self.__get_light_sensor_channel6_gain(comp_status_value, comp_interface)
+                        components_status_exp[cs]["channel1_gain"] = self.__get_light_sensor_channel1_gain(comp_status_value, comp_schema)
+                        components_status_exp[cs]["channel2_gain"] = self.__get_light_sensor_channel2_gain(comp_status_value, comp_schema)
+                        components_status_exp[cs]["channel3_gain"] = self.__get_light_sensor_channel3_gain(comp_status_value, comp_schema)
+                        components_status_exp[cs]["channel4_gain"] = self.__get_light_sensor_channel4_gain(comp_status_value, comp_schema)
+                        components_status_exp[cs]["channel5_gain"] = self.__get_light_sensor_channel5_gain(comp_status_value, comp_schema)
+                        components_status_exp[cs]["channel6_gain"] = self.__get_light_sensor_channel6_gain(comp_status_value, comp_schema)
                     elif s_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_PRESENCE.value:
-                        components_status_exp[cs]["odr"] = self.__get_presence_sensor_odr(comp_status_value, comp_interface)
-                        components_status_exp[cs]["avg_tobject_num"] = self.__get_presence_sensor_avg_tobject_num(comp_status_value, comp_interface)
-                        components_status_exp[cs]["avg_tambient_num"] = self.__get_presence_sensor_avg_tambient_num(comp_status_value, comp_interface)
-                        components_status_exp[cs]["lpf_p_m_bandwidth"] = self.__get_presence_sensor_lpf_p_m_bandwidth(comp_status_value, comp_interface)
-                        components_status_exp[cs]["lpf_p_bandwidth"] = self.__get_presence_sensor_lpf_p_bandwidth(comp_status_value, comp_interface)
-                        components_status_exp[cs]["lpf_m_bandwidth"] = self.__get_presence_sensor_lpf_m_bandwidth(comp_status_value, comp_interface)
-                        components_status_exp[cs]["compensation_type"] = self.__get_presence_sensor_compensation_type(comp_status_value, comp_interface)
+                        components_status_exp[cs]["odr"] = self.__get_presence_sensor_odr(comp_status_value, comp_schema)
+                        components_status_exp[cs]["avg_tobject_num"] = self.__get_presence_sensor_avg_tobject_num(comp_status_value, comp_schema)
+                        components_status_exp[cs]["avg_tambient_num"] = self.__get_presence_sensor_avg_tambient_num(comp_status_value, comp_schema)
+                        components_status_exp[cs]["lpf_p_m_bandwidth"] = self.__get_presence_sensor_lpf_p_m_bandwidth(comp_status_value, comp_schema)
+                        components_status_exp[cs]["lpf_p_bandwidth"] = self.__get_presence_sensor_lpf_p_bandwidth(comp_status_value, comp_schema)
+                        components_status_exp[cs]["lpf_m_bandwidth"] = self.__get_presence_sensor_lpf_m_bandwidth(comp_status_value, comp_schema)
+                        components_status_exp[cs]["compensation_type"] = self.__get_presence_sensor_compensation_type(comp_status_value, comp_schema)
                     elif s_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_CAMERA.value:
                         pass
                     elif s_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_POWERMETER.value:
-                        components_status_exp[cs]["adc_conversion_time"] = self.__get_powermeter_sensor_odr(comp_status_value, comp_interface)
+                        components_status_exp[cs]["adc_conversion_time"] = self.__get_powermeter_sensor_odr(comp_status_value, comp_schema)
                     else: #Maintain compatibility with OLD versions (< SensorManager v3 [NO SENSOR CATEGORIES])
-                        components_status_exp[cs]["odr"] = self.__get_mems_sensor_odr(comp_status_value, comp_interface)
-                        components_status_exp[cs]["fs"] = self.__get_mems_sensor_fs(comp_status_value, comp_interface)
+                        components_status_exp[cs]["odr"] = self.__get_mems_sensor_odr(comp_status_value, comp_schema)
+                        components_status_exp[cs]["fs"] = self.__get_mems_sensor_fs(comp_status_value, comp_schema)
 
                 self.data_pipeline.update_components_status(components_status_exp)
     
     def update_device_status(self):
-        dev_status = self.hsd_link.get_device_status(self.device_id)
+        dev_status = self.get_device_status()
         for c in dev_status["devices"][self.device_id]["components"]:
             c_dict = list(c.values())[0]
             c_name = list(c.keys())[0]
@@ -777,11 +976,11 @@ class HSD_Controller(STDTDL_Controller):
     
     def start_log(self, interface=1, acq_folder = None, sub_folder=True):
         if type(self.hsd_link) == HSDLink_v1:
-            res = self.hsd_link.start_log(self.device_id, save_files=self.save_files_flag)
+            res = self.pnpl_executor.call(partial(self.hsd_link.start_log, self.device_id, save_files=self.save_files_flag), name="start_log")
         else:
             if self.is_hsd_link_serial():
                 self.start_plots() #In case of serial communication, the plots are started before the log!
-            res = self.hsd_link.start_log(self.device_id, interface, acq_folder=acq_folder, sub_folder=sub_folder, save_files=self.save_files_flag)
+            res = self.pnpl_executor.call(partial(self.hsd_link.start_log, self.device_id, interface, acq_folder=acq_folder, sub_folder=sub_folder, save_files=self.save_files_flag), name="start_log")
         if res:
             self.sig_logging.emit(True,interface)
             if self.data_pipeline is not None:
@@ -810,9 +1009,9 @@ class HSD_Controller(STDTDL_Controller):
             
     def start_detect(self):
         if type(self.hsd_link) == HSDLink_v1:
-            res = self.hsd_link.start_log(self.device_id)
+            res = self.pnpl_executor.call(self.hsd_link.start_log, self.device_id, name="start_log")
         else:
-            res = self.hsd_link.start_log(self.device_id, 1)
+            res = self.pnpl_executor.call(self.hsd_link.start_log, self.device_id, 1, name="start_log")
         if res:
             self.sig_detecting.emit(True)
             self.is_detecting = True
@@ -823,15 +1022,59 @@ class HSD_Controller(STDTDL_Controller):
     def set_save_files_flag(self, status):
         self.save_files_flag = status
 
+    def set_data_file_writer_params(self, **params):
+        self.data_file_writer_params.update(params)
+
+    def open_sensor_data_file(self, comp_name):
+        sensor_data_file_path = os.path.join(self.hsd_link.get_acquisition_folder(),(str(comp_name) + ".dat"))
+        sensor_data_file = DataFileWriter(open(sensor_data_file_path, "wb+"), comp_name, error_callback = self.__data_file_error, **self.data_file_writer_params)
+        self.sensor_data_files.append(sensor_data_file)
+        return sensor_data_file
+
+    def __data_file_error(self, writer, error):
+        error_msg = "Error writing {} data file: {}.\nThe acquired data are not being saved correctly.".format(writer.name, error)
+        self.sig_streaming_error.emit(True, error_msg)
+
+    def close_data_files(self):
+        # The queued data are written before closing the files (see also DataFileWriter.close_all_writers)
+        for f in self.sensor_data_files:
+            f.close()
+
+    def get_data_file_writers_stats(self):
+        return {f.name: f.get_stats() for f in self.sensor_data_files if isinstance(f, DataFileWriter)}
+
+    def set_acquisition_workers(self, nof_workers):
+        self.acquisition_workers = nof_workers
+
+    def start_component_acquisition(self, stop_flag, data_reader, comp_name, sensor_data_file, usb_dps, data_rate = None):
+        if self.use_acquisition_scheduler:
+            if self.acquisition_scheduler is None:
+                self.acquisition_scheduler = AcquisitionScheduler(self.acquisition_workers, empty_data_callback = lambda c: c.raise_empty_data_error())
+            comp_acquisition = self.ComponentAcquisition(self.hsd_link, data_reader, self.device_id, comp_name, sensor_data_file, usb_dps, self.sig_streaming_error, self.acquisition_batch_mode, data_rate)
+            self.acquisition_scheduler.add_source(comp_acquisition)
+        else:
+            thread = self.SensorAcquisitionThread(stop_flag, self.hsd_link, data_reader, self.device_id, comp_name, sensor_data_file, usb_dps, self.sig_streaming_error, self.acquisition_batch_mode)
+            thread.start()
+            self.sensors_threads.append(thread)
+
+    def stop_components_acquisition(self):
+        if self.acquisition_scheduler is not None:
+            self.acquisition_scheduler.stop()
+            self.acquisition_scheduler = None
+
+    def get_acquisition_batch_mode(self):
+        return self.acquisition_batch_mode
+
+    def set_acquisition_batch_mode(self, status):
+        self.acquisition_batch_mode = status
+
     def __start_component_plot_serial(self, comp_status, comp_name):
         c_enable = comp_status["enable"] 
             
         if c_enable == True:
             c_stream_id = comp_status.get("stream_id")
             if c_stream_id is not None:
-                sensor_data_file_path = os.path.join(self.hsd_link.get_acquisition_folder(),(str(comp_name) + ".dat"))
-                sensor_data_file = open(sensor_data_file_path, "wb+")
-                self.sensor_data_files.append(sensor_data_file)
+                sensor_data_file = self.open_sensor_data_file(comp_name)
                 
                 c_type = comp_status.get("c_type")
                 serial_dps = comp_status.get("serial_dps")#TODO check if it is necessary
@@ -894,9 +1137,7 @@ class HSD_Controller(STDTDL_Controller):
                 
         if c_enable == True:
             if self.save_files_flag:
-                sensor_data_file_path = os.path.join(self.hsd_link.get_acquisition_folder(),(str(comp_name) + ".dat"))
-                sensor_data_file = open(sensor_data_file_path, "wb+")
-                self.sensor_data_files.append(sensor_data_file)
+                sensor_data_file = self.open_sensor_data_file(comp_name)
             stopFlag = Event()
             self.threads_stop_flags.append(stopFlag)
             
@@ -958,12 +1199,8 @@ class HSD_Controller(STDTDL_Controller):
                 dr = HSD_Controller.DataReader(self, self.add_data_to_a_plot, comp_name, spts, dimensions, sample_size, data_format, sensitivity, interleaved_data, raw_flat_data)
                 self.data_readers.append(dr)
 
-                if self.save_files_flag:
-                    thread = self.SensorAcquisitionThread(stopFlag, self.hsd_link, dr, self.device_id, comp_name, sensor_data_file, usb_dps, self.sig_streaming_error)
-                else:
-                    thread = self.SensorAcquisitionThread(stopFlag, self.hsd_link, dr, self.device_id, comp_name, None, usb_dps, self.sig_streaming_error)
-                thread.start()
-                self.sensors_threads.append(thread)
+                data_rate = self.get_component_data_rate(comp_name, comp_status)
+                self.start_component_acquisition(stopFlag, dr, comp_name, sensor_data_file if self.save_files_flag else None, usb_dps, data_rate)
 
     def start_plots(self):
         if self.dt_plugins_folder_path is not None:
@@ -978,9 +1215,7 @@ class HSD_Controller(STDTDL_Controller):
             
             if type(self.hsd_link) == HSDLink_v1:
                     if self.save_files_flag:
-                        sensor_data_file_path = os.path.join(self.hsd_link.get_acquisition_folder(),(str(s_plot.comp_name) + ".dat"))
-                        sensor_data_file = open(sensor_data_file_path, "wb+")
-                        self.sensor_data_files.append(sensor_data_file)
+                        sensor_data_file = self.open_sensor_data_file(s_plot.comp_name)
                     stopFlag = Event()
                     self.threads_stop_flags.append(stopFlag)
 
@@ -1007,22 +1242,23 @@ class HSD_Controller(STDTDL_Controller):
                     self.__start_component_plots_hsddll(c_status_value, c_name)
         if self.is_hsd_link_serial():
             self.sensors_threads[0].set_data_reader_params(self.data_reader_params)
+        self.start_throughput_measurement()
 
     def stop_log(self, interface=1):
         if self.is_logging == True:
             if self.is_hsd_link_serial():
                 self.stop_plots() #In case of serial communication, the plots need to be stopped before stopping the log!
-            self.hsd_link.stop_log(self.device_id)
+            self.pnpl_executor.call(self.hsd_link.stop_log, self.device_id, name="stop_log")
             if type(self.hsd_link) == HSDLink_v1:
                 if self.save_files_flag:
-                    self.hsd_link.save_json_device_file(self.device_id)
-                    self.hsd_link.save_json_acq_info_file(self.device_id)
+                    self.pnpl_executor.call(self.hsd_link.save_json_device_file, self.device_id, name="save_json_device_file")
+                    self.pnpl_executor.call(self.hsd_link.save_json_acq_info_file, self.device_id, name="save_json_acq_info_file")
             else:
                 #TODO put here a "File saving..." loading window!
                 time.sleep(0.5)
                 if self.save_files_flag:
-                    self.hsd_link.save_json_acq_info_file(self.device_id)
-                    self.hsd_link.save_json_device_file(self.device_id)
+                    self.pnpl_executor.call(self.hsd_link.save_json_acq_info_file, self.device_id, name="save_json_acq_info_file")
+                    self.pnpl_executor.call(self.hsd_link.save_json_device_file, self.device_id, name="save_json_device_file")
                     if self.ispu_output_format_path is not None:
                         shutil.copyfile(self.ispu_output_format_path, os.path.join(self.hsd_link.get_acquisition_folder(),"ispu_output_format.json"))
                         log.info("ispu_output_format.json File correctly saved")
@@ -1042,17 +1278,17 @@ class HSD_Controller(STDTDL_Controller):
     def stop_auto_log_inner(self, interface=1):
         if self.is_logging == True:
             self.sig_autologging_is_stopping.emit(True)
-            self.hsd_link.stop_log(self.device_id)
+            self.pnpl_executor.call(self.hsd_link.stop_log, self.device_id, name="stop_log")
             if type(self.hsd_link) == HSDLink_v1:
                 if self.save_files_flag:
-                    self.hsd_link.save_json_device_file(self.device_id)
-                    self.hsd_link.save_json_acq_info_file(self.device_id)
+                    self.pnpl_executor.call(self.hsd_link.save_json_device_file, self.device_id, name="save_json_device_file")
+                    self.pnpl_executor.call(self.hsd_link.save_json_acq_info_file, self.device_id, name="save_json_acq_info_file")
             else:
                 time.sleep(0.5)
                 #TODO put here a "File saving..." loading window!
                 if self.save_files_flag:
-                    self.hsd_link.save_json_acq_info_file(self.device_id)
-                    self.hsd_link.save_json_device_file(self.device_id)
+                    self.pnpl_executor.call(self.hsd_link.save_json_acq_info_file, self.device_id, name="save_json_acq_info_file")
+                    self.pnpl_executor.call(self.hsd_link.save_json_device_file, self.device_id, name="save_json_device_file")
                     if self.ispu_output_format_path is not None:
                         shutil.copyfile(self.ispu_output_format_path, os.path.join(self.hsd_link.get_acquisition_folder(),"ispu_output_format.json"))
                         log.info("ispu_output_format.json File correctly saved")
@@ -1071,15 +1307,15 @@ class HSD_Controller(STDTDL_Controller):
 
     def stop_detect(self):
         if self.is_detecting == True:
-            self.hsd_link.stop_log(self.device_id)
+            self.pnpl_executor.call(self.hsd_link.stop_log, self.device_id, name="stop_log")
             if type(self.hsd_link) == HSDLink_v1:
                 if self.save_files_flag:
-                    self.hsd_link.save_json_device_file(self.device_id)
-                    self.hsd_link.save_json_acq_info_file(self.device_id)
+                    self.pnpl_executor.call(self.hsd_link.save_json_device_file, self.device_id, name="save_json_device_file")
+                    self.pnpl_executor.call(self.hsd_link.save_json_acq_info_file, self.device_id, name="save_json_acq_info_file")
             else:
                 if self.save_files_flag:
-                    self.hsd_link.save_json_device_file(self.device_id)
-                    self.hsd_link.save_json_acq_info_file(self.device_id)
+                    self.pnpl_executor.call(self.hsd_link.save_json_device_file, self.device_id, name="save_json_device_file")
+                    self.pnpl_executor.call(self.hsd_link.save_json_acq_info_file, self.device_id, name="save_json_acq_info_file")
                     if self.ispu_output_format_path is not None:
                         shutil.copyfile(self.ispu_output_format_path, os.path.join(self.hsd_link.get_acquisition_folder(),"ispu_output_format.json"))
                         log.info("ispu_output_format.json File correctly saved")
@@ -1099,12 +1335,13 @@ class HSD_Controller(STDTDL_Controller):
         for sf in self.threads_stop_flags:
             sf.set()
         
+        self.stop_throughput_measurement()
+        self.stop_components_acquisition()
         for t in self.sensors_threads:
             t.join()
 
         if self.save_files_flag:
-            for f in self.sensor_data_files:
-                f.close()
+            self.close_data_files()
     
     def plot_window_changed(self, plot_window_time):
         self.sig_plot_window_time_updated.emit(plot_window_time)
@@ -1125,36 +1362,125 @@ class HSD_Controller(STDTDL_Controller):
                 self.cconfig_widgets[plot_widget.comp_name].disable_plot_control()
                 self.cconfig_widgets[plot_widget.comp_name].hide_plot_widget()
 
+    def __get_sensor_bandwidth(self, ss_status, ss_comp_schema):
+        # bnd = ODR*(data_type*dim)*8
+        ss_category = ss_status.get("sensor_category")
+        odr = None
+        if ss_category is not None:
+            if ss_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_MEMS.value \
+                or ss_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_AUDIO.value \
+                or ss_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_PRESENCE.value:
+                odr = self.__get_mems_sensor_odr(ss_status, ss_comp_schema)
+            elif ss_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_RANGING.value:
+                odr = self.__get_ranging_sensor_odr(ss_status)
+            elif ss_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_LIGHT.value:
+                odr = self.__get_light_sensor_odr(ss_status)
+            elif ss_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_POWERMETER.value:
+                odr = self.__get_powermeter_sensor_odr(ss_status, ss_comp_schema)
+        if odr is None:
+            return 0
+        data_byte_len = TypeConversion.check_type_length(ss_status.get("data_type"))
+        dim = ss_status.get("dim")
+        return odr * data_byte_len * dim * 8
+
+    def get_component_data_rate(self, comp_name, comp_status):
+        """
+        Expected data rate of a sensor component [bytes/s] (None if it can not be estimated).
+        """
+        if comp_status.get("c_type") != DTDLUtils.ComponentTypeEnum.SENSOR.value or comp_name not in self.components_dtdl:
+            return None
+        try:
+            bandwidth = self.__get_sensor_bandwidth(comp_status, self.get_component_schema(comp_name))
+        except Exception:
+            return None
+        return bandwidth / 8 if bandwidth > 0 else None
+
+    def update_component_bandwidth(self, comp_name):
+        """
+        Update the predicted bandwidth contribution of a single component and the curr_bandwidth total accordingly.
+        """
+        comp_status = self.components_status.get(comp_name)
+        bandwidth = 0
+        if comp_status is not None and comp_status.get("c_type") == DTDLUtils.ComponentTypeEnum.SENSOR.value and comp_status.get("enable"):
+            try:
+                bandwidth = self.__get_sensor_bandwidth(comp_status, self.get_component_schema(comp_name))
+            except Exception as e:
+                log.warning("Impossible to estimate the [{}] bandwidth: {}".format(comp_name, e))
+        prev_bandwidth = self.bandwidth_contributions.pop(comp_name, 0)
+        if bandwidth > 0:
+            self.bandwidth_contributions[comp_name] = bandwidth
+        self.curr_bandwidth += bandwidth - prev_bandwidth
+
     def __calculate_hsd_bandwidth(self):
+        self.bandwidth_contributions.clear()
         self.curr_bandwidth = 0
-        sensors_status = {s:self.components_status[s] for s in self.components_status if self.components_status[s].get("c_type") == DTDLUtils.ComponentTypeEnum.SENSOR.value and self.components_status[s].get("enable")}
-        for ss in sensors_status:
-            # bnd = ODR*(data_type*dim)*8
-            ss_status = sensors_status[ss]
-            ss_dtdl_comp = self.components_dtdl[ss]
-            ss_category = ss_status.get("sensor_category")
-            if ss_category is not None:
-                if ss_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_MEMS.value \
-                    or ss_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_AUDIO.value \
-                    or ss_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_PRESENCE.value:
-                    odr = self.__get_mems_sensor_odr(ss_status, ss_dtdl_comp)
-                elif ss_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_RANGING.value:
-                    odr = self.__get_ranging_sensor_odr(ss_status)
-                elif ss_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_LIGHT.value:
-                    odr = self.__get_light_sensor_odr(ss_status)
-                elif ss_category == DTDLUtils.SensorCategoryEnum.ISENSOR_CLASS_POWERMETER.value:
-                    odr = self.__get_powermeter_sensor_odr(ss_status, ss_dtdl_comp)
-                data_byte_len = TypeConversion.check_type_length(ss_status.get("data_type"))
-                dim = ss_status.get("dim")                                                             
-                self.curr_bandwidth += odr * data_byte_len * dim * 8  
-    
-    def check_hsd_bandwidth(self):
-        self.__calculate_hsd_bandwidth()
-        # print("self.curr_bandwidth", self.curr_bandwidth)
+        for comp_name in self.components_status:
+            self.update_component_bandwidth(comp_name)
+    
+    def check_hsd_bandwidth(self, comp_name = None):
+        """
+        Args:
+            comp_name (str): changed component (None: the bandwidth of all the components is recalculated)
+        """
+        if comp_name is None:
+            self.__calculate_hsd_bandwidth()
+        else:
+            self.update_component_bandwidth(comp_name)
+        self.sig_hsd_bandwidth_updated.emit(self.curr_bandwidth, HSD_Controller.MAX_HSD_BANDWIDTH)
         self.sig_hsd_bandwidth_exceeded.emit(self.curr_bandwidth > HSD_Controller.MAX_HSD_BANDWIDTH)
 
+    def __get_acquisition_sources(self):
+        sources = self.acquisition_scheduler.get_sources() if self.acquisition_scheduler is not None else []
+        return sources + [t for t in self.sensors_threads if isinstance(t, HSD_Controller.ComponentAcquisition)]
+
+    def start_throughput_measurement(self):
+        self.measured_throughput.clear()
+        self.__throughput_samples.clear()
+        self.peak_measured_bandwidth = 0
+        self.throughput_timer.start()
+
+    def stop_throughput_measurement(self):
+        if not self.throughput_timer.isActive():
+            return
+        self.throughput_timer.stop()
+        self.__measure_throughput()
+        for comp_name, bw in self.get_bandwidth_report().items():
+            log.info("{} throughput - predicted: {:.0f} bit/s, measured: {} bit/s".format(comp_name, bw["predicted"], "n.a." if bw["measured"] is None else "{:.0f}".format(bw["measured"])))
+        log.info("Total throughput - predicted: {:.0f} bit/s, peak measured: {:.0f} bit/s (safe limit: {} bit/s)".format(self.curr_bandwidth, self.peak_measured_bandwidth, HSD_Controller.MAX_HSD_BANDWIDTH))
+
+    def __measure_throughput(self):
+        now = time.monotonic()
+        for s in self.__get_acquisition_sources():
+            payload_bytes = s.get_payload_bytes()
+            prev_sample = self.__throughput_samples.get(s.comp_name)
+            if prev_sample is not None and now > prev_sample[1]:
+                self.measured_throughput[s.comp_name] = (payload_bytes - prev_sample[0]) * 8 / (now - prev_sample[1])
+            self.__throughput_samples[s.comp_name] = (payload_bytes, now)
+        if len(self.measured_throughput) == 0:
+            return
+        measured_bandwidth = sum(self.measured_throughput.values())
+        self.peak_measured_bandwidth = max(self.peak_measured_bandwidth, measured_bandwidth)
+        self.sig_hsd_throughput_updated.emit(self.curr_bandwidth, measured_bandwidth)
+
+    def get_bandwidth_report(self):
+        """
+        Predicted vs measured throughput of each component [bit/s].
+        Returns:
+            dict: {comp_name: {"predicted", "measured", "difference"}} (measured and difference are None until the first measurement)
+        """
+        report = dict()
+        for comp_name in sorted(set(self.bandwidth_contributions) | set(self.measured_throughput)):
+            predicted = self.bandwidth_contributions.get(comp_name, 0)
+            measured = self.measured_throughput.get(comp_name)
+            report[comp_name] = {
+                "predicted": predicted,
+                "measured": measured,
+                "difference": None if measured is None else measured - predicted
+            }
+        return report
+
     def get_sd_mounted_status(self):
-        return self.hsd_link.get_boolean_property(0,"log_controller","sd_mounted")
+        return self.pnpl_executor.call(self.hsd_link.get_boolean_property, 0, "log_controller", "sd_mounted", name="get_sd_mounted")
 
     def update_plot_widget(self, comp_name, plot_params, visible):
         if comp_name in self.plot_widgets:
@@ -1180,7 +1506,7 @@ class HSD_Controller(STDTDL_Controller):
     def connect_to(self, d_id:int, d_text:str = None, com_speed:int = None):
         if self.is_hsd_link_serial():
             com_id = d_text.split("]")[0][1:]
-            is_open = self.hsd_link.open(com_id, com_speed)
+            is_open = self.pnpl_executor.call(self.hsd_link.open, com_id, com_speed, name="open")
             if is_open:
                 self.sig_device_connected.emit(True)
             else:
@@ -1194,9 +1520,11 @@ class HSD_Controller(STDTDL_Controller):
         else:
             self.sig_device_connected.emit(True)
             self.device_id = d_id
+        self.invalidate_component_status()
 
     def disconnect(self): #TODO add serial link disconnection
         self.sig_device_connected.emit(False)
+        self.invalidate_component_status()
         for pw in self.plot_widgets:
             self.plot_widgets[pw].deleteLater()
         self.plot_widgets.clear()
@@ -1207,13 +1535,105 @@ class HSD_Controller(STDTDL_Controller):
         
         self.components_dtdl.clear() #From DTDL DeviceModel 
         self.components_status.clear() #From FW
+        self.bandwidth_contributions.clear()
+        self.curr_bandwidth = 0
 
     def send_command(self, json_command):
         log.info("PnPL Message: {}".format(json_command))
-        response = self.hsd_link.send_command(self.device_id, json_command)
+        response = self.pnpl_executor.call(self.hsd_link.send_command, self.device_id, json_command, name="send_command")
+        self.__command_done(json_command, None, response)
+        return response
+
+    def send_command_async(self, json_command, callback = None):
+        """
+        Non blocking send_command: callback is called on the GUI thread with the PnPL response.
+        Returns:
+            concurrent.futures.Future: PnPL response
+        """
+        log.info("PnPL Message (async): {}".format(json_command))
+        return self.pnpl_executor.submit(self.hsd_link.send_command, self.device_id, json_command, name="send_command",
+                                         callback=partial(self.__command_done, json_command, callback))
+
+    def send_commands_async(self, json_commands, callback = None, error_callback = None, interval = 0):
+        """
+        Non blocking send of a sequence of commands, sent in order by the PnPL worker.
+        callback is called on the GUI thread with the list of (PnPL response, latency [ms]) of the commands.
+        Args:
+            interval (float): wait [s] between two consecutive commands (0: back to back)
+        Returns:
+            concurrent.futures.Future: list of (PnPL response, latency [ms])
+        """
+        log.info("PnPL Messages (async): {}".format(json_commands))
+        return self.pnpl_executor.submit(self.__send_commands, json_commands, interval, name="send_commands",
+                                         callback=partial(self.__commands_done, json_commands, callback),
+                                         error_callback=error_callback)
+
+    def __send_commands(self, json_commands, interval):
+        results = []
+        for i, json_command in enumerate(json_commands):
+            if i > 0 and interval > 0:
+                time.sleep(interval)
+            start = time.perf_counter()
+            response = self.hsd_link.send_command(self.device_id, json_command)
+            results.append((response, (time.perf_counter() - start) * 1000))
+        return results
+
+    def __commands_done(self, json_commands, callback, results):
+        for json_command, (response, _) in zip(json_commands, results):
+            self.__command_done(json_command, None, response)
+        if callback is not None:
+            callback(results)
+
+    def set_property_async(self, comp_name, prop_name, value, callback = None):
+        return self.send_command_async(PnPLCMDManager.create_set_property_cmd(comp_name, prop_name, value), callback)
+
+    def __command_done(self, json_command, callback, response):
+        self.__update_status_cache_from_command(json_command, response)
         if response is not None:
             self.sig_pnpl_response_received.emit(json_command, response)
-        return response
+        if callback is not None:
+            callback(response)
+
+    def __update_status_cache_from_command(self, json_command, response):
+        # Only state changing commands touch the cache: get commands never do
+        try:
+            command = json.loads(json_command)
+        except (TypeError, ValueError):
+            self.invalidate_component_status()
+            return
+        if not isinstance(command, dict):
+            return
+        pnpl_response = None
+        try:
+            pnpl_response = json.loads(response).get("PnPL_Response") if response is not None else None
+        except (TypeError, ValueError, AttributeError):
+            pass
+        for key, value in command.items():
+            if key.startswith("get_"):
+                continue
+            comp_name = key.split("*")[0]
+            if "*" in key:
+                # Commands (e.g. UCF loading, tags) may change any property of the component
+                self.invalidate_component_status(comp_name)
+            elif isinstance(pnpl_response, dict) and pnpl_response.get("status") is False:
+                self.invalidate_component_status(comp_name)
+            elif self.status_cache.get(comp_name, {}).get("c_type") == DTDLUtils.ComponentTypeEnum.SENSOR.value:
+                # FW derived sensor properties (e.g. usb_dps, samples_per_ts) depend on the set one (e.g. odr)
+                self.invalidate_sensor_status(comp_name)
+            elif comp_name in self.status_cache and isinstance(value, dict):
+                # Set property: the cached status is updated with the values applied by the FW (or the requested ones)
+                applied = pnpl_response.get("value") if isinstance(pnpl_response, dict) else None
+                self.__merge_status(self.status_cache[comp_name], applied if isinstance(applied, dict) else value)
+            else:
+                self.invalidate_component_status(comp_name)
+
+    @staticmethod
+    def __merge_status(status, values):
+        for k, v in values.items():
+            if isinstance(v, dict) and isinstance(status.get(k), dict):
+                HSD_Controller.__merge_status(status[k], v)
+            else:
+                status[k] = v
     
     def save_config(self, on_pc:bool, on_sd:bool):
         if on_pc:
@@ -1226,11 +1646,18 @@ class HSD_Controller(STDTDL_Controller):
                         del device_status["devices"][self.device_id]["components"][i]
                 json.dump(device_status, f, ensure_ascii=False, indent=4)
         if on_sd:
-            self.hsd_link.save_config(self.device_id)
+            self.pnpl_executor.call(self.hsd_link.save_config, self.device_id, name="save_config")
             
     def load_config(self, fpath):
-        self.hsd_link.update_device(self.device_id, fpath)
+        self.pnpl_executor.call(self.hsd_link.update_device, self.device_id, fpath, name="update_device")
+        self.invalidate_component_status()
         self.update_device_status()
+
+    def refresh_components_status(self, comp_types):
+        # A single device status read refreshes the cache, then each component is updated from it
+        self.invalidate_component_status()
+        self.refresh_status_cache()
+        super().refresh_components_status(comp_types)
         
     def load_ispu_ucf_file(self, fpath):
         self.ispu_ucf_file_path = fpath
@@ -1262,17 +1689,26 @@ class HSD_Controller(STDTDL_Controller):
         log.error("Component: {} Generic file Upload feature not yet implemented".format(comp_name))
     
     def upload_mlc_ucf_file(self, comp_name, ucf_fpath):
-        self.hsd_link.upload_mlc_ucf_file(self.device_id, comp_name, ucf_fpath)
+        self.pnpl_executor.call(self.hsd_link.upload_mlc_ucf_file, self.device_id, comp_name, ucf_fpath, name="upload_mlc_ucf_file")
+        self.invalidate_sensor_status(comp_name)
         
     def upload_ispu_ucf_file(self, comp_name, ucf_fpath, output_json_fpath):
-        self.hsd_link.upload_ispu_ucf_file(self.device_id, comp_name, ucf_fpath, output_json_fpath)
+        self.pnpl_executor.call(self.hsd_link.upload_ispu_ucf_file, self.device_id, comp_name, ucf_fpath, output_json_fpath, name="upload_ispu_ucf_file")
+        self.invalidate_sensor_status(comp_name)
         self.sig_ispu_ucf_loaded.emit(ucf_fpath, output_json_fpath)
         
     def doTag(self, sw_tag_name, status):
-        if status is True:
-            self.hsd_link.set_sw_tag_on(self.device_id, sw_tag_name)
-        else:
-            self.hsd_link.set_sw_tag_off(self.device_id, sw_tag_name)
+        # The tag is set (and tags_info read back) by the PnPL worker: the GUI reacts in __tag_done
+        def set_tag():
+            if status is True:
+                self.hsd_link.set_sw_tag_on(self.device_id, sw_tag_name)
+            else:
+                self.hsd_link.set_sw_tag_off(self.device_id, sw_tag_name)
+            return self.hsd_link.get_component_status(self.device_id, "tags_info")
+        return self.pnpl_executor.submit(set_tag, name="tag", callback=partial(self.__tag_done, sw_tag_name, status))
+
+    def __tag_done(self, sw_tag_name, status, tags_info_status):
+        self.__cache_component_status("tags_info", tags_info_status)
         self.update_component_status("tags_info")
         tag_label = self.components_status["tags_info"][sw_tag_name]["label"]
         if self.data_pipeline is not None:
@@ -1280,16 +1716,20 @@ class HSD_Controller(STDTDL_Controller):
         self.sig_tag_done.emit(status, tag_label)
 
     def changeSWTagClassEnabled(self, sw_tag_name, new_status):
-        self.hsd_link.set_sw_tag_class_enabled(self.device_id, sw_tag_name, new_status)
+        self.pnpl_executor.call(self.hsd_link.set_sw_tag_class_enabled, self.device_id, sw_tag_name, new_status, name="set_tag_class")
+        self.invalidate_component_status("tags_info")
         
     def changeHWTagClassEnabled(self, hw_tag_name, new_status):
-        self.hsd_link.set_hw_tag_class_enabled(self.device_id, hw_tag_name, new_status)
+        self.pnpl_executor.call(self.hsd_link.set_hw_tag_class_enabled, self.device_id, hw_tag_name, new_status, name="set_tag_class")
+        self.invalidate_component_status("tags_info")
     
     def changeSWTagClassLabel(self, sw_tag_name, new_label):
-        self.hsd_link.set_sw_tag_class_label(self.device_id, sw_tag_name, new_label)
+        self.pnpl_executor.call(self.hsd_link.set_sw_tag_class_label, self.device_id, sw_tag_name, new_label, name="set_tag_class")
+        self.invalidate_component_status("tags_info")
         
     def changeHWTagClassLabel(self, hw_tag_name, new_label):
-        self.hsd_link.set_hw_tag_class_label(self.device_id, hw_tag_name, new_label)
+        self.pnpl_executor.call(self.hsd_link.set_hw_tag_class_label, self.device_id, hw_tag_name, new_label, name="set_tag_class")
+        self.invalidate_component_status("tags_info")
 
     def set_anomaly_classes(self, anomaly_classes):
         self.anomaly_classes = anomaly_classes
@@ -1316,7 +1756,11 @@ class HSD_Controller(STDTDL_Controller):
         return self.ai_classifier_tool
 
     def set_rtc_time(self):
-        self.hsd_link.set_rtc_time(self.device_id)
+        return self.pnpl_executor.submit(self.hsd_link.set_rtc_time, self.device_id, name="set_rtc_time",
+                                         error_callback=self.__rtc_time_error)
+
+    def __rtc_time_error(self, error):
+        log.warning("Device RTC time not set: {}".format(error))
     
     def do_offline_plots(self, cb_sensor_value, tag_label, start_time, end_time, active_sensor_list, active_algorithm_list, debug_flag, sub_plots_flag, raw_data_flag, active_actuator_list = None, fft_flag = None):
         
@@ -40,7 +40,7 @@ from stdatalog_gui.Widgets.Plots.ClassifierOutputWidget import ClassifierOutputW
 from stdatalog_gui.Utils.PlotParams import ActuatorPlotParams, PlotPAmbientParams, PlotPMotionParams, PlotPObjectParams, PlotPPresenceParams, SensorLightPlotParams, SensorPlotParams, AlgorithmPlotParams, SensorPowerPlotParams, SensorPresenscePlotParams, SensorRangingPlotParams
 
 from stdatalog_gui.STDTDL_Controller import ComponentType
-from PySide6.QtWidgets import QMessageBox
+from PySide6.QtWidgets import QLabel, QMessageBox
 import json
 import stdatalog_pnpl.DTDL.dtdl_utils as DTDLUtils
 
@@ -53,6 +53,8 @@ class HSD_DeviceConfigPage(STDTDL_DeviceConfigPage):
         super().__init__(page_widget, controller)
         
         self.controller.sig_hsd_bandwidth_exceeded.connect(self.s_bandwidth_exceeded)
+        self.controller.sig_hsd_bandwidth_updated.connect(self.s_bandwidth_updated)
+        self.controller.sig_hsd_throughput_updated.connect(self.s_throughput_updated)
         self.controller.sig_streaming_error.connect(self.s_streaming_error)
         self.controller.sig_is_waiting_auto_start.connect(self.s_is_waiting_autostart)
         self.controller.sig_is_auto_started.connect(self.s_auto_started)
@@ -68,6 +70,12 @@ class HSD_DeviceConfigPage(STDTDL_DeviceConfigPage):
 
         self.graph_id = 0
 
+        # Predicted (and, while streaming, measured) HSD throughput
+        self.bandwidth_message = QLabel("")
+        self.bandwidth_message.setContentsMargins(12,6,12,6)
+        self.bandwidth_message.hide()
+        self.device_config_widget.layout().addWidget(self.bandwidth_message)
+
         self.log_file_name = None
         for handler in log.parent.handlers:
             if hasattr(handler, "baseFilename"):
@@ -105,7 +113,7 @@ class HSD_DeviceConfigPage(STDTDL_DeviceConfigPage):
         elif comp_name in self.ignored_components:
             pass
         elif comp_name == "automode":
-            fw_info = self.controller.hsd_link.get_firmware_info(self.controller.device_id)
+            fw_info = self.controller.get_firmware_info(self.controller.device_id)
             if(HSDLink.get_versiontuple(fw_info["firmware_info"]["fw_version"]) >= HSDLink.get_versiontuple("1.2.0")):
                 self.automode_widget = HSDAutoModeWidget(self.controller, comp_contents=comp_interface.contents, c_id=0, parent=self.widget_special_componenents)
                 self.controller.add_component_config_widget(self.automode_widget)
@@ -136,7 +144,9 @@ class HSD_DeviceConfigPage(STDTDL_DeviceConfigPage):
         comp_status = self.controller.get_component_status(comp_name)
 
         try:
-            enabled = self.controller.is_sensor_enabled(comp_name)
+            enabled = comp_status[comp_name].get("enable")
+            if enabled is None:
+                enabled = self.controller.is_sensor_enabled(comp_name)
             self.comp_id += 1
             sensor_plot_params:SensorPlotParams = self.controller.get_plot_params(comp_name, ComponentType.SENSOR, comp_interface, comp_status)
             if sensor_plot_params is not None:
@@ -170,7 +180,7 @@ class HSD_DeviceConfigPage(STDTDL_DeviceConfigPage):
             log.warning("It is impossible to know the Sensor [{}] enabling status from the FW device status".format(comp_name))
 
         self.controller.fill_component_status(comp_name)
-        self.controller.check_hsd_bandwidth()
+        self.controller.check_hsd_bandwidth(comp_name)
 
     @Slot(str, dict)
     def s_algorithm_component_found(self, comp_name, comp_interface):
@@ -304,6 +314,17 @@ class HSD_DeviceConfigPage(STDTDL_DeviceConfigPage):
         else:
             self.set_error_message(False, "")
 
+    @Slot(float, float)
+    def s_bandwidth_updated(self, predicted:float, safe_limit:float):
+        self.bandwidth_message.setText("Throughput - predicted: {:.2f} Mbit/s (safe limit: {:.2f} Mbit/s)".format(predicted / 1e6, safe_limit / 1e6))
+        self.bandwidth_message.show()
+
+    @Slot(float, float)
+    def s_throughput_updated(self, predicted:float, measured:float):
+        log.debug("Throughput - predicted: {:.0f} bit/s, measured: {:.0f} bit/s (difference: {:+.0f} bit/s)".format(predicted, measured, measured - predicted))
+        self.bandwidth_message.setText("Throughput - predicted: {:.2f} Mbit/s, measured: {:.2f} Mbit/s (difference: {:+.2f} Mbit/s)".format(predicted / 1e6, measured / 1e6, (measured - predicted) / 1e6))
+        self.bandwidth_message.show()
+
     @Slot(bool, str)
     def s_streaming_error(self, status, message:str):
         self.set_error_message(status, message)
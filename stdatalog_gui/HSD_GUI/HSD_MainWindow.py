@@ -106,6 +106,7 @@ class HSD_MainWindow(STDTDL_MainWindow):
 
     def closeEvent(self, event):
         self.controller.stop_log()
+        self.controller.close_data_files()
         if self.controller.hsd is not None:
             self.controller.hsd.close_plot_threads()
         event.accept()
@@ -16,7 +16,6 @@
 import time
 from PySide6.QtCore import Slot, Qt
 
-import pyqtgraph as pg
 from PySide6.QtGui import QColor, QBrush
 
 from stdatalog_gui.STDTDL_Controller import ComponentType
@@ -107,23 +106,11 @@ class HSDPlotLinesTMOSWidget(HSDPlotLinesWidget):
                 if status:
                     if not tag_label in self.active_tags or self.active_tags[tag_label] == False:
                         self.active_tags[tag_label] = True
-                        pen=pg.mkPen(color=colors[0], width=3, style=Qt.PenStyle.DotLine)
-                        tag_line = pg.InfiniteLine(pos = self.x_data[-1], angle=90, movable=False, pen=pen)
-                        label = pg.TextItem(text=texts[0].format(tag_label), angle=-90)
-                        label.setAnchor((1, 0))  # Position label above the line
-                        label.setParentItem(tag_line)
-                        self.graph_widget.addItem(tag_line, ignoreBounds=True)
-                        self.tag_lines.append(tag_line)
+                        self.tag_markers.add(self.x_data[-1], texts[0].format(tag_label), colors[0], 3, Qt.PenStyle.DotLine, vertical_label=True)
                 else:
                     if not tag_label in self.active_tags or self.active_tags[tag_label] == True:
                         self.active_tags[tag_label] = False
-                        pen=pg.mkPen(color=colors[1], width=3, style=Qt.PenStyle.DotLine)
-                        tag_line = pg.InfiniteLine(pos = self.x_data[-1], angle=90, movable=False, pen=pen)
-                        label = pg.TextItem(text=texts[1], angle=-90)
-                        label.setAnchor((1, 0))  # Position label above the line
-                        label.setParentItem(tag_line)
-                        self.graph_widget.addItem(tag_line, ignoreBounds=True)
-                        self.tag_lines.append(tag_line)
+                        self.tag_markers.add(self.x_data[-1], texts[1], colors[1], 3, Qt.PenStyle.DotLine, vertical_label=True)
 
     def add_data(self, data):
         super().add_data(data)
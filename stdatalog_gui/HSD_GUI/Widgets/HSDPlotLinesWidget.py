@@ -14,10 +14,9 @@
 #
 
 
-from collections import deque
-from PySide6.QtCore import Slot
+from PySide6.QtCore import Qt, Slot, QRectF
 from PySide6.QtGui import QPixmap
-from PySide6.QtWidgets import QPushButton, QFileDialog, QFrame
+from PySide6.QtWidgets import QPushButton, QFileDialog, QFrame, QComboBox
 
 import numpy as np
 import pyqtgraph as pg
@@ -26,6 +25,9 @@ import struct
 import stdatalog_gui.UI.icons #do not remove this import. It is used by pkg_resources
 from stdatalog_gui.UI.styles import STDTDL_PushButton #do not remove this import. It is used by pkg_resources
 from stdatalog_gui.Utils.PlotParams import PlotParams, SensorISPUPlotParams
+from stdatalog_gui.Utils.WelchSpectrum import WelchSpectrum
+from stdatalog_gui.Utils.Spectrogram import Spectrogram
+from stdatalog_gui.Utils.TagMarkers import TagMarkersManager
 from stdatalog_gui.Widgets.Plots.PlotWidget import PlotLabel
 from stdatalog_gui.Widgets.Plots.PlotLinesWavWidget import PlotLinesWavWidget
 
@@ -46,6 +48,7 @@ class HSDPlotLinesWidget(PlotLinesWavWidget):
         #Time/Freq. flags
         self.tf_time_flag = True
         self.tf_fft_flag = False
+        self.tf_spectrogram_flag = False
         
         self.fft_sensor_labels = ["acc", "mic"]
         self.comp_name = comp_name
@@ -54,20 +57,26 @@ class HSDPlotLinesWidget(PlotLinesWavWidget):
         if self.comp_type in self.fft_sensor_labels:
             #FFT Params
             self.FFT_N = 512
-            self.fft_window = np.hanning(self.FFT_N)
+            self.fft_overlap = 0.5
+            self.fft_nof_averages = 4
             self.current_x = 0
-            self.x_data_fft = np.fft.rfftfreq(self.FFT_N, 1/plot_params.odr)
-            self.y_queue_fft = dict() # dict of queues for fft
-            self.fft_graph_curves = dict()
-            self.fft_input_buff = []
             self.fft_window_flag = True
+            self.fft_engine = WelchSpectrum(plot_params.dimension, plot_params.odr, self.FFT_N, self.fft_overlap, self.fft_nof_averages, self.fft_window_flag)
+            self.x_data_fft = self.fft_engine.freqs
+            self.fft_graph_curves = dict()
+            #Spectrogram Params
+            self.spectrogram_fft_n = 1024
+            self.spectrogram_overlap = 0.5
+            self.spectrogram_db_range = 80
+            self.spectrogram = None
+            self.spectrogram_image = None
 
         super().__init__(controller, comp_name, comp_display_name, plot_params, p_id, parent)
         self.controller.sig_tag_done.connect(self.s_tag_done)
         self.controller.sig_ispu_ucf_loaded.connect(self.s_ispu_ucf_loaded)
                 
         self.active_tags = dict()
-        self.tag_lines = []
+        self.tag_markers = TagMarkersManager(self.graph_widget)
         
         self.out_fmt_valid = None
         self.plot_params = plot_params
@@ -81,11 +90,23 @@ class HSDPlotLinesWidget(PlotLinesWavWidget):
             self.tf_time_pushButton.setStyleSheet(STDTDL_PushButton.green)
             self.tf_fft_pushButton = self.time_freq_setting_frame.findChild(QPushButton, "pushButton_tf_fft")
             self.tf_fft_pushButton.clicked.connect(self.clicked_tf_fft_button)
+            self.tf_spectrogram_pushButton = QPushButton("spg")
+            self.tf_spectrogram_pushButton.setFixedSize(50, 30)
+            self.tf_spectrogram_pushButton.setToolTip("live spectrogram (waterfall) plot")
+            self.tf_spectrogram_pushButton.clicked.connect(self.clicked_tf_spectrogram_button)
+            tf_layout = self.time_freq_setting_frame.layout()
+            tf_layout.insertWidget(tf_layout.indexOf(self.tf_fft_pushButton) + 1, self.tf_spectrogram_pushButton, alignment=Qt.AlignHCenter)
             self.frame_tf_fft_settings = self.time_freq_setting_frame.findChild(QFrame, "frame_tf_fft_settings")
             self.frame_tf_fft_settings.setVisible(False)
             self.pushButton_hanning_window = self.frame_tf_fft_settings.findChild(QPushButton, "pushButton_hanning_window")
             self.pushButton_hanning_window.clicked.connect(self.clicked_hanning_window_button)
             self.pushButton_hanning_window.setStyleSheet(STDTDL_PushButton.green)
+            self.fft_size_comboBox = QComboBox()
+            self.fft_size_comboBox.addItems([str(n) for n in WelchSpectrum.FFT_SIZES])
+            self.fft_size_comboBox.setCurrentText(str(self.FFT_N))
+            self.fft_size_comboBox.setToolTip("FFT size")
+            self.fft_size_comboBox.currentTextChanged.connect(self.s_fft_size_changed)
+            self.frame_tf_fft_settings.layout().addWidget(self.fft_size_comboBox)
             self.pushButton_close_settings = self.time_freq_setting_frame.findChild(QPushButton, "pushButton_time_freq_close_settings")
             self.pushButton_close_settings.clicked.connect(self.clicked_tf_plot_settings_button)
             self.pushButton_plot_settings.clicked.connect(self.clicked_tf_plot_settings_button)
@@ -204,12 +225,14 @@ class HSDPlotLinesWidget(PlotLinesWavWidget):
     def clicked_tf_time_button(self):
         if self.tf_time_flag == False:
             self.frame_tf_fft_settings.setVisible(False)
-            for tl in self.tag_lines:
-                tl.setVisible(True)
+            self.tag_markers.set_visible(True)
         self.tf_time_pushButton.setStyleSheet(STDTDL_PushButton.green)
         self.tf_fft_pushButton.setStyleSheet(STDTDL_PushButton.valid)
+        self.tf_spectrogram_pushButton.setStyleSheet(STDTDL_PushButton.valid)
         self.tf_time_flag = True
         self.tf_fft_flag = False
+        self.tf_spectrogram_flag = False
+        self.__stop_spectrogram()
         self.current_x = self.x_data[-1]
         for i in range(self.plot_params.dimension):
             self.graph_curves[i].setVisible(True)
@@ -223,12 +246,14 @@ class HSDPlotLinesWidget(PlotLinesWavWidget):
     def clicked_tf_fft_button(self):
         if self.tf_fft_flag == False:
             self.frame_tf_fft_settings.setVisible(True)
-            for tl in self.tag_lines:
-                tl.setVisible(False)
+            self.tag_markers.set_visible(False)
         self.tf_time_pushButton.setStyleSheet(STDTDL_PushButton.valid)
         self.tf_fft_pushButton.setStyleSheet(STDTDL_PushButton.green)
+        self.tf_spectrogram_pushButton.setStyleSheet(STDTDL_PushButton.valid)
         self.tf_time_flag = False
         self.tf_fft_flag = True
+        self.tf_spectrogram_flag = False
+        self.__stop_spectrogram()
         self.current_x = self.x_data[-1]
 
         for i in range(self.plot_params.dimension):
@@ -244,6 +269,54 @@ class HSDPlotLinesWidget(PlotLinesWavWidget):
 
             self.__show_fft_curves_in_legend()
     
+    def clicked_tf_spectrogram_button(self):
+        self.frame_tf_fft_settings.setVisible(False)
+        self.tag_markers.set_visible(False)
+        self.tf_time_pushButton.setStyleSheet(STDTDL_PushButton.valid)
+        self.tf_fft_pushButton.setStyleSheet(STDTDL_PushButton.valid)
+        self.tf_spectrogram_pushButton.setStyleSheet(STDTDL_PushButton.green)
+        self.tf_time_flag = False
+        self.tf_fft_flag = False
+        self.tf_spectrogram_flag = True
+        self.current_x = self.x_data[-1]
+
+        for i in range(self.plot_params.dimension):
+            self.graph_curves[i].setVisible(False)
+        for i in self.fft_graph_curves:
+            self.fft_graph_curves[i].setVisible(False)
+
+        self.__start_spectrogram()
+
+    def __start_spectrogram(self):
+        self.__stop_spectrogram()
+        self.spectrogram = Spectrogram(self.plot_params.dimension, self.plot_params.odr, self.spectrogram_fft_n, self.spectrogram_overlap, self.plot_params.time_window, name=self.comp_name)
+        if self.spectrogram_image is None:
+            self.spectrogram_image = pg.ImageItem()
+            self.spectrogram_image.setLookupTable(pg.colormap.get("viridis").getLookupTable())
+            self.graph_widget.addItem(self.spectrogram_image)
+        # x: time [s] (last time_window seconds), y: frequency [Hz]
+        self.spectrogram_image.setImage(self.spectrogram.get_image()[0], autoLevels=False, levels=(self.spectrogram.min_db, 0))
+        self.spectrogram_image.setRect(QRectF(-self.spectrogram.time_window, 0, self.spectrogram.time_window, self.plot_params.odr / 2))
+        self.spectrogram_image.setVisible(True)
+        self.spectrogram.start()
+
+    def __stop_spectrogram(self):
+        if self.spectrogram is not None:
+            self.spectrogram.stop()
+            self.spectrogram = None
+        if self.spectrogram_image is not None:
+            self.spectrogram_image.setVisible(False)
+
+    def set_spectrogram_params(self, fft_n = None, overlap = None, db_range = None):
+        if fft_n is not None:
+            self.spectrogram_fft_n = fft_n
+        if overlap is not None:
+            self.spectrogram_overlap = overlap
+        if db_range is not None:
+            self.spectrogram_db_range = db_range
+        if self.tf_spectrogram_flag:
+            self.__start_spectrogram()
+
     def clicked_hanning_window_button(self):
         if self.fft_window_flag == True:
             self.fft_window_flag = False
@@ -251,32 +324,32 @@ class HSDPlotLinesWidget(PlotLinesWavWidget):
         else:
             self.fft_window_flag = True
             self.pushButton_hanning_window.setStyleSheet(STDTDL_PushButton.green)
+        self.fft_engine.windowed = self.fft_window_flag
+
+    @Slot(str)
+    def s_fft_size_changed(self, fft_size):
+        self.set_fft_params(fft_n=int(fft_size))
+
+    def set_fft_params(self, fft_n = None, overlap = None, nof_averages = None):
+        if fft_n is not None:
+            self.FFT_N = fft_n
+        if overlap is not None:
+            self.fft_overlap = overlap
+        if nof_averages is not None:
+            self.fft_nof_averages = nof_averages
+        self.update_fft_plots(self.plot_params)
     
     @Slot()
     def s_tag_done(self, status, tag_label:str):
         if status:
             if not tag_label in self.active_tags or self.active_tags[tag_label] == False:
                 self.active_tags[tag_label] = True
-                pen=pg.mkPen(color='#00FF00', width=1)
-                tag_line = pg.InfiniteLine(pos = self.x_data[-1], angle=90, movable=False, pen=pen, label=tag_label + " ON")
-                if self.tf_fft_flag:
-                    tag_line.setVisible(False)
-                else:
-                    tag_line.setVisible(True)
-                self.graph_widget.addItem(tag_line, ignoreBounds=True)
-                self.tag_lines.append(tag_line)
+                self.tag_markers.add(self.x_data[-1], tag_label + " ON", '#00FF00')
 
         else:
             if not tag_label in self.active_tags or self.active_tags[tag_label] == True:
                 self.active_tags[tag_label] = False
-                pen=pg.mkPen(color='#FF0000', width=1)
-                tag_line = pg.InfiniteLine(pos = self.x_data[-1], angle=90, movable=False, pen=pen, label=tag_label + " OFF")
-                if self.tf_fft_flag:
-                    tag_line.setVisible(False)
-                else:
-                    tag_line.setVisible(True)
-                self.graph_widget.addItem(tag_line, ignoreBounds=True)
-                self.tag_lines.append(tag_line)
+                self.tag_markers.add(self.x_data[-1], tag_label + " OFF", '#FF0000')
                 
     @Slot(str,str)
     def s_ispu_ucf_loaded(self, ucf_path, output_json_fpath):
@@ -294,9 +367,7 @@ class HSDPlotLinesWidget(PlotLinesWavWidget):
             
 
     def __clean_tag_lines(self):
-        for t in self.tag_lines:
-            self.graph_widget.removeItem(t)
-            self.tag_lines = []            
+        self.tag_markers.clear()
     
     @Slot(bool, int) #Override PlotLinesWavWidget s_is_logging
     def s_is_logging(self, status: bool, interface: int):
@@ -338,64 +409,62 @@ class HSDPlotLinesWidget(PlotLinesWavWidget):
             super().s_is_logging(status, interface)
     
     def update_fft_plots(self, plot_params):
-        self.x_data_fft = np.fft.rfftfreq(self.FFT_N, 1/plot_params.odr)
-        for i in range(self.plot_params.dimension):
-            self._data[i] = deque(maxlen=200000)
-            self.y_queue_fft[i] = deque(maxlen=int(self.FFT_N/2)+1)
-            self.y_queue_fft[i].extend(np.zeros(int(self.FFT_N/2)+1))
-            if len(self.fft_graph_curves) < self.plot_params.dimension:
-                self.fft_graph_curves[i] = self.graph_widget.plot()
-                self.fft_graph_curves[i] = pg.PlotDataItem(pen=({'color': self.lines_colors[i - (len(self.lines_colors)* int(i / len(self.lines_colors)))], 'width': 1}), skipFiniteCheck=True, ignoreBounds=True)
-                self.graph_widget.addItem(self.fft_graph_curves[i])
+        with self.plot_data_lock:
+            self.fft_engine = WelchSpectrum(self.plot_params.dimension, plot_params.odr, self.FFT_N, self.fft_overlap, self.fft_nof_averages, self.fft_window_flag)
+            self.x_data_fft = self.fft_engine.freqs
+            for i in range(self.plot_params.dimension):
+                self._data[i].clear()
+                if len(self.fft_graph_curves) < self.plot_params.dimension:
+                    self.fft_graph_curves[i] = self.graph_widget.plot()
+                    self.fft_graph_curves[i] = pg.PlotDataItem(pen=({'color': self.lines_colors[i - (len(self.lines_colors)* int(i / len(self.lines_colors)))], 'width': 1}), skipFiniteCheck=True, ignoreBounds=True)
+                    self.graph_widget.addItem(self.fft_graph_curves[i])
+            self.plot_t_interval_size = int(self.plot_len/(plot_params.time_window / self.timer_interval))
         self.app_qt.processEvents()
-        self.plot_t_interval_size = int(self.plot_len/(plot_params.time_window / self.timer_interval))
     
     def update_plot_characteristics(self, plot_params:PlotParams):
         super().update_plot_characteristics(plot_params)
         if self.comp_type in self.fft_sensor_labels:
             self.update_fft_plots(plot_params)
+            if self.tf_spectrogram_flag:
+                self.__start_spectrogram()
             
     @Slot(bool)
     def s_is_detecting(self, status:bool):
         self.s_is_logging(status, 1)
 
-    def update_plot(self):
-        # if self.tf_time_flag:
-        self.x_data = self.x_data + self.timer_interval
-        # for i in range(self.n_curves):
-        for i in range(self.plot_params.dimension):
-            if len(self._data[i]) > 0: # If data queue is not empty
-                # Extract all data from the queue (pop)
-                one_reduced_t_interval = [self._data[i].popleft() for _i in range(len(self._data[i]))]
-                # Resample extracted raw data to have the same plot_timer_interval size (plot len / (time window / times interval(sec)))
-                self.one_t_interval_resampled[i] = self.resample_linear1D(one_reduced_t_interval, self.plot_t_interval_size)
-                # Put resampled data into the y data queue
-                self.y_queue[i].extend(self.one_t_interval_resampled[i])
-                if self.tf_fft_flag:
-                    self.fft_input_buff.extend(one_reduced_t_interval)
-                    if len(self.fft_input_buff) >= self.FFT_N:
-                        signal = self.fft_input_buff[:self.FFT_N]
-                        if self.fft_window_flag == True:
-                            w_signal = self.fft_window * signal
-                            # Calculate the FFT
-                            fft = np.abs(np.fft.rfft(w_signal)) / self.FFT_N
-                        else:
-                            fft = np.abs(np.fft.rfft(signal)) / self.FFT_N
-                        self.one_t_interval_resampled[i] = np.concatenate(([fft[0]], 2*fft[1:]))
-                        # Put resampled data into the y data queue
-                        self.y_queue_fft[i].extend(self.one_t_interval_resampled[i])
-                        self.fft_input_buff = []
-            else: #data queue is empty
-                if self.tf_fft_flag:
-                    self.y_queue_fft[i].extend(self.one_t_interval_resampled[i])
-                self.y_queue[i].extend(self.one_t_interval_resampled[i])
-            # set extracted resampled data into the plot curve (for each axis) [x and y will have the same len = (plot len / (time window / times interval(sec)))
-            # self.graph_curves[i].setData(x=self.x_data,y=np.array(self.y_queue[i]))
-            if self.tf_fft_flag:
-                self.fft_graph_curves[i].setData(x=self.x_data_fft,y=np.array(self.y_queue_fft[i]))
-            else:
-                self.graph_curves[i].setData(x=self.x_data,y=np.array(self.y_queue[i]))
-        self.app_qt.processEvents()
+    def consume_raw_samples(self, axis, samples):
+        if self.tf_fft_flag:
+            # Feed the per-axis spectrum estimator with all the received samples
+            self.fft_engine.add_samples(axis, samples)
+
+    def prepare_plot_data(self, ticks, frame):
+        super().prepare_plot_data(ticks, frame)
+        frame["fft"] = None
+        frame["spectrogram"] = None
+        if self.tf_fft_flag:
+            # Welch averaged spectra of all the axes (single batched rfft)
+            frame["fft"] = self.fft_engine.compute()
+        elif self.tf_spectrogram_flag:
+            spectrogram = self.spectrogram
+            if spectrogram is not None:
+                # STFT frames are computed by the spectrogram thread: only the image is copied here
+                image, image_max_db = spectrogram.get_image()
+                max_db = max(image_max_db, spectrogram.min_db + self.spectrogram_db_range)
+                frame["spectrogram"] = (image, (max_db - self.spectrogram_db_range, max_db))
+
+    def render_plot_data(self, frame):
+        if self.tf_time_flag:
+            super().render_plot_data(frame)
+        # Only the tags inside the scrolled time window have a graphic item
+        self.tag_markers.update_view(frame["x"][0], frame["x"][-1])
+        spectra = frame.get("fft")
+        if self.tf_fft_flag and spectra is not None and spectra.shape[1] == len(self.x_data_fft):
+            for i in range(min(len(spectra), len(self.fft_graph_curves))):
+                self.fft_graph_curves[i].setData(x=self.x_data_fft,y=spectra[i])
+        spectrogram_frame = frame.get("spectrogram")
+        if self.tf_spectrogram_flag and spectrogram_frame is not None and self.spectrogram_image is not None:
+            image, levels = spectrogram_frame
+            self.spectrogram_image.setImage(image, autoLevels=False, levels=levels)
 
     def add_data(self, data):
         if "_ispu" in self.comp_name:
@@ -405,7 +474,10 @@ class HSDPlotLinesWidget(PlotLinesWavWidget):
                     ax_len = of["data_byte_len"]
                     ax_value_bytes = np.array(data[0][data_idx:data_idx+ax_len],dtype='int8').tobytes()#np.concatenate(list(data.values())[data_idx:data_idx+ax_len]).tolist()
                     ax_value = struct.unpack("=" + of["data_format"], ax_value_bytes)
-                    self._data[i].extend(ax_value)
+                    self._data[i].write(ax_value)
                     data_idx += ax_len
         else:
             super().add_data(data)
+            spectrogram = self.spectrogram if self.tf_spectrogram_flag else None
+            if spectrogram is not None:
+                spectrogram.add_samples(data)
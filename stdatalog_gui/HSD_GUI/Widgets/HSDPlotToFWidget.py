@@ -16,6 +16,7 @@
 from PySide6.QtCore import Slot
 from PySide6.QtWidgets import QFrame, QHBoxLayout
 
+from stdatalog_gui.Utils.FrameSlot import FrameSlotMode
 from stdatalog_gui.Utils.PlotParams import PlotParams
 from stdatalog_gui.Widgets.Plots.PlotHeatmapWidget import PlotHeatmapWidget
 from stdatalog_gui.Widgets.Plots.PlotWidget import PlotWidget
@@ -64,6 +65,13 @@ class HSDPlotToFWidget(PlotWidget):
         self.plot_params = plot_params
         self.output_format = self.plot_params.output_format
 
+    def set_buffer_mode(self, mode:FrameSlotMode):
+        for h in self.heatmaps.values():
+            h.set_buffer_mode(mode)
+
+    def get_skipped_frames_count(self):
+        return sum(h.get_skipped_frames_count() for h in self.heatmaps.values())
+
     def add_data(self, data):
         if self.output_format:
             start_t1_dist_id = self.output_format.get("target_distance").get("start_id")
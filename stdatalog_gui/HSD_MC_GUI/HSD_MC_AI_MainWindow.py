@@ -113,6 +113,7 @@ class HSD_MC_AI_MainWindow(STDTDL_MainWindow):
 
     def closeEvent(self, event):
         self.controller.stop_log()
+        self.controller.close_data_files()
         event.accept()
 
     # TODO: Next version --> Hotplug events notification support
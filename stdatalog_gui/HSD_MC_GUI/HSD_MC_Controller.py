@@ -49,9 +49,7 @@ class HSD_MC_Controller(HSD_Controller):
             
                 if c_enable == True:
                     if self.save_files_flag:
-                        sensor_data_file_path = os.path.join(self.hsd_link.get_acquisition_folder(),(str(s_plot.comp_name) + ".dat"))
-                        sensor_data_file = open(sensor_data_file_path, "wb+")
-                        self.sensor_data_files.append(sensor_data_file)
+                        sensor_data_file = self.open_sensor_data_file(s_plot.comp_name)
                     stopFlag = Event()
                     self.threads_stop_flags.append(stopFlag)
                     
@@ -73,12 +71,7 @@ class HSD_MC_Controller(HSD_Controller):
                     dr = HSD_Controller.DataReader(self, self.add_data_to_a_plot, s_plot.comp_name, spts, dimensions, sample_size, data_format, sensitivity, interleaved_data, raw_flat_data)
                     self.data_readers.append(dr)
 
-                    if self.save_files_flag:
-                        thread = self.SensorAcquisitionThread(stopFlag, self.hsd_link, dr, self.device_id, s_plot.comp_name, sensor_data_file, usb_dps, self.sig_streaming_error)
-                    else:
-                        thread = self.SensorAcquisitionThread(stopFlag, self.hsd_link, dr, self.device_id, s_plot.comp_name, None, usb_dps, self.sig_streaming_error)
-                    thread.start()
-                    self.sensors_threads.append(thread)
+                    self.start_component_acquisition(stopFlag, dr, s_plot.comp_name, sensor_data_file if self.save_files_flag else None, usb_dps)
 
     def get_plot_params(self, comp_name, comp_type, comp_interface, comp_status):
         if comp_type.name == ComponentType.ACTUATOR.name:
@@ -162,10 +155,11 @@ class HSD_MC_Controller(HSD_Controller):
         Args:
             motor_id (int): Motor ID (default is 0)
         """
-        # Send Start motor cmd
-        self.send_command(PnPLCMDManager.create_command_cmd(self.mc_comp_name, self.mc_start_cmd_name))
-        # Emit signal
-        self.sig_is_motor_started.emit(True, motor_id)
+        # Send Start motor cmd (the signal is emitted when the board replies)
+        def started(response):
+            if response is not None:
+                self.sig_is_motor_started.emit(True, motor_id)
+        return self.send_command_async(PnPLCMDManager.create_command_cmd(self.mc_comp_name, self.mc_start_cmd_name), started)
 
     def stop_motor(self, motor_id=0):
         """
@@ -187,11 +181,15 @@ class HSD_MC_Controller(HSD_Controller):
         Args:
             motor_id (int): Motor ID (default is 0)
         """
-        res = self.send_command(PnPLCMDManager.create_command_cmd(self.mc_comp_name, self.mc_ack_fault_cmd_name))
-        time.sleep(0.7)
-        stop_res = self.stop_motor()
-        if res is not None and stop_res is not None:
-            self.sig_motor_fault_acked.emit()
+        ack_cmd = PnPLCMDManager.create_command_cmd(self.mc_comp_name, self.mc_ack_fault_cmd_name)
+        stop_cmd = PnPLCMDManager.create_command_cmd(self.mc_comp_name, self.mc_stop_cmd_name)
+        # Acknowledge, wait 0.7 s and stop are run by the PnPL worker, without blocking the GUI
+        def acked(results):
+            (res, _), (stop_res, _) = results
+            if res is not None and stop_res is not None:
+                self.sig_is_motor_started.emit(False, motor_id)
+                self.sig_motor_fault_acked.emit()
+        return self.send_commands_async([ack_cmd, stop_cmd], acked, interval=0.7)
 
     def set_motor_speed(self, value, motor_id=0):
         """
@@ -201,4 +199,4 @@ class HSD_MC_Controller(HSD_Controller):
             value (int): Speed value
             motor_id (int): Motor ID (default is 0)
         """
-        self.send_command(PnPLCMDManager.create_set_property_cmd(self.mc_comp_name, self.mc_motor_speed_prop_name, value))
\ No newline at end of file
+        return self.set_property_async(self.mc_comp_name, self.mc_motor_speed_prop_name, value)
\ No newline at end of file
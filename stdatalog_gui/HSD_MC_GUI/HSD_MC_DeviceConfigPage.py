@@ -40,7 +40,7 @@ class HSD_MC_DeviceConfigPage(HSD_DeviceConfigPage):
     @Slot(str, dict)
     def s_component_found(self, comp_name, comp_interface):
         if comp_name == "motor_controller":
-            properties = [content for content in comp_interface.contents if isinstance(content.type, list) and any(e.name == 'PROPERTY' for e in content.type)]
+            properties = self.controller.get_component_schema(comp_name).get_property_contents()
             show_properties = [pro for pro in properties if pro.description is None or (pro.description.en is not None and pro.description.en != 'hidden')]
 
             comp_display_name = comp_interface.display_name if isinstance(comp_interface.display_name, str) else comp_interface.display_name.en
@@ -13,7 +13,6 @@
 # ******************************************************************************
 #
 
-from collections import deque
 import os
 from enum import Enum
 
@@ -25,6 +24,8 @@ from PySide6.QtUiTools import QUiLoader
 from PySide6.QtDesigner import QPyDesignerCustomWidgetCollection
 
 import stdatalog_gui
+from stdatalog_gui.Utils.FrameSlot import FrameSlot
+from stdatalog_gui.Widgets.Plots.ClassifierOutputWidget import CLASS_NAME_STYLE
 from stdatalog_gui.Widgets.Plots.PlotWidget import PlotWidget
 from stdatalog_gui.Widgets.Plots.PlotWidget import PlotLabel
 import stdatalog_pnpl.DTDL.dtdl_utils as DTDLUtils
@@ -65,8 +66,9 @@ class HSD_MC_ClassifierOutputWidget(PlotWidget):
         for i in reversed(range(self.layout().count())): 
             self.layout().itemAt(i).widget().setParent(None)
 
-        self._data = dict() # dict of queues
-        self._data[0] = deque(maxlen=200000)
+        self._data = dict() # dict of frame slots
+        # Only the most recent result is displayed, the older ones are counted as skipped
+        self._data[0] = FrameSlot()
         
         self.parent_widget = parent
 
@@ -75,6 +77,10 @@ class HSD_MC_ClassifierOutputWidget(PlotWidget):
         self.ai_tool = ai_tool
         self.output_class_widget = {}
         self.output_class_pixmaps = {}
+        self.output_class_name_labels = {}
+        # Last rendered state (row active status, None: unknown), to update only what changes
+        self.shown_class_states = {}
+        self.shown_confidence = None
         self.demo_class_widget = {}
         self.demo_class_pixmaps = {}
         
@@ -163,8 +169,10 @@ class HSD_MC_ClassifierOutputWidget(PlotWidget):
             self.output_class_widget[output_class] = loader.load(os.path.join(os.path.dirname(stdatalog_gui.__file__),"UI","output_class_widget.ui"), parent)
             class_name = self.output_class_widget[output_class].findChild(QLabel,"out_class_name")
             class_name.setText(output_class)
+            self.output_class_name_labels[output_class] = class_name
+            self.shown_class_states[output_class] = None
             if output_class != "ISPU": #NOTE Done for ISPU CES2023 Demo purposes
-                self.output_class_widget[output_class].out_class_name.setStyleSheet("color: #383D48; font-size: 20px;")
+                self.output_class_widget[output_class].out_class_name.setStyleSheet(CLASS_NAME_STYLE)
             else:
                 self.output_class_widget[output_class].out_class_name.setStyleSheet("color: #3cb4e6; font-size: 20px;")
             class_pixmap = QPixmap(self.out_classes[output_class])
@@ -222,6 +230,39 @@ class HSD_MC_ClassifierOutputWidget(PlotWidget):
     
     def update_plot_characteristics(self, plot_params):
         pass
+
+    def set_class_row_state(self, class_name, active):
+        row = self.output_class_widget[class_name]
+        row.out_class_image.setPixmap(self.output_class_pixmaps[class_name][0 if active else 1])
+        row.setEnabled(active)
+        name_label = self.output_class_name_labels[class_name]
+        if name_label.styleSheet() != CLASS_NAME_STYLE:
+            name_label.setStyleSheet(CLASS_NAME_STYLE)
+        name_label.setProperty("active", active)
+        name_label.style().unpolish(name_label)
+        name_label.style().polish(name_label)
+        self.shown_class_states[class_name] = active
+
+    def show_class(self, class_name):
+        """
+        Highlight class_name row (None: no highlighted class), touching only the rows whose state changes
+        """
+        for cn, shown_state in self.shown_class_states.items():
+            active = cn == class_name
+            if shown_state != active:
+                self.set_class_row_state(cn, active)
+
+    def show_confidence(self, text):
+        if text != self.shown_confidence:
+            self.class_confidence_value.setText(text)
+            self.shown_confidence = text
+
+    def get_skipped_frames_count(self):
+        return self._data[0].skipped_cnt
+
+    def has_new_data(self):
+        # With no new results, update_plot is still needed once to clear the displayed class
+        return self._data[0].has_data() or self.is_plotting_out
     
     @Slot(bool)
     def s_is_detecting(self, status: bool):
@@ -243,12 +284,11 @@ class HSD_MC_ClassifierOutputWidget(PlotWidget):
         
     
     def update_plot(self):
-        if len(self._data[0]) > 0: 
+        result = self._data[0].take()
+        if result is not None: 
             if not self.is_plotting_out:
                 self.is_plotting_out = True
-            # Extract all data from the queue (pop)    
-            one_reduced_t_interval = [self._data[0].popleft() for _i in range(len(self._data[0]))]
-            one_reduced_t_interval_int = one_reduced_t_interval[0].astype(np.int32)
+            one_reduced_t_interval_int = result.astype(np.int32)
             predicted_class = one_reduced_t_interval_int[0]
 
             probability_byte = one_reduced_t_interval_int[1:]
@@ -260,36 +300,23 @@ class HSD_MC_ClassifierOutputWidget(PlotWidget):
 
             if self.with_confidence:
                 confidence = prediction_probability
-                self.class_confidence_value.setText(str(round((confidence * 100.0), 2)) + " %")
+                self.show_confidence(str(round((confidence * 100.0), 2)) + " %")
 
             # run classifier sm
             self.classifier_sm(predicted_class)
         else:
             if self.is_plotting_out:
-                for cn in list(self.output_class_widget.keys()):
-                    self.output_class_widget[cn].out_class_image.setPixmap(self.output_class_pixmaps[cn][1])
-                    self.output_class_widget[cn].setEnabled(False)
-                    self.output_class_widget[cn].findChild(QLabel,"out_class_name").setStyleSheet("color: #383D48; font-size: 20px;")
+                self.show_class(None)
                 self.is_plotting_out = False
                 if self.with_confidence:
-                    self.class_confidence_value.setText("--- %")
-        self.app_qt.processEvents()
+                    self.show_confidence("--- %")
 
     def add_data(self, data):
-        self._data[0].append(data[0])
+        self._data[0].put(data[0])
 
     def plot_classifier_class(self, class_id):
         class_names = list(self.output_class_widget.keys())
-        class_name = class_names[class_id]
-        for cn in class_names:
-            if cn == class_name:
-                self.output_class_widget[cn].out_class_image.setPixmap(self.output_class_pixmaps[cn][0])
-                self.output_class_widget[cn].setEnabled(True)
-                self.output_class_widget[cn].findChild(QLabel,"out_class_name").setStyleSheet("color: #a4c238; font-size: 30px;")
-            else:
-                self.output_class_widget[cn].out_class_image.setPixmap(self.output_class_pixmaps[cn][1])
-                self.output_class_widget[cn].setEnabled(False)
-                self.output_class_widget[cn].findChild(QLabel,"out_class_name").setStyleSheet("color: #383D48; font-size: 20px;")
+        self.show_class(class_names[class_id])
 
 
     def classifier_sm(self, class_id):
@@ -320,11 +347,7 @@ class HSD_MC_ClassifierOutputWidget(PlotWidget):
             self.plot_classifier_class(self.plot_class_id)
             
     def disableAllClassificationWidget(self):
-        class_names = list(self.output_class_widget.keys())
-        for cn in class_names:
-            self.output_class_widget[cn].out_class_image.setPixmap(self.output_class_pixmaps[cn][1])
-            self.output_class_widget[cn].setEnabled(False)
-            self.output_class_widget[cn].findChild(QLabel,"out_class_name").setStyleSheet("color: #383D48; font-size: 20px;")
+        self.show_class(None)
 
     def disableAllWidget(self):
         self.disableAllClassificationWidget()
@@ -13,18 +13,19 @@
 # ******************************************************************************
 #
 
-import numpy as np
-from collections import deque
-
 from PySide6.QtCore import Slot
 
-import pyqtgraph as pg
 from stdatalog_gui.Utils.PlotParams import LinesPlotParams, SensorCameraPlotParams, SensorLightPlotParams, SensorMemsPlotParams, SensorAudioPlotParams, SensorPlotParams, SensorRangingPlotParams
 
+from stdatalog_gui.Utils.TagMarkers import TagMarkersManager
 from stdatalog_gui.Widgets.Plots.PlotWidget import PlotWidget
+from stdatalog_gui.Widgets.Plots.LinesPlotBuffers import LinesPlotBuffers
 from stdatalog_pnpl.DTDL import dtdl_utils
 
-class HSD_MC_FastTelemetriesPlotLinesWidget(PlotWidget):
+class HSD_MC_FastTelemetriesPlotLinesWidget(LinesPlotBuffers, PlotWidget):
+    # Telemetries missing in a tick are plotted as zeros
+    REPEAT_LAST_INTERVAL = False
+
     def __init__(self, controller, comp_name, comp_display_name, plot_params, p_id = 0, parent=None):
         super().__init__(controller, comp_name, comp_display_name, p_id, parent, plot_params.unit)
         
@@ -35,15 +36,10 @@ class HSD_MC_FastTelemetriesPlotLinesWidget(PlotWidget):
         self.plot_params = plot_params
         self.plot_t_interval_size = int(self.plot_len/(plot_params.time_window / self.timer_interval))     
         
-        self.lines_colors = ['#e6007e', '#a4c238', '#3cb4e6', '#ef4f4f', '#46b28e', '#e8ce0e', '#60b562', '#f99e20', '#41b3ba']
-        self.graph_curves = dict()
-        
-        self.one_t_interval_resampled = dict()
-        self._data = dict() # dict of queues
-        self.y_queue = dict() # dict of queues
+        self.init_lines_buffers()
 
         self.active_tags = dict()
-        self.tag_lines = []
+        self.tag_markers = TagMarkersManager(self.graph_widget)
         
         self.update_plot_characteristics(plot_params)
         # if isinstance(plot_params, SensorMemsPlotParams):
@@ -67,23 +63,9 @@ class HSD_MC_FastTelemetriesPlotLinesWidget(PlotWidget):
         # self.n_curves = plot_params.dimension
         # self.time_window = plot_params.time_window
 
-        for i in range(self.plot_params.dimension):
-           self.one_t_interval_resampled[i] = np.zeros(self.plot_t_interval_size)
-        
-        self.x_data = np.linspace(-(plot_params.time_window), 0, self.plot_len)
-        for i in range(self.plot_params.dimension):
-            self._data[i] = deque(maxlen=200000)
-            self.y_queue[i] = deque(maxlen=self.plot_len)
-            self.y_queue[i].extend(np.zeros(self.plot_len))
-            if len(self.graph_curves) < self.plot_params.dimension:
-                self.graph_curves[i] = self.graph_widget.plot()
-                self.graph_curves[i] = pg.PlotDataItem(pen=({'color': self.lines_colors[i - (len(self.lines_colors)* int(i / len(self.lines_colors)))], 'width': 1}), skipFiniteCheck=True, ignoreBounds=True)
-                self.graph_widget.addItem(self.graph_curves[i])
-        
+        self.reset_lines_buffers()
         if self.app_qt is not None:
             self.app_qt.processEvents()
-        
-        self.plot_t_interval_size = int(self.plot_len/(plot_params.time_window / self.timer_interval))
             
     @Slot(float)
     def s_time_window_updated(self, new_time_w):
@@ -129,59 +111,29 @@ class HSD_MC_FastTelemetriesPlotLinesWidget(PlotWidget):
 
     def reset(self):
         pass
-    
-    def resample_linear1D(self, original, targetLen):
-        original = np.array(original, dtype=float)
-        index_arr = np.linspace(0, len(original)-1, num=targetLen, dtype=float)
-        index_floor = np.array(index_arr, dtype=int) #Round down
-        index_ceil = index_floor + 1
-        index_rem = index_arr - index_floor #Remain
-        
-        val1 = original[index_floor]
-        val2 = original[index_ceil % len(original)]
-        interp = val1 * (1.0-index_rem) + val2 * index_rem
-        assert(len(interp) == targetLen)
-        return interp
-    
+
     def update_plot(self):
+        if self.hidden_ticks > 0:
+            self.restore_hidden_data()
         self.x_data = self.x_data + self.timer_interval
         # for i in range(self.n_curves):
         for i in range(self.plot_params.dimension):
-            if len(self._data[i]) > 0: # If data queue is not empty
-                # Extract all data from the queue (pop)
-                one_reduced_t_interval = [self._data[i].popleft() for _i in range(len(self._data[i]))]
-                # Resample extracted raw data to have the same plot_timer_interval size (plot len / (time window / times interval(sec)))
-                self.one_t_interval_resampled[i] = self.resample_linear1D(one_reduced_t_interval, self.plot_t_interval_size)
-                # Put resampled data into the y data queue
-                self.y_queue[i].extend(self.one_t_interval_resampled[i])
-            else: #data queue is empty
-                self.y_queue[i].extend(np.zeros(len(self.one_t_interval_resampled[i])))
+            self.update_y_window(i)
             # set extracted resampled data into the plot curve (for each axis) [x and y will have the same len = (plot len / (time window / times interval(sec)))
-            self.graph_curves[i].setData(x=self.x_data,y=np.array(self.y_queue[i]))
-        self.app_qt.processEvents()
-
-    def add_data(self, data):
-        for i in range(self.plot_params.dimension):
-            self._data[i].extend(data[i])
+            self.graph_curves[i].setData(x=self.x_data,y=self.y_queue[i].latest(self.plot_len))
+        # Only the tags inside the scrolled time window have a graphic item
+        self.tag_markers.update_view(self.x_data[0], self.x_data[-1])
 
     @Slot()
     def s_tag_done(self, status, tag_label:str):
         if status:
             if not tag_label in self.active_tags or self.active_tags[tag_label] == False:
                 self.active_tags[tag_label] = True
-                pen=pg.mkPen(color='#00FF00', width=1)
-                tag_line = pg.InfiniteLine(pos = self.x_data[-1], angle=90, movable=False, pen=pen, label=tag_label + " ON")
-                self.graph_widget.addItem(tag_line, ignoreBounds=True)
-                self.tag_lines.append(tag_line)
+                self.tag_markers.add(self.x_data[-1], tag_label + " ON", '#00FF00')
         else:
             if not tag_label in self.active_tags or self.active_tags[tag_label] == True:
                 self.active_tags[tag_label] = False
-                pen=pg.mkPen(color='#FF0000', width=1)
-                tag_line = pg.InfiniteLine(pos = self.x_data[-1], angle=90, movable=False, pen=pen, label=tag_label + " OFF")
-                self.graph_widget.addItem(tag_line, ignoreBounds=True)
-                self.tag_lines.append(tag_line)
+                self.tag_markers.add(self.x_data[-1], tag_label + " OFF", '#FF0000')
     
     def __clean_tag_lines(self):
-        for t in self.tag_lines:
-            self.graph_widget.removeItem(t)
-            self.tag_lines = []  
\ No newline at end of file
+        self.tag_markers.clear()  
\ No newline at end of file
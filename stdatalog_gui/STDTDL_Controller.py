@@ -22,6 +22,10 @@ from stdatalog_dtk.HSD_DataToolkit_Pipeline import HSD_DataToolkit_Pipeline
 from stdatalog_pnpl.DTDL.device_template_manager import DeviceTemplateManager
 from stdatalog_pnpl.DTDL.device_template_model import InterfaceElement
 from stdatalog_gui.Utils.PlotParams import SensorPlotParams, AlgorithmPlotParams, ActuatorPlotParams
+from stdatalog_gui.Utils.RenderScheduler import RenderScheduler
+from stdatalog_gui.Utils.PlotDataPipeline import PlotDataPipeline
+from stdatalog_gui.Utils.PnPLBatch import PnPLCommandBatch
+from stdatalog_gui.Utils.DTDLSchemaIndex import DTDLSchemaIndex, ComponentSchemaIndex
 from stdatalog_pnpl.DTDL.dtdl_utils import DTDL_ACTUATORS_ID_COMP_KEY, DTDL_ALGORITHMS_ID_COMP_KEY, DTDL_SENSORS_ID_COMP_KEY
 
 
@@ -86,20 +90,45 @@ class STDTDL_Controller(QObject):
         # self.plugin_plot_widgets = dict()
         self.plugin_plot_widgets = []
         self.__dt_manager = None
+        self.schema_index = DTDLSchemaIndex(dict())
         self.log_msg = ""
         self.detect_msg = ""
         self.data_pipeline = None
         self.qt_app = None
+        self.render_scheduler = None
+        self.plot_data_pipeline = None
 
     def set_Qt_app(self, qt_app):
         self.qt_app = qt_app
 
+    def get_render_scheduler(self):
+        if self.render_scheduler is None:
+            self.render_scheduler = RenderScheduler(parent=self)
+        return self.render_scheduler
+
+    def set_visibility_aware_rendering(self, enabled):
+        self.get_render_scheduler().visibility_aware = enabled
+
+    def get_plot_data_pipeline(self):
+        if self.plot_data_pipeline is None:
+            self.plot_data_pipeline = PlotDataPipeline()
+        return self.plot_data_pipeline
+
+    def set_threaded_plot_preparation(self, enabled):
+        self.get_plot_data_pipeline().enabled = enabled
+
+    def get_render_stats(self):
+        if self.render_scheduler is None:
+            return None
+        return self.render_scheduler.get_stats()
+
     def set_plots_layout(self, plots_layout):
         self.plots_layout = plots_layout
         
     def load_local_device_template(self, dev_template_json):  
         self.__dt_manager = DeviceTemplateManager(dev_template_json)
         self.components_dtdl = self.__dt_manager.get_components()
+        self.schema_index = DTDLSchemaIndex(self.components_dtdl)
         for comp_name in self.components_dtdl.keys():
             if ":"+DTDL_SENSORS_ID_COMP_KEY+":" in self.components_dtdl[comp_name].id:
                 self.sig_sensor_component_found.emit(comp_name, self.components_dtdl[comp_name])
@@ -112,6 +141,35 @@ class STDTDL_Controller(QObject):
         if self.data_pipeline is not None:
             self.data_pipeline.update_components_status(self.components_status)
                 
+    def create_pnpl_batch(self, done_callback = None):
+        """
+        Args:
+            done_callback (function): called as done_callback(failed_commands) once the batch has been sent (see PnPLCommandBatch)
+        Returns:
+            PnPLCommandBatch: collects property writes (use it in a with block: writes are sent at its end)
+        """
+        return PnPLCommandBatch(self, done_callback)
+
+    def refresh_components_status(self, comp_types):
+        """
+        Status refresh after a bulk change (controllers able to read all the components at once override this).
+        Args:
+            comp_types (dict): {comp_name: ComponentType (or None)} of the components to be refreshed
+        """
+        for comp_name, comp_type in comp_types.items():
+            self.update_component_status(comp_name, comp_type if comp_type is not None else ComponentType.OTHER)
+
+    def get_component_schema(self, comp_name):
+        """
+        Returns:
+            ComponentSchemaIndex: indexed DTDL interface of the component (None if not in the device template)
+        """
+        comp_schema = self.schema_index.get_component(comp_name)
+        if comp_schema is None and comp_name in self.components_dtdl:
+            comp_schema = ComponentSchemaIndex(self.components_dtdl[comp_name])
+            self.schema_index.components[comp_name] = comp_schema
+        return comp_schema
+
     def get_component_config_widget(self, comp_name):
         if comp_name in self.cconfig_widgets:
             return self.cconfig_widgets[comp_name]
@@ -227,6 +285,10 @@ class STDTDL_Controller(QObject):
     def send_command(self, json_command):
         pass
 
+    @abstractmethod
+    def send_commands_async(self, json_commands, callback = None, error_callback = None, interval = 0):
+        pass
+
     @abstractmethod
     def get_device_status(self):
         pass
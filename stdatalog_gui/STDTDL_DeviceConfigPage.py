@@ -29,7 +29,6 @@ import stdatalog_gui.UI.images #NOTE don't delete this! it is used from resource
 from pkg_resources import resource_filename
 
 import stdatalog_core.HSD_utils.logger as logger
-from stdatalog_pnpl.PnPLCmd import PnPLCMDManager
 log = logger.get_logger(__name__)
 
 class STDTDL_DeviceConfigPage():
@@ -103,14 +102,13 @@ class STDTDL_DeviceConfigPage():
         else:
             self.select_all_label.setText("Select all")
         cstatus_dict = self.controller.components_status
-        for c in cstatus_dict:
-            c_type = cstatus_dict[c].get("c_type")
-            if c_type == ComponentType.SENSOR.value or \
-                c_type == ComponentType.ALGORITHM.value or \
-                c_type == ComponentType.ACTUATOR.value:
-                    json_string = PnPLCMDManager.create_set_property_cmd(c, "enable", status)
-                    self.controller.send_command(json_string)
-                    self.controller.update_component_status(c, ComponentType(c_type))
+        with self.controller.create_pnpl_batch() as pnpl_batch:
+            for c in cstatus_dict:
+                c_type = cstatus_dict[c].get("c_type")
+                if c_type == ComponentType.SENSOR.value or \
+                    c_type == ComponentType.ALGORITHM.value or \
+                    c_type == ComponentType.ACTUATOR.value:
+                        pnpl_batch.set_property(c, "enable", status, ComponentType(c_type))
 
     @Slot(bool)
     def s_device_connected(self, status):
@@ -0,0 +1,128 @@
+# ******************************************************************************
+# * @attention
+# *
+# * Copyright (c) 2022 STMicroelectronics.
+# * All rights reserved.
+# *
+# * This software is licensed under terms that can be found in the LICENSE file
+# * in the root directory of this software component.
+# * If no LICENSE file comes with this software, it is provided AS-IS.
+# *
+# *
+# ******************************************************************************
+#
+
+import time
+from threading import Thread, Event, Lock
+
+import stdatalog_core.HSD_utils.logger as logger
+log = logger.get_logger(__name__)
+
+class AcquisitionScheduler(object):
+    """
+    Multiplexes the data polling of all the streaming components on a small pool of worker threads.
+    Each registered source must expose:
+        - comp_name (str)
+        - poll(): reads and processes the available data, returns the number of received bytes
+        - poll_interval (float): nominal polling period [s], adapted to the component data rate
+    Sources are assigned round-robin to the workers; each worker polls its sources when they are due.
+    A single watchdog thread replaces the per-component empty data timers.
+    """
+    def __init__(self, nof_workers = 2, empty_data_timeout = 5, empty_data_callback = None, max_poll_interval = 0.1):
+        """
+        Args:
+            nof_workers (int): number of polling threads
+            empty_data_timeout (float): seconds without data after which empty_data_callback is called
+            empty_data_callback (function): called with the source object when a component stops streaming
+            max_poll_interval (float): upper bound [s] of the adaptive polling period
+        """
+        self.nof_workers = max(1, nof_workers)
+        self.empty_data_timeout = empty_data_timeout
+        self.empty_data_callback = empty_data_callback
+        self.max_poll_interval = max_poll_interval
+        self.stopped = Event()
+        self.__lock = Lock()
+        self.__sources = []
+        self.__workers = []
+        self.__watchdog = None
+
+    class SourceState(object):
+        def __init__(self, source):
+            self.source = source
+            self.curr_poll_interval = source.poll_interval
+            self.next_poll_time = time.monotonic()
+            self.last_data_time = time.monotonic()
+            self.empty_data_reported = False
+
+    def add_source(self, source):
+        with self.__lock:
+            self.__sources.append(AcquisitionScheduler.SourceState(source))
+        if len(self.__workers) == 0:
+            self.start()
+
+    def get_sources(self):
+        with self.__lock:
+            return [s.source for s in self.__sources]
+
+    def __get_worker_sources(self, worker_id):
+        with self.__lock:
+            return self.__sources[worker_id::self.nof_workers]
+
+    def __poll_source(self, s_state):
+        received = s_state.source.poll()
+        now = time.monotonic()
+        if received > 0:
+            s_state.last_data_time = now
+            s_state.empty_data_reported = False
+            s_state.curr_poll_interval = s_state.source.poll_interval
+        else:
+            # Back off on the components that are not producing data
+            s_state.curr_poll_interval = min(s_state.curr_poll_interval * 1.5, max(self.max_poll_interval, s_state.source.poll_interval))
+        s_state.next_poll_time = now + s_state.curr_poll_interval
+
+    def __worker_run(self, worker_id):
+        while not self.stopped.is_set():
+            sources = self.__get_worker_sources(worker_id)
+            if len(sources) == 0:
+                self.stopped.wait(self.max_poll_interval)
+                continue
+            s_state = min(sources, key=lambda s: s.next_poll_time)
+            delay = s_state.next_poll_time - time.monotonic()
+            if delay > 0 and self.stopped.wait(delay):
+                break
+            try:
+                self.__poll_source(s_state)
+            except Exception as e:
+                log.error("Error acquiring data from {}: {}".format(s_state.source.comp_name, e))
+                s_state.next_poll_time = time.monotonic() + self.max_poll_interval
+
+    def __watchdog_run(self):
+        while not self.stopped.wait(0.5):
+            now = time.monotonic()
+            with self.__lock:
+                sources = list(self.__sources)
+            for s_state in sources:
+                if not s_state.empty_data_reported and now - s_state.last_data_time > self.empty_data_timeout:
+                    s_state.empty_data_reported = True
+                    if self.empty_data_callback is not None:
+                        self.empty_data_callback(s_state.source)
+
+    def start(self):
+        self.stopped.clear()
+        for w_id in range(self.nof_workers):
+            worker = Thread(target=self.__worker_run, args=(w_id,), name="acquisition_worker_{}".format(w_id), daemon=True)
+            self.__workers.append(worker)
+            worker.start()
+        self.__watchdog = Thread(target=self.__watchdog_run, name="acquisition_watchdog", daemon=True)
+        self.__watchdog.start()
+
+    def stop(self):
+        self.stopped.set()
+        for w in self.__workers:
+            w.join()
+        if self.__watchdog is not None:
+            self.__watchdog.join()
+        self.__workers = []
+        self.__watchdog = None
+        with self.__lock:
+            self.__sources = []
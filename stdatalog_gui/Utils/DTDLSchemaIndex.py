@@ -0,0 +1,117 @@
+# ******************************************************************************
+# * @attention
+# *
+# * Copyright (c) 2022 STMicroelectronics.
+# * All rights reserved.
+# *
+# * This software is licensed under terms that can be found in the LICENSE file
+# * in the root directory of this software component.
+# * If no LICENSE file comes with this software, it is provided AS-IS.
+# *
+# *
+# ******************************************************************************
+#
+
+
+from stdatalog_pnpl.DTDL.device_template_model import SchemaEnum
+
+def get_en_string(dtdl_string):
+    # DTDL display names, units and descriptions are either plain strings or localized objects
+    if dtdl_string is None or isinstance(dtdl_string, str):
+        return dtdl_string
+    return dtdl_string.en
+
+class EnumSchemaIndex(object):
+    """
+    Enum schema of a property, with index <-> value/display name dictionaries.
+    Enum properties are exchanged with the FW by index (position in the schema enum values).
+    """
+    def __init__(self, schema):
+        self.value_schema = schema.value_schema
+        self.values = [ev.enum_value for ev in schema.enum_values]
+        self.display_names = [get_en_string(ev.display_name) for ev in schema.enum_values]
+        self.index_by_value = {v: i for i, v in enumerate(self.values)}
+        self.index_by_display_name = {n: i for i, n in enumerate(self.display_names)}
+        # Numeric interpretation of the display names (e.g. ODR "1,6" -> 1.6), the index if not a number
+        self.numbers = []
+        for i, n in enumerate(self.display_names):
+            n = n.replace(',', '.') if n is not None else ""
+            if self.value_schema == SchemaEnum.INTEGER:
+                try:
+                    self.numbers.append(float(n))
+                except ValueError:
+                    self.numbers.append(i)
+            else:
+                self.numbers.append(n)
+
+class ComponentSchemaIndex(object):
+    """
+    Contents of a DTDL component interface indexed by name.
+    """
+    def __init__(self, comp_interface):
+        self.interface = comp_interface
+        self.contents = {c.name: c for c in comp_interface.contents}
+        self.property_names = []
+        self.writable_property_names = []
+        self.enums = dict()
+        for c in comp_interface.contents:
+            types = c.type if isinstance(c.type, list) else [c.type]
+            if any(getattr(t, "name", None) == "PROPERTY" for t in types):
+                self.property_names.append(c.name)
+                if c.writable:
+                    self.writable_property_names.append(c.name)
+            if getattr(c.schema, "enum_values", None):
+                self.enums[c.name] = EnumSchemaIndex(c.schema)
+
+    def get_content(self, name):
+        return self.contents.get(name)
+
+    def get_property_contents(self):
+        return [self.contents[n] for n in self.property_names]
+
+    def get_enum(self, name):
+        return self.enums.get(name)
+
+    def get_enum_value(self, name, index):
+        """
+        Returns:
+            the enum value at index (index itself if name is not an enum property)
+        """
+        enum = self.enums.get(name)
+        return enum.values[index] if enum is not None else index
+
+    def get_enum_display_name(self, name, index):
+        enum = self.enums.get(name)
+        return enum.display_names[index] if enum is not None else index
+
+    def get_enum_number(self, name, index):
+        enum = self.enums.get(name)
+        return enum.numbers[index] if enum is not None else index
+
+    def get_enum_index(self, name, value):
+        """
+        Args:
+            value: enum value or display name
+        Returns:
+            int: index of the enum value (None if not found)
+        """
+        enum = self.enums.get(name)
+        if enum is None:
+            return None
+        index = enum.index_by_value.get(value)
+        return index if index is not None else enum.index_by_display_name.get(value)
+
+class DTDLSchemaIndex(object):
+    """
+    Index of a loaded device template: component -> content -> schema, built once and shared by
+    controllers and widgets (see STDTDL_Controller.get_component_schema).
+    """
+    def __init__(self, components_dtdl):
+        """
+        Args:
+            components_dtdl (dict): {comp_name: component interface} from the DeviceTemplateManager
+        """
+        self.components = {comp_name: ComponentSchemaIndex(comp_interface) for comp_name, comp_interface in components_dtdl.items()}
+
+    def get_component(self, comp_name):
+        return self.components.get(comp_name)
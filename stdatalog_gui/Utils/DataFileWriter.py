@@ -0,0 +1,222 @@
+# ******************************************************************************
+# * @attention
+# *
+# * Copyright (c) 2022 STMicroelectronics.
+# * All rights reserved.
+# *
+# * This software is licensed under terms that can be found in the LICENSE file
+# * in the root directory of this software component.
+# * If no LICENSE file comes with this software, it is provided AS-IS.
+# *
+# *
+# ******************************************************************************
+#
+
+import os
+import time
+import atexit
+from enum import Enum
+from queue import Queue, Empty, Full
+from threading import Thread, Lock
+from weakref import WeakSet
+
+import stdatalog_core.HSD_utils.logger as logger
+log = logger.get_logger(__name__)
+
+# Writers not closed yet: closed at interpreter exit, whatever window or controller created them
+_open_writers = WeakSet()
+_open_writers_lock = Lock()
+
+def close_all_writers():
+    with _open_writers_lock:
+        writers = list(_open_writers)
+    for w in writers:
+        w.close()
+
+atexit.register(close_all_writers)
+
+class FlushPolicy(Enum):
+    ON_CLOSE = 0    # data are flushed only when the file is closed (OS managed)
+    EVERY_WRITE = 1 # each coalesced write is flushed
+    PERIODIC = 2    # data are flushed every flush_interval seconds
+
+class DataFileWriter(Thread):
+    """
+    Write-behind writer for a component .dat file.
+    Acquisition threads only enqueue data chunks (write()), while this thread coalesces them into large
+    writes, so that a slow disk does not stall the USB/serial data draining.
+    It exposes the same write()/close()/closed interface of the wrapped file object.
+    The writers still open at interpreter exit are closed (queued data written) by an atexit hook.
+    """
+    def __init__(self, file, name = None, max_queue_size = 1024, coalesce_size = 4*1024*1024, flush_policy = FlushPolicy.ON_CLOSE, flush_interval = 1.0, fsync = False, error_callback = None, block_when_full = False):
+        """
+        Args:
+            file (file object): binary file opened for writing
+            name (str): writer name (component name)
+            max_queue_size (int): maximum number of queued chunks
+            coalesce_size (int): maximum size in bytes of a single coalesced write
+            flush_policy (FlushPolicy): when the written data are flushed to the OS
+            flush_interval (float): flush period [s] used with FlushPolicy.PERIODIC
+            fsync (bool): if True, each flush is followed by an os.fsync
+            error_callback (function): called as error_callback(writer, exception) at the first write error and at the first dropped chunk
+            block_when_full (bool): if True write() waits for the disk when the queue is full, otherwise the chunk is dropped
+        """
+        Thread.__init__(self)
+        self.name = "{}_writer".format(name if name is not None else os.path.basename(getattr(file, "name", "data")))
+        self.daemon = True
+        self.file = file
+        self.coalesce_size = coalesce_size
+        self.flush_policy = flush_policy
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.error_callback = error_callback
+        self.block_when_full = block_when_full
+        self.__queue = Queue(maxsize=max_queue_size)
+        self.__lock = Lock()
+        self.__closing = False
+        self.__last_flush_time = time.monotonic()
+        # Metrics
+        self.backlog_bytes = 0
+        self.max_backlog_bytes = 0
+        self.written_bytes = 0
+        self.nof_writes = 0
+        self.nof_full_queue_waits = 0
+        self.nof_dropped_chunks = 0
+        self.dropped_bytes = 0
+        self.nof_write_errors = 0
+        self.last_error = None
+        with _open_writers_lock:
+            _open_writers.add(self)
+        self.start()
+
+    @property
+    def closed(self):
+        return self.__closing
+
+    @property
+    def queue_depth(self):
+        return self.__queue.qsize()
+
+    def get_stats(self):
+        return {
+            "queue_depth": self.queue_depth,
+            "backlog_bytes": self.backlog_bytes,
+            "max_backlog_bytes": self.max_backlog_bytes,
+            "written_bytes": self.written_bytes,
+            "nof_writes": self.nof_writes,
+            "nof_full_queue_waits": self.nof_full_queue_waits,
+            "nof_dropped_chunks": self.nof_dropped_chunks,
+            "dropped_bytes": self.dropped_bytes,
+            "nof_write_errors": self.nof_write_errors,
+            "last_error": None if self.last_error is None else str(self.last_error)
+        }
+
+    def write(self, data):
+        if self.__closing:
+            raise ValueError("write to closed file")
+        # The queued chunk must not change after the caller returns: only mutable buffers are copied
+        if not isinstance(data, bytes) and not (isinstance(data, memoryview) and isinstance(data.obj, bytes)):
+            data = bytes(data)
+        data_len = DataFileWriter.__chunk_len(data)
+        with self.__lock:
+            self.backlog_bytes += data_len
+            self.max_backlog_bytes = max(self.max_backlog_bytes, self.backlog_bytes)
+        try:
+            self.__queue.put_nowait(data)
+        except Full:
+            if not self.block_when_full:
+                with self.__lock:
+                    self.backlog_bytes -= data_len
+                self.__report_drop(data_len)
+                return 0
+            self.nof_full_queue_waits += 1
+            if self.nof_full_queue_waits == 1 or self.nof_full_queue_waits % 100 == 0:
+                log.warning("{}: write queue full ({} bytes pending), acquisition is waiting for the disk".format(self.name, self.backlog_bytes))
+            self.__queue.put(data)
+        return data_len
+
+    @staticmethod
+    def __chunk_len(data):
+        return data.nbytes if isinstance(data, memoryview) else len(data)
+
+    def flush(self):
+        # Flush is performed by the writer thread according to the flush policy
+        pass
+
+    def __flush_file(self):
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+        self.__last_flush_time = time.monotonic()
+
+    def __write_chunks(self, chunks, chunks_len):
+        try:
+            self.file.write(chunks[0] if len(chunks) == 1 else b"".join(chunks))
+        finally:
+            # Written or lost, the chunks are no longer pending
+            with self.__lock:
+                self.backlog_bytes -= chunks_len
+        self.written_bytes += chunks_len
+        self.nof_writes += 1
+        if self.flush_policy == FlushPolicy.EVERY_WRITE or \
+            (self.flush_policy == FlushPolicy.PERIODIC and time.monotonic() - self.__last_flush_time >= self.flush_interval):
+            self.__flush_file()
+
+    def run(self):
+        stop = False
+        while not stop:
+            try:
+                data = self.__queue.get(timeout=self.flush_interval)
+            except Empty:
+                if self.flush_policy == FlushPolicy.PERIODIC:
+                    self.__flush_file()
+                continue
+            chunks = []
+            chunks_len = 0
+            # Coalesce all the queued chunks (up to coalesce_size) in a single write
+            while True:
+                if data is None:
+                    stop = True
+                    break
+                chunks.append(data)
+                chunks_len += DataFileWriter.__chunk_len(data)
+                if chunks_len >= self.coalesce_size:
+                    break
+                try:
+                    data = self.__queue.get_nowait()
+                except Empty:
+                    break
+            if len(chunks) > 0:
+                try:
+                    self.__write_chunks(chunks, chunks_len)
+                except Exception as e:
+                    self.__report_error(e)
+        try:
+            self.__flush_file()
+        except Exception as e:
+            self.__report_error(e)
+        self.file.close()
+
+    def __report_error(self, error):
+        self.nof_write_errors += 1
+        self.last_error = error
+        log.error("{}: error writing data file: {}".format(self.name, error))
+        if self.nof_write_errors == 1 and self.error_callback is not None:
+            self.error_callback(self, error)
+
+    def __report_drop(self, data_len):
+        self.nof_dropped_chunks += 1
+        self.dropped_bytes += data_len
+        if self.nof_dropped_chunks == 1 or self.nof_dropped_chunks % 100 == 0:
+            log.warning("{}: write queue full ({} bytes pending), {} chunks ({} bytes) dropped".format(self.name, self.backlog_bytes, self.nof_dropped_chunks, self.dropped_bytes))
+        if self.nof_dropped_chunks == 1 and self.error_callback is not None:
+            self.error_callback(self, BufferError("write queue full, the disk is too slow: data chunks are being dropped"))
+
+    def close(self):
+        if self.__closing:
+            return
+        self.__closing = True
+        self.__queue.put(None)
+        self.join()
+        with _open_writers_lock:
+            _open_writers.discard(self)
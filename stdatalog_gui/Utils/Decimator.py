@@ -0,0 +1,142 @@
+# ******************************************************************************
+# * @attention
+# *
+# * Copyright (c) 2022 STMicroelectronics.
+# * All rights reserved.
+# *
+# * This software is licensed under terms that can be found in the LICENSE file
+# * in the root directory of this software component.
+# * If no LICENSE file comes with this software, it is provided AS-IS.
+# *
+# *
+# ******************************************************************************
+#
+
+from enum import Enum
+
+import numpy as np
+
+class DecimationMode(Enum):
+    LINEAR = "Linear"   # linear interpolation (legacy resample_linear1D behaviour)
+    MINMAX = "Min/Max"  # min/max envelope, peak preserving
+    LTTB = "LTTB"       # Largest Triangle Three Buckets, shape preserving
+    STRIDE = "Stride"   # plain sub-sampling
+
+class Decimator(object):
+    """
+    Reduces a burst of raw samples to a fixed number of points to be plotted.
+    Output and index buffers are preallocated and reused across calls, so the returned array
+    is overwritten by the next decimate() call: copy it (e.g. into a RingBuffer) before that.
+    Bursts shorter than the target length are always linearly interpolated (upsampled).
+    """
+    def __init__(self, mode = DecimationMode.MINMAX):
+        self.mode = mode
+        self.__out = np.zeros(0)
+        self.__tmp = np.zeros(0)
+        self.__indexes_key = None
+        self.__indexes = None
+
+    def __get_buffers(self, target_len):
+        if len(self.__out) != target_len:
+            self.__out = np.zeros(target_len)
+            self.__tmp = np.zeros(target_len)
+        return self.__out, self.__tmp
+
+    def __get_indexes(self, mode, data_len, target_len):
+        # Index tables only depend on the burst length, which is usually the same at each plot update
+        key = (mode, data_len, target_len)
+        if self.__indexes_key != key:
+            if mode == DecimationMode.LINEAR:
+                index_arr = np.linspace(0, data_len - 1, num=target_len)
+                index_floor = index_arr.astype(np.intp)
+                index_ceil = np.minimum(index_floor + 1, data_len - 1)
+                index_rem = index_arr - index_floor
+                self.__indexes = (index_floor, index_ceil, index_rem, 1.0 - index_rem)
+            elif mode == DecimationMode.MINMAX:
+                nof_buckets = target_len // 2
+                self.__indexes = ((np.arange(nof_buckets) * data_len) // nof_buckets,)
+            elif mode == DecimationMode.LTTB:
+                # first and last samples are always kept, the others are split in target_len - 2 buckets
+                edges = np.linspace(1, data_len - 1, num=target_len - 1).astype(np.intp)
+                self.__indexes = (edges, np.diff(edges))
+            else:
+                self.__indexes = (np.linspace(0, data_len - 1, num=target_len).astype(np.intp),)
+            self.__indexes_key = key
+        return self.__indexes
+
+    def decimate(self, data, target_len):
+        """
+        Args:
+            data (array-like): raw samples (not empty)
+            target_len (int): number of output points
+        Returns:
+            numpy.ndarray: target_len points (float64), reused by the next call
+        """
+        data = np.asarray(data)
+        data_len = len(data)
+        mode = self.mode
+        if data_len <= target_len:
+            mode = DecimationMode.LINEAR
+        elif mode == DecimationMode.MINMAX and target_len < 2:
+            mode = DecimationMode.STRIDE
+        elif mode == DecimationMode.LTTB and target_len < 3:
+            mode = DecimationMode.STRIDE
+        out, tmp = self.__get_buffers(target_len)
+        indexes = self.__get_indexes(mode, data_len, target_len)
+        if mode == DecimationMode.LINEAR:
+            self.__linear(data, indexes, out, tmp)
+        elif mode == DecimationMode.MINMAX:
+            self.__minmax(data, indexes, out)
+        elif mode == DecimationMode.LTTB:
+            self.__lttb(data, indexes, out)
+        else:
+            out[:] = data[indexes[0]]
+        return out
+
+    @staticmethod
+    def __linear(data, indexes, out, tmp):
+        index_floor, index_ceil, index_rem, index_rem_c = indexes
+        out[:] = data[index_floor]
+        tmp[:] = data[index_ceil]
+        out *= index_rem_c
+        tmp *= index_rem
+        out += tmp
+
+    @staticmethod
+    def __minmax(data, indexes, out):
+        # Each bucket contributes its min and its max, so spikes are never lost
+        starts = indexes[0]
+        nof_buckets = len(starts)
+        out[0:2 * nof_buckets:2] = np.minimum.reduceat(data, starts)
+        out[1:2 * nof_buckets:2] = np.maximum.reduceat(data, starts)
+        if len(out) > 2 * nof_buckets:
+            out[-1] = data[-1]
+
+    @staticmethod
+    def __lttb(data, indexes, out):
+        edges, counts = indexes
+        data_len = len(data)
+        nof_buckets = len(counts)
+        # bucket averages are the "third point" of the triangles of the previous bucket
+        avg_y = np.add.reduceat(data[:edges[-1]], edges[:-1]) / counts
+        avg_x = edges[:-1] + (counts - 1) / 2.0
+        out[0] = data[0]
+        a_x = 0
+        a_y = float(data[0])
+        for b in range(nof_buckets):
+            start = edges[b]
+            end = edges[b + 1]
+            if b + 1 < nof_buckets:
+                c_x = avg_x[b + 1]
+                c_y = avg_y[b + 1]
+            else:
+                c_x = data_len - 1
+                c_y = float(data[-1])
+            seg = data[start:end]
+            # doubled area of the triangles (a, candidate point, c)
+            area = np.abs((a_x - c_x) * (seg - a_y) - (a_x - np.arange(start, end)) * (c_y - a_y))
+            k = int(np.argmax(area))
+            a_x = start + k
+            a_y = float(seg[k])
+            out[b + 1] = a_y
+        out[-1] = data[-1]
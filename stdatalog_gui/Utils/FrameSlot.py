@@ -0,0 +1,102 @@
+# ******************************************************************************
+# * @attention
+# *
+# * Copyright (c) 2022 STMicroelectronics.
+# * All rights reserved.
+# *
+# * This software is licensed under terms that can be found in the LICENSE file
+# * in the root directory of this software component.
+# * If no LICENSE file comes with this software, it is provided AS-IS.
+# *
+# *
+# ******************************************************************************
+#
+
+
+from enum import Enum
+from threading import Lock
+
+import numpy as np
+
+class FrameSlotMode(Enum):
+    LATEST = "Latest"   # only the most recent frame is kept
+    MEAN = "Mean"       # frames received in a plot tick are averaged
+
+class FrameSlot(object):
+    """
+    Single-slot frame buffer between a data producer and a plot widget, replacing unbounded frame queues.
+    In LATEST mode each new frame replaces the previous one (single reference swap); in MEAN mode frames are
+    accumulated as they arrive (running sum) and take() returns their mean.
+    Frames that are never displayed on their own (overwritten or averaged) are counted in skipped_cnt.
+    """
+    def __init__(self, mode = FrameSlotMode.LATEST):
+        self.mode = mode
+        self.skipped_cnt = 0
+        self.received_cnt = 0
+        self.__lock = Lock()
+        self.__frame = None
+        self.__sum = None
+        self.__nof_summed = 0
+
+    def has_data(self):
+        return self.__frame is not None or self.__nof_summed > 0
+
+    def put(self, frame):
+        """
+        Producer side.
+        Args:
+            frame (array-like): new frame
+        """
+        self.received_cnt += 1
+        if self.mode == FrameSlotMode.LATEST:
+            with self.__lock:
+                if self.__frame is not None:
+                    self.skipped_cnt += 1
+                self.__frame = frame
+        else:
+            frame = np.asarray(frame, dtype=np.float64)
+            with self.__lock:
+                if self.__sum is None or self.__sum.shape != frame.shape:
+                    # First frame of the tick (or new frame shape): restart the accumulation
+                    self.skipped_cnt += self.__nof_summed
+                    self.__sum = frame.copy()
+                    self.__nof_summed = 1
+                else:
+                    self.__sum += frame
+                    self.__nof_summed += 1
+                    self.skipped_cnt += 1
+
+    def take(self):
+        """
+        Consumer side. Return the latest frame (or the mean of the frames received since the last call) and empty the slot.
+        Returns:
+            the frame, or None if no frame was received since the last call
+        """
+        with self.__lock:
+            if self.mode == FrameSlotMode.LATEST:
+                frame = self.__frame
+                self.__frame = None
+                return frame
+            if self.__nof_summed == 0:
+                return None
+            frame = self.__sum / self.__nof_summed
+            self.__sum = None
+            self.__nof_summed = 0
+            return frame
+
+    def set_mode(self, mode):
+        with self.__lock:
+            self.mode = mode
+            self.__frame = None
+            self.__sum = None
+            self.__nof_summed = 0
+
+    def clear(self):
+        with self.__lock:
+            self.__frame = None
+            self.__sum = None
+            self.__nof_summed = 0
+
+    def reset_counters(self):
+        self.skipped_cnt = 0
+        self.received_cnt = 0
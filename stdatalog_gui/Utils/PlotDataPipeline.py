@@ -0,0 +1,54 @@
+# ******************************************************************************
+# * @attention
+# *
+# * Copyright (c) 2022 STMicroelectronics.
+# * All rights reserved.
+# *
+# * This software is licensed under terms that can be found in the LICENSE file
+# * in the root directory of this software component.
+# * If no LICENSE file comes with this software, it is provided AS-IS.
+# *
+# *
+# ******************************************************************************
+#
+
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+class PlotDataPipeline(object):
+    """
+    Worker thread pool preparing the plot data (decimation, FFT, ...) of the plot widgets off the GUI thread.
+    Each widget has at most one preparation job in flight and publishes its results through a double buffered
+    hand-off: the GUI thread only sets the prepared arrays into the plot items.
+    When disabled, widgets prepare their data inline (on the GUI thread).
+    """
+    def __init__(self, max_workers = None):
+        """
+        Args:
+            max_workers (int): number of worker threads (default: number of CPUs, up to 4)
+        """
+        if max_workers is None:
+            max_workers = min(4, os.cpu_count() or 1)
+        self.enabled = True
+        self.submitted_cnt = 0
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="plot_data")
+
+    def submit(self, fn, *args):
+        self.submitted_cnt += 1
+        return self.__executor.submit(fn, *args)
+
+    def shutdown(self):
+        self.__executor.shutdown(wait=False)
+
+    @staticmethod
+    def copy_into(dst, src):
+        """
+        Copy src into the preallocated dst array (reallocated only if its shape changes).
+        Returns:
+            numpy.ndarray: the destination array
+        """
+        if dst is None or dst.shape != src.shape:
+            return src.copy()
+        dst[:] = src
+        return dst
@@ -0,0 +1,114 @@
+# ******************************************************************************
+# * @attention
+# *
+# * Copyright (c) 2022 STMicroelectronics.
+# * All rights reserved.
+# *
+# * This software is licensed under terms that can be found in the LICENSE file
+# * in the root directory of this software component.
+# * If no LICENSE file comes with this software, it is provided AS-IS.
+# *
+# *
+# ******************************************************************************
+#
+
+import time
+from functools import partial
+
+from stdatalog_pnpl.PnPLCmd import PnPLCMDManager
+
+import stdatalog_core.HSD_utils.logger as logger
+log = logger.get_logger(__name__)
+
+class PnPLCommandBatch(object):
+    """
+    Collects PnPL property writes and sends them, in the order they were set, with the same set property
+    messages used for single writes. When the batch is flushed (e.g. at the end of a with block) the messages
+    are sent back to back by the controller PnPL worker, without blocking the GUI, then the status of all
+    the written components is refreshed at once (instead of once per write).
+    """
+    def __init__(self, controller, done_callback = None):
+        """
+        Args:
+            controller (STDTDL_Controller): controller used to send the messages and refresh the status
+            done_callback (function): called on the GUI thread as done_callback(failed_commands) after the status
+                refresh; failed_commands is the list of the messages without a response (empty if all have been sent)
+        """
+        self.controller = controller
+        self.done_callback = done_callback
+        self.latencies = [] # (json_command, latency [ms]) of each sent message
+        self.refresh_time_ms = 0.0
+        self.__writes = [] # (json_command, comp_name) in write order
+        self.__comp_types = dict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def __len__(self):
+        return len(self.__writes)
+
+    def set_property(self, comp_name, prop_name, value, comp_type = None):
+        """
+        Args:
+            comp_name (str): component name
+            prop_name (str): property name
+            value: new property value
+            comp_type (ComponentType): component type, used by the final status refresh
+        """
+        self.__writes.append((PnPLCMDManager.create_set_property_cmd(comp_name, prop_name, value), comp_name))
+        if comp_type is not None or comp_name not in self.__comp_types:
+            self.__comp_types[comp_name] = comp_type
+
+    def flush(self):
+        """
+        Send the collected writes without blocking the GUI; the status of the written components is refreshed
+        (on the GUI thread) when all the messages have been sent.
+        Returns:
+            concurrent.futures.Future: list of (PnPL response, latency [ms]) of the sent messages (None if there are no writes)
+        """
+        json_commands = [json_command for json_command, _ in self.__writes]
+        comp_types = self.__comp_types
+        self.__writes = []
+        self.__comp_types = dict()
+        if len(json_commands) == 0:
+            if self.done_callback is not None:
+                self.done_callback([])
+            return None
+        return self.controller.send_commands_async(json_commands,
+                                                   partial(self.__sent, json_commands, comp_types, time.perf_counter()),
+                                                   partial(self.__failed, json_commands, comp_types))
+
+    def __sent(self, json_commands, comp_types, start, results):
+        send_time_ms = (time.perf_counter() - start) * 1000
+        failed_commands = []
+        for json_command, (response, latency_ms) in zip(json_commands, results):
+            self.latencies.append((json_command, latency_ms))
+            log.debug("PnPL batch: {} sent in {:.1f} ms".format(json_command, latency_ms))
+            if response is None:
+                failed_commands.append(json_command)
+        self.__refresh(comp_types)
+        log.info("PnPL batch: {} messages in {:.1f} ms (max {:.1f} ms, {:.1f} ms including the queue wait), status refresh in {:.1f} ms".format(
+            len(results), sum(l for _, l in results), max(l for _, l in results), send_time_ms, self.refresh_time_ms))
+        self.__done(failed_commands)
+
+    def __failed(self, json_commands, comp_types, error):
+        # Some of the writes may have been applied anyway: the device is read back
+        log.warning("PnPL batch not completely sent ({}): reading back the component status".format(error))
+        self.__refresh(comp_types)
+        self.__done(json_commands)
+
+    def __done(self, failed_commands):
+        if len(failed_commands) > 0:
+            log.error("PnPL batch: {} messages failed: {}".format(len(failed_commands), failed_commands))
+        if self.done_callback is not None:
+            self.done_callback(failed_commands)
+
+    def __refresh(self, comp_types):
+        start = time.perf_counter()
+        self.controller.refresh_components_status(comp_types)
+        self.refresh_time_ms = (time.perf_counter() - start) * 1000
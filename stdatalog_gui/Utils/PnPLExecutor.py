@@ -0,0 +1,121 @@
+# ******************************************************************************
+# * @attention
+# *
+# * Copyright (c) 2022 STMicroelectronics.
+# * All rights reserved.
+# *
+# * This software is licensed under terms that can be found in the LICENSE file
+# * in the root directory of this software component.
+# * If no LICENSE file comes with this software, it is provided AS-IS.
+# *
+# *
+# ******************************************************************************
+#
+
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Signal
+
+import stdatalog_core.HSD_utils.logger as logger
+log = logger.get_logger(__name__)
+
+class PnPLCommandExecutor(QObject):
+    """
+    Single worker thread serializing the PnPL commands sent to the device (hsd_link is not thread safe).
+    submit() returns a concurrent.futures.Future; its optional callback is called on the GUI thread
+    (through a queued Qt signal) once the command completes, so the GUI is never blocked waiting for the board.
+    call() is the blocking variant, for code that needs the result immediately.
+    """
+    sig_command_done = Signal(object)
+
+    def __init__(self, parent = None):
+        super().__init__(parent)
+        self.queue_depth = 0
+        self.completed_cnt = 0
+        self.failed_cnt = 0
+        self.last_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.__latencies = dict() # command name -> [count, total latency [ms], max latency [ms]]
+        self.__lock = threading.Lock()
+        self.__worker_ident = None
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pnpl", initializer=self.__init_worker)
+        self.sig_command_done.connect(self.__run_callback)
+
+    def __init_worker(self):
+        self.__worker_ident = threading.get_ident()
+
+    def submit(self, fn, *args, name = None, callback = None, error_callback = None):
+        """
+        Args:
+            fn (callable): function sending the command(s), run by the worker thread
+            name (str): command name, for the latency statistics (default: fn name)
+            callback (callable): called on the GUI thread with the fn result
+            error_callback (callable): called on the GUI thread with the exception raised by fn
+        Returns:
+            concurrent.futures.Future: fn result
+        """
+        with self.__lock:
+            self.queue_depth += 1
+        future = self.__executor.submit(self.__run, name or getattr(fn, "__name__", "command"), fn, args)
+        if callback is not None or error_callback is not None:
+            future.add_done_callback(lambda f: self.sig_command_done.emit((f, callback, error_callback)))
+        return future
+
+    def call(self, fn, *args, name = None):
+        """
+        Blocking variant of submit (fn is run directly if called by the worker thread itself).
+        Returns:
+            the fn result
+        """
+        if threading.get_ident() == self.__worker_ident:
+            return fn(*args)
+        return self.submit(fn, *args, name=name).result()
+
+    def get_stats(self):
+        with self.__lock:
+            return {
+                "queue_depth": self.queue_depth,
+                "completed_cnt": self.completed_cnt,
+                "failed_cnt": self.failed_cnt,
+                "last_latency_ms": self.last_latency_ms,
+                "max_latency_ms": self.max_latency_ms,
+                "commands": {n: {"count": l[0], "mean_latency_ms": l[1] / l[0], "max_latency_ms": l[2]} for n, l in self.__latencies.items()}
+            }
+
+    def shutdown(self):
+        self.__executor.shutdown(wait=False)
+
+    def __run(self, name, fn, args):
+        with self.__lock:
+            self.queue_depth -= 1
+        start = time.perf_counter()
+        failed = False
+        try:
+            return fn(*args)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            with self.__lock:
+                self.completed_cnt += 1
+                self.failed_cnt += 1 if failed else 0
+                self.last_latency_ms = latency_ms
+                self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+                lat = self.__latencies.setdefault(name, [0, 0.0, 0.0])
+                lat[0] += 1
+                lat[1] += latency_ms
+                lat[2] = max(lat[2], latency_ms)
+
+    def __run_callback(self, item):
+        future, callback, error_callback = item
+        exc = future.exception()
+        if exc is not None:
+            log.error("PnPL command failed: {}".format(exc))
+            if error_callback is not None:
+                error_callback(exc)
+        elif callback is not None:
+            callback(future.result())
@@ -0,0 +1,199 @@
+# ******************************************************************************
+# * @attention
+# *
+# * Copyright (c) 2022 STMicroelectronics.
+# * All rights reserved.
+# *
+# * This software is licensed under terms that can be found in the LICENSE file
+# * in the root directory of this software component.
+# * If no LICENSE file comes with this software, it is provided AS-IS.
+# *
+# *
+# ******************************************************************************
+#
+
+import time
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+
+import stdatalog_core.HSD_utils.logger as logger
+log = logger.get_logger(__name__)
+
+class RenderScheduler(QObject):
+    """
+    Single GUI frame clock shared by all the plot widgets (replaces one QTimer per widget).
+    At each frame the due widgets are updated in registration order, until the frame time budget is spent:
+    the widgets left out are served first at the next frame. Widgets whose has_new_data() returns False are skipped
+    (that tick is not replayed: widgets whose display advances at every tick, e.g. scrolling plots, must return True).
+    In visibility aware mode, widgets that are not visible on screen (is_render_visible()) only ingest their data
+    (update_hidden()) and are rendered once as soon as they become visible again.
+    The frames received but never displayed by each widget (get_skipped_frames_count()) are reported with the
+    FPS statistics, as a measure of how far the display lags the sensors.
+    """
+    sig_fps_updated = Signal(float)
+
+    class WidgetTimer(object):
+        """
+        Per-widget handle, exposing the subset of the QTimer interface used by the plot widgets (start/stop/isActive).
+        """
+        def __init__(self, scheduler, widget):
+            self.scheduler = scheduler
+            self.widget = widget
+            self.interval_s = 0.0
+            self.next_due_time = 0.0
+            self.active = False
+            self.hidden = False
+            self.update_cnt = 0
+
+        def start(self, interval_ms = None):
+            if interval_ms is not None:
+                self.interval_s = interval_ms / 1000.0
+            self.next_due_time = time.monotonic() + self.interval_s
+            self.active = True
+            self.scheduler.wake_up()
+
+        def stop(self):
+            self.active = False
+
+        def isActive(self):
+            return self.active
+
+        def interval(self):
+            return int(self.interval_s * 1000)
+
+    def __init__(self, frame_interval_ms = 16, frame_budget_ms = 12, parent = None):
+        """
+        Args:
+            frame_interval_ms (int): frame clock period [ms]
+            frame_budget_ms (float): maximum time [ms] spent updating widgets in a single frame
+        """
+        super().__init__(parent)
+        self.frame_budget_s = frame_budget_ms / 1000.0
+        self.visibility_aware = True
+        self.__timers = []
+        self.__first_timer_idx = 0
+        self.__frame_timer = QTimer(self)
+        self.__frame_timer.setTimerType(Qt.PreciseTimer)
+        self.__frame_timer.setInterval(frame_interval_ms)
+        self.__frame_timer.timeout.connect(self.__render_frame)
+        # Statistics
+        self.fps = 0.0
+        self.last_frame_time_ms = 0.0
+        self.max_frame_time_ms = 0.0
+        self.over_budget_cnt = 0
+        self.no_new_data_cnt = 0
+        self.hidden_cnt = 0
+        self.__frames_cnt = 0
+        self.__fps_time = time.monotonic()
+        self.__prev_skipped_frames = dict()
+
+    def create_timer(self, widget):
+        w_timer = RenderScheduler.WidgetTimer(self, widget)
+        self.__timers.append(w_timer)
+        widget.destroyed.connect(lambda *args: self.remove_timer(w_timer))
+        return w_timer
+
+    def remove_timer(self, w_timer):
+        w_timer.active = False
+        if w_timer in self.__timers:
+            self.__timers.remove(w_timer)
+            self.__first_timer_idx = 0
+
+    def wake_up(self):
+        if not self.__frame_timer.isActive():
+            self.__fps_time = time.monotonic()
+            self.__frames_cnt = 0
+            self.__frame_timer.start()
+
+    def get_stats(self):
+        return {
+            "fps": self.fps,
+            "last_frame_time_ms": self.last_frame_time_ms,
+            "max_frame_time_ms": self.max_frame_time_ms,
+            "over_budget_cnt": self.over_budget_cnt,
+            "no_new_data_cnt": self.no_new_data_cnt,
+            "hidden_cnt": self.hidden_cnt,
+            "active_widgets": sum(1 for t in self.__timers if t.active),
+            "skipped_frames": self.get_skipped_frames()
+        }
+
+    def get_skipped_frames(self):
+        """
+        Returns:
+            dict: {comp_name: frames received but not displayed} of the widgets that skipped at least one frame
+        """
+        skipped_frames = dict()
+        for w_timer in list(self.__timers):
+            try:
+                skipped_cnt = w_timer.widget.get_skipped_frames_count()
+            except Exception:
+                continue
+            if skipped_cnt > 0:
+                skipped_frames[getattr(w_timer.widget, "comp_name", "")] = skipped_cnt
+        return skipped_frames
+
+    def __log_skipped_frames(self, elapsed_s):
+        skipped_frames = self.get_skipped_frames()
+        for comp_name, skipped_cnt in skipped_frames.items():
+            new_skipped = skipped_cnt - self.__prev_skipped_frames.get(comp_name, 0)
+            if new_skipped > 0:
+                log.debug("{} display lag: {} frames skipped in the last {:.1f} s ({} total)".format(comp_name, new_skipped, elapsed_s, skipped_cnt))
+        self.__prev_skipped_frames = skipped_frames
+
+    def __render_frame(self):
+        frame_start = time.monotonic()
+        deadline = frame_start + self.frame_budget_s
+        timers = list(self.__timers)
+        nof_timers = len(timers)
+        nof_updates = 0
+        any_active = False
+        first_idx = self.__first_timer_idx if self.__first_timer_idx < nof_timers else 0
+        self.__first_timer_idx = 0
+        for k in range(nof_timers):
+            idx = (first_idx + k) % nof_timers
+            w_timer = timers[idx]
+            if not w_timer.active:
+                continue
+            any_active = True
+            if frame_start < w_timer.next_due_time:
+                continue
+            if nof_updates > 0 and time.monotonic() > deadline:
+                # Frame budget exhausted: the remaining due widgets go first at the next frame
+                self.over_budget_cnt += 1
+                self.__first_timer_idx = idx
+                break
+            w_timer.next_due_time += w_timer.interval_s
+            if w_timer.next_due_time < frame_start:
+                w_timer.next_due_time = frame_start + w_timer.interval_s
+            try:
+                if self.visibility_aware and not w_timer.widget.is_render_visible():
+                    # Not on screen: keep the data flowing into the widget buffers, without rendering
+                    w_timer.hidden = True
+                    self.hidden_cnt += 1
+                    w_timer.widget.update_hidden()
+                    continue
+                if w_timer.hidden:
+                    # Visible again: render the current buffers once, even if no new data arrived
+                    w_timer.hidden = False
+                elif not w_timer.widget.has_new_data():
+                    self.no_new_data_cnt += 1
+                    continue
+                w_timer.widget.update_plot()
+            except Exception as e:
+                log.error("Error updating {} plot: {}".format(getattr(w_timer.widget, "comp_name", ""), e))
+            w_timer.update_cnt += 1
+            nof_updates += 1
+
+        now = time.monotonic()
+        if nof_updates > 0:
+            self.__frames_cnt += 1
+            self.last_frame_time_ms = (now - frame_start) * 1000
+            self.max_frame_time_ms = max(self.max_frame_time_ms, self.last_frame_time_ms)
+        if now - self.__fps_time >= 1.0:
+            self.fps = self.__frames_cnt / (now - self.__fps_time)
+            self.__log_skipped_frames(now - self.__fps_time)
+            self.__frames_cnt = 0
+            self.__fps_time = now
+            self.sig_fps_updated.emit(self.fps)
+        if not any_active:
+            self.__frame_timer.stop()
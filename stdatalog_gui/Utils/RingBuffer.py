@@ -0,0 +1,118 @@
+# ******************************************************************************
+# * @attention
+# *
+# * Copyright (c) 2022 STMicroelectronics.
+# * All rights reserved.
+# *
+# * This software is licensed under terms that can be found in the LICENSE file
+# * in the root directory of this software component.
+# * If no LICENSE file comes with this software, it is provided AS-IS.
+# *
+# *
+# ******************************************************************************
+#
+
+import numpy as np
+
+class RingBuffer(object):
+    """
+    Single-producer/single-consumer ring buffer backed by a preallocated NumPy array.
+    Samples are stored twice (mirrored storage of 2*capacity elements), so that any window of up to
+    capacity samples is always available as a contiguous view, without copies.
+    The producer only updates the write index and the consumer only updates the read index, so no lock is needed.
+    When overwrite is False, samples that do not fit in the free space are dropped and counted in overflow_cnt;
+    when overwrite is True, the oldest samples are discarded (sliding window).
+    """
+    def __init__(self, capacity, dtype = np.float32, overwrite = False):
+        self.capacity = int(capacity)
+        self.overwrite = overwrite
+        self.overflow_cnt = 0
+        self.__buffer = np.zeros(2 * self.capacity, dtype=dtype)
+        self.__write_idx = 0 # total written samples (owned by the producer)
+        self.__read_idx = 0 # start of the samples still owned by the consumer (last returned view)
+        self.__consumed_idx = 0 # end of the last returned view
+
+    def __len__(self):
+        return min(self.__write_idx - self.__consumed_idx, self.capacity)
+
+    @property
+    def dtype(self):
+        return self.__buffer.dtype
+
+    def write(self, values):
+        """
+        Producer side. Append values to the buffer with vectorized slice assignments.
+        Returns:
+            int: number of written samples
+        """
+        values = np.asarray(values, dtype=self.__buffer.dtype).reshape(-1)
+        n = len(values)
+        if n == 0:
+            return 0
+        cap = self.capacity
+        w = self.__write_idx
+        if self.overwrite:
+            if n > cap:
+                w += n - cap
+                values = values[-cap:]
+                n = cap
+        else:
+            free = cap - (w - self.__read_idx)
+            if n > free:
+                self.overflow_cnt += n - free
+                values = values[:free]
+                n = free
+                if n == 0:
+                    return 0
+        pos = w % cap
+        self.__buffer[pos:pos + n] = values
+        if pos + n <= cap:
+            self.__buffer[pos + cap:pos + cap + n] = values
+        else:
+            k = cap - pos
+            self.__buffer[pos + cap:] = values[:k]
+            self.__buffer[:n - k] = values[k:]
+        self.__write_idx = w + n # publish the new samples
+        return n
+
+    def read(self):
+        """
+        Consumer side. Return all the unread samples as a contiguous (read-only) view and mark them as consumed.
+        The view stays valid until the next read() or clear() call (its space is released only then).
+        """
+        w = self.__write_idx
+        r = max(self.__consumed_idx, w - self.capacity)
+        pos = r % self.capacity
+        self.__read_idx = r
+        self.__consumed_idx = w
+        view = self.__buffer[pos:pos + (w - r)]
+        view.flags.writeable = False
+        return view
+
+    def latest(self, n):
+        """
+        Return a contiguous (read-only) view of the last n samples written (n <= capacity), regardless of the read index.
+        Never written positions are zeros.
+        """
+        n = min(int(n), self.capacity)
+        start = (self.__write_idx - n) % self.capacity
+        view = self.__buffer[start:start + n]
+        view.flags.writeable = False
+        return view
+
+    def clear(self):
+        """
+        Consumer side. Discard all the unread samples.
+        """
+        self.__consumed_idx = self.__write_idx
+        self.__read_idx = self.__consumed_idx
+
+    def reset(self, fill_value = 0):
+        """
+        Reset indexes, counters and contents. To be used only while the producer is not writing.
+        """
+        self.__buffer.fill(fill_value)
+        self.__write_idx = 0
+        self.__read_idx = 0
+        self.__consumed_idx = 0
+        self.overflow_cnt = 0
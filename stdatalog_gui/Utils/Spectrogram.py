@@ -0,0 +1,137 @@
+# ******************************************************************************
+# * @attention
+# *
+# * Copyright (c) 2022 STMicroelectronics.
+# * All rights reserved.
+# *
+# * This software is licensed under terms that can be found in the LICENSE file
+# * in the root directory of this software component.
+# * If no LICENSE file comes with this software, it is provided AS-IS.
+# *
+# *
+# ******************************************************************************
+#
+
+from threading import Thread, Event, Lock
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from stdatalog_gui.Utils.RingBuffer import RingBuffer
+
+class Spectrogram(Thread):
+    """
+    Live STFT (waterfall) of a multi-axis signal, computed off the GUI thread.
+    The data producer pushes raw samples with add_samples(); this thread splits them into overlapping frames,
+    transforms all the new frames of all the axes with a single batched rfft and stores the power (summed on
+    the axes, in dB) in a preallocated 2D ring of time_window seconds. The GUI gets the current image with get_image().
+    The ring is written and read under a lock, so that an image never mixes old and new frames.
+    """
+    def __init__(self, nof_axes, odr, fft_n = 1024, overlap = 0.5, time_window = 10, min_db = -120.0, name = None):
+        """
+        Args:
+            nof_axes (int): number of signal axes
+            odr (float): signal sampling frequency [Hz]
+            fft_n (int): STFT frame length
+            overlap (float): frames overlap ratio [0, 1)
+            time_window (float): displayed time span [s]
+            min_db (float): floor of the displayed power [dB]
+        """
+        Thread.__init__(self)
+        self.name = "{}_spectrogram".format(name) if name is not None else "spectrogram"
+        self.daemon = True
+        self.nof_axes = nof_axes
+        self.odr = odr
+        self.fft_n = int(fft_n)
+        self.hop = max(1, int(round(self.fft_n * (1.0 - min(max(overlap, 0.0), 0.95)))))
+        self.nof_frames = max(1, int(round(time_window * odr / self.hop)))
+        self.nof_bins = self.fft_n // 2 + 1
+        self.min_db = min_db
+        self.freqs = np.fft.rfftfreq(self.fft_n, 1/odr)
+        self.time_window = self.nof_frames * self.hop / odr
+        self.computed_frames = 0
+        self.__window = np.hanning(self.fft_n).astype(np.float32)
+        self.__power_scale = (2.0 / np.sum(self.__window))**2
+        # 2 seconds of input data: the producer never waits for this thread (overflows are counted)
+        self.__inputs = [RingBuffer(int(2 * odr) + self.fft_n) for _ in range(nof_axes)]
+        self.__carry = [np.zeros(0, dtype=np.float32) for _ in range(nof_axes)]
+        # Mirrored storage (see RingBuffer): the last nof_frames frames are always a contiguous block
+        self.__frames = np.full((2 * self.nof_frames, self.nof_bins), min_db, dtype=np.float32)
+        self.__frame_idx = 0
+        self.__frames_lock = Lock()
+        self.__data_ready = Event()
+        self.__stopped = Event()
+
+    @property
+    def overflow_cnt(self):
+        return sum(i.overflow_cnt for i in self.__inputs)
+
+    def add_samples(self, data):
+        """
+        Producer side.
+        Args:
+            data (list): one array of new samples for each axis
+        """
+        for i in range(self.nof_axes):
+            self.__inputs[i].write(data[i])
+        self.__data_ready.set()
+
+    def get_image(self):
+        """
+        Returns:
+            (numpy.ndarray, float): (nof_frames, nof_bins) power [dB] oldest frame first, and its maximum [dB]
+            (the color scale follows the displayed frames, a transient peak leaves it when it scrolls out)
+        """
+        with self.__frames_lock:
+            start = self.__frame_idx % self.nof_frames
+            image = self.__frames[start:start + self.nof_frames].copy()
+        return image, float(np.max(image))
+
+    def run(self):
+        while not self.__stopped.is_set():
+            self.__data_ready.wait(0.1)
+            self.__data_ready.clear()
+            if self.__stopped.is_set():
+                break
+            self.__process_new_samples()
+
+    def stop(self):
+        self.__stopped.set()
+        self.__data_ready.set()
+        if self.is_alive():
+            self.join()
+
+    def __process_new_samples(self):
+        chunks = [np.concatenate((self.__carry[i], self.__inputs[i].read())) for i in range(self.nof_axes)]
+        # The axes are written one after the other by the producer: use the samples available on all of them
+        available = min(len(c) for c in chunks)
+        if available < self.fft_n:
+            self.__carry = chunks
+            return
+        nof_new_frames = (available - self.fft_n) // self.hop + 1
+        used = (nof_new_frames - 1) * self.hop + self.fft_n
+        data = np.stack([c[:used] for c in chunks])
+        segments = sliding_window_view(data, self.fft_n, axis=-1)[:, ::self.hop] # (nof_axes, nof_new_frames, fft_n)
+        spectra = np.fft.rfft(segments * self.__window, axis=-1)
+        power = np.sum(spectra.real**2 + spectra.imag**2, axis=0) * self.__power_scale
+        frames_db = 10 * np.log10(np.maximum(power, 10**(self.min_db / 10)))
+        self.__write_frames(frames_db)
+        next_start = nof_new_frames * self.hop
+        self.__carry = [c[next_start:] for c in chunks]
+
+    def __write_frames(self, frames):
+        if len(frames) > self.nof_frames:
+            frames = frames[-self.nof_frames:]
+        n = len(frames)
+        cap = self.nof_frames
+        with self.__frames_lock:
+            pos = self.__frame_idx % cap
+            self.__frames[pos:pos + n] = frames
+            if pos + n <= cap:
+                self.__frames[pos + cap:pos + cap + n] = frames
+            else:
+                k = cap - pos
+                self.__frames[pos + cap:] = frames[:k]
+                self.__frames[:n - k] = frames[k:]
+            self.__frame_idx += n
+        self.computed_frames += n
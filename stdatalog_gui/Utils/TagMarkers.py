@@ -0,0 +1,132 @@
+# ******************************************************************************
+# * @attention
+# *
+# * Copyright (c) 2022 STMicroelectronics.
+# * All rights reserved.
+# *
+# * This software is licensed under terms that can be found in the LICENSE file
+# * in the root directory of this software component.
+# * If no LICENSE file comes with this software, it is provided AS-IS.
+# *
+# *
+# ******************************************************************************
+#
+
+
+import numpy as np
+
+from PySide6.QtCore import Qt
+
+import pyqtgraph as pg
+
+class TagMarkersManager(object):
+    """
+    Tag markers (labelled vertical lines) of a scrolling line plot.
+    The tag edges of the whole session are stored in NumPy arrays (x position and style id). Graphic items only exist
+    for the tags inside the current x view range: they are taken from a fixed size pool of InfiniteLines, added to the
+    plot once and then reused (moved/restyled) as the view scrolls.
+    """
+    def __init__(self, graph_widget, max_visible_tags = 64, initial_capacity = 1024):
+        """
+        Args:
+            graph_widget (pg.PlotWidget): plot hosting the markers
+            max_visible_tags (int): pool size, if more tags are in the view range only the most recent ones are shown
+            initial_capacity (int): initial size of the tag arrays (doubled when full)
+        """
+        self.graph_widget = graph_widget
+        self.max_visible_tags = max_visible_tags
+        self.visible = True
+        self.__pos = np.zeros(initial_capacity)
+        self.__tag_styles = np.zeros(initial_capacity, dtype=np.int32)
+        self.__count = 0
+        self.__styles = [] # (label, pen, vertical_label)
+        self.__style_keys = dict() # (label, color, width, pen_style, vertical_label) -> style id
+        self.__pool = [None] * max_visible_tags
+        self.__pool_tag_idx = [-1] * max_visible_tags # tag displayed by each pool item (-1: none)
+        self.__view = None
+
+    def __len__(self):
+        return self.__count
+
+    def add(self, x, label, color, width = 1, pen_style = Qt.PenStyle.SolidLine, vertical_label = False):
+        """
+        Args:
+            x (float): tag position (plot x coordinates)
+            label (str): tag label
+            color (str): line color
+            width (int): line width
+            pen_style (Qt.PenStyle): line style
+            vertical_label (bool): if True, the label is drawn rotated along the line (instead of an InfLineLabel)
+        """
+        key = (label, color, width, pen_style, vertical_label)
+        style_id = self.__style_keys.get(key)
+        if style_id is None:
+            style_id = len(self.__styles)
+            self.__styles.append((label, pg.mkPen(color=color, width=width, style=pen_style), vertical_label))
+            self.__style_keys[key] = style_id
+        if self.__count == len(self.__pos):
+            self.__pos = np.concatenate((self.__pos, np.zeros(len(self.__pos))))
+            self.__tag_styles = np.concatenate((self.__tag_styles, np.zeros(len(self.__tag_styles), dtype=np.int32)))
+        n = self.__count
+        idx = n if n == 0 or x >= self.__pos[n - 1] else int(np.searchsorted(self.__pos[:n], x, side='right'))
+        if idx < n:
+            # Out of order tag (not expected while scrolling): keep the arrays sorted, pool assignments are rebuilt
+            self.__pos[idx + 1:n + 1] = self.__pos[idx:n].copy()
+            self.__tag_styles[idx + 1:n + 1] = self.__tag_styles[idx:n].copy()
+            self.__pool_tag_idx = [-1] * self.max_visible_tags
+        self.__pos[idx] = x
+        self.__tag_styles[idx] = style_id
+        self.__count += 1
+        if self.__view is not None:
+            self.update_view(*self.__view)
+
+    def clear(self):
+        self.__count = 0
+        self.__pool_tag_idx = [-1] * self.max_visible_tags
+        for item in self.__pool:
+            if item is not None:
+                item.setVisible(False)
+
+    def set_visible(self, visible):
+        self.visible = visible
+        if self.__view is not None:
+            self.update_view(*self.__view)
+
+    def __get_pool_item(self, slot):
+        item = self.__pool[slot]
+        if item is None:
+            item = pg.InfiniteLine(angle=90, movable=False, label="")
+            item.tag_text = pg.TextItem(text="", angle=-90)
+            item.tag_text.setAnchor((1, 0)) # Position label above the line
+            item.tag_text.setParentItem(item)
+            self.graph_widget.addItem(item, ignoreBounds=True)
+            self.__pool[slot] = item
+        return item
+
+    def update_view(self, x_min, x_max):
+        """
+        Show the tags with x_min <= x <= x_max (to be called when the plot x range changes)
+        """
+        self.__view = (x_min, x_max)
+        pos = self.__pos[:self.__count]
+        first = int(np.searchsorted(pos, x_min, side='left'))
+        last = int(np.searchsorted(pos, x_max, side='right')) if self.visible else first
+        first = max(first, last - self.max_visible_tags)
+        shown_slots = set()
+        for tag_idx in range(first, last):
+            # A tag keeps the same pool item while it stays in the view range: only new tags are restyled
+            slot = tag_idx % self.max_visible_tags
+            item = self.__get_pool_item(slot)
+            if self.__pool_tag_idx[slot] != tag_idx:
+                label, pen, vertical_label = self.__styles[self.__tag_styles[tag_idx]]
+                item.setPen(pen)
+                item.label.setFormat("" if vertical_label else label)
+                item.tag_text.setText(label if vertical_label else "")
+                item.setPos(pos[tag_idx])
+                self.__pool_tag_idx[slot] = tag_idx
+            if not item.isVisible():
+                item.setVisible(True)
+            shown_slots.add(slot)
+        for slot, item in enumerate(self.__pool):
+            if item is not None and slot not in shown_slots and item.isVisible():
+                item.setVisible(False)
@@ -0,0 +1,87 @@
+# ******************************************************************************
+# * @attention
+# *
+# * Copyright (c) 2022 STMicroelectronics.
+# * All rights reserved.
+# *
+# * This software is licensed under terms that can be found in the LICENSE file
+# * in the root directory of this software component.
+# * If no LICENSE file comes with this software, it is provided AS-IS.
+# *
+# *
+# ******************************************************************************
+#
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from stdatalog_gui.Utils.RingBuffer import RingBuffer
+
+class WelchSpectrum(object):
+    """
+    Live amplitude spectrum of a multi-axis signal, estimated with the Welch method.
+    Each axis keeps its most recent samples in a ring buffer; at each compute() the last nof_averages
+    (overlapping) segments of all the axes are transformed with a single batched rfft and their power averaged.
+    """
+    FFT_SIZES = [256, 512, 1024, 2048, 4096, 8192]
+
+    def __init__(self, nof_axes, odr, fft_n = 512, overlap = 0.5, nof_averages = 4, windowed = True):
+        """
+        Args:
+            nof_axes (int): number of signal axes
+            odr (float): signal sampling frequency [Hz]
+            fft_n (int): FFT size (segment length)
+            overlap (float): segments overlap ratio [0, 1)
+            nof_averages (int): maximum number of averaged segments
+            windowed (bool): if True, a Hanning window is applied to each segment
+        """
+        self.nof_axes = nof_axes
+        self.odr = odr
+        self.fft_n = int(fft_n)
+        self.overlap = min(max(overlap, 0.0), 0.95)
+        self.nof_averages = max(1, int(nof_averages))
+        self.windowed = windowed
+        self.hop = max(1, int(round(self.fft_n * (1.0 - self.overlap))))
+        self.span = self.fft_n + (self.nof_averages - 1) * self.hop
+        self.freqs = np.fft.rfftfreq(self.fft_n, 1/odr)
+        self.__window = np.hanning(self.fft_n)
+        self.__window_sum = np.sum(self.__window)
+        self.__rings = [RingBuffer(self.span, np.float64, overwrite=True) for _ in range(nof_axes)]
+        self.__received = np.zeros(nof_axes, dtype=np.int64)
+        self.__new_samples = False
+
+    def reset(self):
+        for r in self.__rings:
+            r.reset()
+        self.__received[:] = 0
+        self.__new_samples = False
+
+    def add_samples(self, axis, samples):
+        n = self.__rings[axis].write(samples)
+        self.__received[axis] = min(self.__received[axis] + n, self.span)
+        self.__new_samples = self.__new_samples or n > 0
+
+    def compute(self):
+        """
+        Returns:
+            numpy.ndarray: (nof_axes, fft_n/2+1) amplitude spectra, or None if there are no new samples
+            or not enough samples for a single segment yet
+        """
+        available = int(np.min(self.__received))
+        if not self.__new_samples or available < self.fft_n:
+            return None
+        self.__new_samples = False
+        nof_segments = 1 + (available - self.fft_n) // self.hop
+        seg_span = self.fft_n + (nof_segments - 1) * self.hop
+        data = np.stack([r.latest(seg_span) for r in self.__rings])
+        segments = sliding_window_view(data, self.fft_n, axis=-1)[:, ::self.hop] # (nof_axes, nof_segments, fft_n)
+        if self.windowed:
+            segments = segments * self.__window
+            norm = self.__window_sum
+        else:
+            norm = self.fft_n
+        spectra = np.fft.rfft(segments, axis=-1)
+        power = np.mean(spectra.real**2 + spectra.imag**2, axis=1)
+        amplitude = np.sqrt(power) / norm
+        amplitude[:, 1:] *= 2 # single sided spectrum
+        return amplitude
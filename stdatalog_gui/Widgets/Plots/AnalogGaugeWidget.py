@@ -16,7 +16,7 @@
 import math
 
 from PySide6.QtWidgets import QLabel, QVBoxLayout
-from PySide6.QtGui import QPolygon, QPolygonF, QColor, QPen, QFont, QPainter, QFontMetrics, QConicalGradient
+from PySide6.QtGui import QPolygon, QPolygonF, QColor, QPen, QFont, QPainter, QFontMetrics, QConicalGradient, QPixmap
 from PySide6.QtCore import Qt, QPoint, QPointF, Signal, Slot
 
 from stdatalog_gui.Widgets.Plots.PlotWidget import PlotWidget
@@ -66,6 +66,12 @@ class AnalogGaugeInnerWidget(PlotWidget):
         self.component_label_fontsize = 21
         
         self.text_radius_factor = 0.7 #TODO
+
+        # Scale markers and values are value independent: they are rendered once (per size and DPI) in a cached pixmap
+        self.__static_layer = None
+        self.__static_layer_key = None
+        self.__pie_polygon = None
+        self.__pie_key = None
     
     @Slot(bool, int)
     def s_is_logging(self, status: bool, interface: int):
@@ -75,9 +81,14 @@ class AnalogGaugeInnerWidget(PlotWidget):
         else:
             self.timer.stop()
     
+    def has_new_data(self):
+        return self.l_data != self.value
+
     def update_plot(self):
-        self.value = self.l_data
-        self.update()
+        # Repaint (at most once per render frame) only if the displayed value changes
+        if self.l_data != self.value:
+            self.value = self.l_data
+            self.update()
     
     def add_data(self, data):
         if data > self.max_value:
@@ -95,9 +106,13 @@ class AnalogGaugeInnerWidget(PlotWidget):
         ]))
     
     def create_pie(self, start, lenght, out_rad, in_rad):
+        lenght = int(round((lenght / (self.max_value - self.min_value)) * (self.value - self.min_value)))
+        # The pie only changes when its (integer degrees) length or the widget size change
+        key = (start, lenght, out_rad, in_rad)
+        if key == self.__pie_key:
+            return self.__pie_polygon
         polygon_pie = QPolygonF()
         x = y = 0
-        lenght = int(round((lenght / (self.max_value - self.min_value)) * (self.value - self.min_value)))
         # Outer circle line
         for i in range(lenght+1):
             t = i + start
@@ -112,6 +127,8 @@ class AnalogGaugeInnerWidget(PlotWidget):
             polygon_pie.append(QPointF(x, y))
         # Outer line closure
         polygon_pie.append(QPointF(x, y))
+        self.__pie_key = key
+        self.__pie_polygon = polygon_pie
         return polygon_pie
 
     def draw_polygon(self, outline_pen_with=0):
@@ -135,8 +152,8 @@ class AnalogGaugeInnerWidget(PlotWidget):
         painter_filled_polygon.setBrush(grad)
         painter_filled_polygon.drawPolygon(colored_scale_polygon)
 
-    def draw_large_markers(self):
-        my_painter = QPainter(self)
+    def draw_large_markers(self, paint_device=None):
+        my_painter = QPainter(self if paint_device is None else paint_device)
         my_painter.setRenderHint(QPainter.Antialiasing)
         my_painter.translate(self.width() / 2, self.height() / 2)
         
@@ -151,8 +168,8 @@ class AnalogGaugeInnerWidget(PlotWidget):
             my_painter.drawLine(scale_line_lenght, 0, scale_line_outer_start, 0)
             my_painter.rotate(steps_size)
 
-    def draw_markers_values_text(self):
-        painter = QPainter(self)
+    def draw_markers_values_text(self, paint_device=None):
+        painter = QPainter(self if paint_device is None else paint_device)
         painter.setRenderHint(QPainter.Antialiasing)
         painter.translate(self.width() / 2, self.height() / 2)
         
@@ -181,8 +198,8 @@ class AnalogGaugeInnerWidget(PlotWidget):
             text = [x - int(w/2), y - int(h/2), int(w), int(h), Qt.AlignCenter, text]
             painter.drawText(text[0], text[1], text[2], text[3], text[4], text[5])
 
-    def draw_small_markers(self):
-        my_painter = QPainter(self)
+    def draw_small_markers(self, paint_device=None):
+        my_painter = QPainter(self if paint_device is None else paint_device)
         my_painter.setRenderHint(QPainter.Antialiasing)
         my_painter.translate(self.width() / 2, self.height() / 2)
 
@@ -242,6 +259,22 @@ class AnalogGaugeInnerWidget(PlotWidget):
 
         painter.drawConvexPolygon(self.needle[0])
 
+    def get_static_layer(self):
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr, self.wdgt_width, self.min_value, self.max_value)
+        if key != self.__static_layer_key:
+            pixmap = QPixmap(int(math.ceil(self.width() * dpr)), int(math.ceil(self.height() * dpr)))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            # draw scale marker lines
+            self.draw_small_markers(pixmap)
+            self.draw_large_markers(pixmap)
+            # draw scale marker value text
+            self.draw_markers_values_text(pixmap)
+            self.__static_layer = pixmap
+            self.__static_layer_key = key
+        return self.__static_layer
+
     def resizeEvent(self, event):
         self.set_scale_method()
 
@@ -249,12 +282,10 @@ class AnalogGaugeInnerWidget(PlotWidget):
         # colored pie area
         self.draw_polygon()
 
-        # draw scale marker lines
-        self.draw_small_markers()
-        self.draw_large_markers()
-
-        # draw scale marker value text
-        self.draw_markers_values_text()
+        # scale markers and values (cached)
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.get_static_layer())
+        painter.end()
 
         # Display Value
         self.draw_values_text()
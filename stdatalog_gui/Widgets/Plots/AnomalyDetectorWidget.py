@@ -13,9 +13,6 @@
 # ******************************************************************************
 #
 
-
-from PySide6.QtWidgets import QLabel
-
 from stdatalog_gui.Widgets.Plots.ClassifierOutputWidget import ClassifierOutputWidget
 
 class AnomalyDetectorWidget(ClassifierOutputWidget):
@@ -34,24 +31,16 @@ class AnomalyDetectorWidget(ClassifierOutputWidget):
 
         self.ai_tool_category_label.setText("Anomaly Detection")
         
+    def has_new_data(self):
+        # The last detected class stays displayed until a new result is received
+        return self._data[0].has_data()
+
     def update_plot(self):
-        if len(self._data[0]) > 0: 
-            # Extract all data from the queue (pop)    
-            one_reduced_t_interval = [self._data[0].popleft() for _i in range(len(self._data[0]))]
-            ort = one_reduced_t_interval[0][0]
+        result = self._data[0].take()
+        if result is not None: 
             if self.with_confidence:
-                confidence = one_reduced_t_interval[0][1]
-                self.class_confidence_value.setText(str(round((confidence * 100.0), 2)) + " %")
-            class_id = int(ort)
+                confidence = result[1]
+                self.show_confidence(str(round((confidence * 100.0), 2)) + " %")
+            class_id = int(result[0])
             class_names = list(self.output_class_widget.keys())
-            class_name = class_names[class_id]
-            for cn in class_names:
-                if cn == class_name:
-                    self.output_class_widget[cn].out_class_image.setPixmap(self.output_class_pixmaps[cn][0])
-                    self.output_class_widget[cn].setEnabled(True)
-                    self.output_class_widget[cn].findChild(QLabel,"out_class_name").setStyleSheet("color: #a4c238; font-size: 30px;")
-                else:
-                    self.output_class_widget[cn].out_class_image.setPixmap(self.output_class_pixmaps[cn][1])
-                    self.output_class_widget[cn].setEnabled(False)
-                    self.output_class_widget[cn].findChild(QLabel,"out_class_name").setStyleSheet("color: #383D48; font-size: 20px;")
-        self.app_qt.processEvents()
+            self.show_class(class_names[class_id])
@@ -13,7 +13,6 @@
 # ******************************************************************************
 #
 
-from collections import deque
 import os
 
 from PySide6.QtCore import Qt, QPoint, Slot
@@ -23,9 +22,13 @@ from PySide6.QtUiTools import QUiLoader
 from PySide6.QtDesigner import QPyDesignerCustomWidgetCollection
 
 import stdatalog_gui
+from stdatalog_gui.Utils.FrameSlot import FrameSlot
 from stdatalog_gui.Widgets.Plots.PlotWidget import PlotWidget
 from stdatalog_gui.Widgets.Plots.PlotWidget import PlotLabel
 
+# Output class name styles, switched with the "active" dynamic property (no stylesheet rebuild at each update)
+CLASS_NAME_STYLE = "QLabel { color: #383D48; font-size: 20px; } QLabel[active=\"true\"] { color: #a4c238; font-size: 30px; }"
+
 class ClassifierOutputWidget(PlotWidget):
     def __init__(self, controller, comp_name, comp_display_name, out_classes, ai_tool = None, with_signal=False, with_confidence=True, p_id=0, parent=None, left_label=None):
         """AI is creating summary for __init__
@@ -43,8 +46,9 @@ class ClassifierOutputWidget(PlotWidget):
         for i in reversed(range(self.layout().count())): 
             self.layout().itemAt(i).widget().setParent(None)
     
-        self._data = dict() # dict of queues
-        self._data[0] = deque(maxlen=200000)
+        self._data = dict() # dict of frame slots
+        # Only the most recent result is displayed, the older ones are counted as skipped
+        self._data[0] = FrameSlot()
         
         self.parent_widget = parent
 
@@ -52,6 +56,10 @@ class ClassifierOutputWidget(PlotWidget):
         self.ai_tool = ai_tool
         self.output_class_widget = {}
         self.output_class_pixmaps = {}
+        self.output_class_name_labels = {}
+        # Last rendered state (row active status, None: unknown), to update only what changes
+        self.shown_class_states = {}
+        self.shown_confidence = None
         
         self.with_signal = with_signal
         self.with_confidence = with_confidence
@@ -119,8 +127,10 @@ class ClassifierOutputWidget(PlotWidget):
             self.output_class_widget[output_class] = loader.load(os.path.join(os.path.dirname(stdatalog_gui.__file__),"UI","output_class_widget.ui"), parent)
             class_name = self.output_class_widget[output_class].findChild(QLabel,"out_class_name")
             class_name.setText(output_class)
+            self.output_class_name_labels[output_class] = class_name
+            self.shown_class_states[output_class] = None
             if output_class != "ISPU": #NOTE Done for ISPU CES2023 Demo purposes
-                self.output_class_widget[output_class].out_class_name.setStyleSheet("color: #383D48; font-size: 20px;")
+                self.output_class_widget[output_class].out_class_name.setStyleSheet(CLASS_NAME_STYLE)
             else:
                 self.output_class_widget[output_class].out_class_name.setStyleSheet("color: #3cb4e6; font-size: 20px;")
             class_pixmap = QPixmap(self.out_classes[output_class])
@@ -149,6 +159,39 @@ class ClassifierOutputWidget(PlotWidget):
     
     def update_plot_characteristics(self, plot_params):
         pass
+
+    def set_class_row_state(self, class_name, active):
+        row = self.output_class_widget[class_name]
+        row.out_class_image.setPixmap(self.output_class_pixmaps[class_name][0 if active else 1])
+        row.setEnabled(active)
+        name_label = self.output_class_name_labels[class_name]
+        if name_label.styleSheet() != CLASS_NAME_STYLE:
+            name_label.setStyleSheet(CLASS_NAME_STYLE)
+        name_label.setProperty("active", active)
+        name_label.style().unpolish(name_label)
+        name_label.style().polish(name_label)
+        self.shown_class_states[class_name] = active
+
+    def show_class(self, class_name):
+        """
+        Highlight class_name row (None: no highlighted class), touching only the rows whose state changes
+        """
+        for cn, shown_state in self.shown_class_states.items():
+            active = cn == class_name
+            if shown_state != active:
+                self.set_class_row_state(cn, active)
+
+    def show_confidence(self, text):
+        if text != self.shown_confidence:
+            self.class_confidence_value.setText(text)
+            self.shown_confidence = text
+
+    def get_skipped_frames_count(self):
+        return self._data[0].skipped_cnt
+
+    def has_new_data(self):
+        # With no new results, update_plot is still needed once to clear the displayed class
+        return self._data[0].has_data() or self.is_plotting_out
     
     @Slot(bool)
     def s_is_detecting(self, status: bool):
@@ -170,40 +213,25 @@ class ClassifierOutputWidget(PlotWidget):
         
     
     def update_plot(self):
-        if len(self._data[0]) > 0: 
+        result = self._data[0].take()
+        if result is not None: 
             if not self.is_plotting_out:
                 self.is_plotting_out = True
-            # Extract all data from the queue (pop)    
-            one_reduced_t_interval = [self._data[0].popleft() for _i in range(len(self._data[0]))]
-            ort = one_reduced_t_interval[0][0]
             if self.with_confidence:
-                confidence = one_reduced_t_interval[0][1]
-                self.class_confidence_value.setText(str(round((confidence * 100.0), 2)) + " %")
-            class_id = int(ort)
+                confidence = result[1]
+                self.show_confidence(str(round((confidence * 100.0), 2)) + " %")
+            class_id = int(result[0])
             class_names = list(self.output_class_widget.keys())
-            class_name = class_names[class_id]
-            for cn in class_names:
-                if cn == class_name:
-                    self.output_class_widget[cn].out_class_image.setPixmap(self.output_class_pixmaps[cn][0])
-                    self.output_class_widget[cn].setEnabled(True)
-                    self.output_class_widget[cn].findChild(QLabel,"out_class_name").setStyleSheet("color: #a4c238; font-size: 30px;")
-                else:
-                    self.output_class_widget[cn].out_class_image.setPixmap(self.output_class_pixmaps[cn][1])
-                    self.output_class_widget[cn].setEnabled(False)
-                    self.output_class_widget[cn].findChild(QLabel,"out_class_name").setStyleSheet("color: #383D48; font-size: 20px;")
+            self.show_class(class_names[class_id])
         else:
             if self.is_plotting_out:
-                for cn in list(self.output_class_widget.keys()):
-                    self.output_class_widget[cn].out_class_image.setPixmap(self.output_class_pixmaps[cn][1])
-                    self.output_class_widget[cn].setEnabled(False)
-                    self.output_class_widget[cn].findChild(QLabel,"out_class_name").setStyleSheet("color: #383D48; font-size: 20px;")
+                self.show_class(None)
                 self.is_plotting_out = False
                 if self.with_confidence:
-                    self.class_confidence_value.setText("--- %")
-        self.app_qt.processEvents()
+                    self.show_confidence("--- %")
 
     def add_data(self, data):
-        self._data[0].append(data[0])
+        self._data[0].put(data[0])
 
     @Slot()
     def clicked_plot_settings_button(self):
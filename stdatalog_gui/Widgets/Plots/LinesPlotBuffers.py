@@ -0,0 +1,156 @@
+# ******************************************************************************
+# * @attention
+# *
+# * Copyright (c) 2022 STMicroelectronics.
+# * All rights reserved.
+# *
+# * This software is licensed under terms that can be found in the LICENSE file
+# * in the root directory of this software component.
+# * If no LICENSE file comes with this software, it is provided AS-IS.
+# *
+# *
+# ******************************************************************************
+#
+
+from collections import deque
+
+import numpy as np
+
+import pyqtgraph as pg
+
+from stdatalog_gui.Utils.RingBuffer import RingBuffer
+from stdatalog_gui.Utils.Decimator import Decimator, DecimationMode
+
+class LinesPlotBuffers(object):
+    """
+    Mixin of the scrolling line plot widgets (PlotWidget subclasses): producer ring buffers, per-axis decimation,
+    plotted window, hidden history (see PlotWidget.update_hidden) and adaptive plot length.
+    The widget owns plot_params (LinesPlotParams) and calls init_lines_buffers() before reset_lines_buffers().
+    """
+    LINES_COLORS = ['#e6007e', '#a4c238', '#3cb4e6', '#ef4f4f', '#46b28e', '#e8ce0e', '#60b562', '#f99e20', '#41b3ba']
+    # True: the last plotted interval is repeated when no samples are received in a tick (zeros if False)
+    REPEAT_LAST_INTERVAL = True
+
+    def init_lines_buffers(self):
+        self.lines_colors = list(LinesPlotBuffers.LINES_COLORS)
+        self.graph_curves = dict()
+        self.one_t_interval_resampled = dict()
+        self._data = dict() # dict of ring buffers (producer -> plot hand-off)
+        self.y_queue = dict() # dict of ring buffers (plotted window)
+        self.decimation_mode = DecimationMode.MINMAX
+        self.decimators = dict()
+        self.hidden_history = dict() # dict of deques of the sample chunks received while not visible (one per tick, time window long)
+        self.hidden_ticks = 0
+
+    def reset_lines_buffers(self, x_end = 0):
+        """
+        (Re)initialize all the buffers from plot_params, the time window ending at x_end.
+        """
+        self.plot_len = self.get_adaptive_plot_len(self.get_min_plot_len())
+        self.plot_t_interval_size = int(self.plot_len/(self.plot_params.time_window / self.timer_interval))
+        self.x_data = np.linspace(-(self.plot_params.time_window) + x_end, x_end, self.plot_len)
+        for i in range(self.plot_params.dimension):
+            self.one_t_interval_resampled[i] = np.zeros(self.plot_t_interval_size)
+            if i in self._data:
+                self._data[i].clear()
+            else:
+                self._data[i] = RingBuffer(200000)
+                self.decimators[i] = Decimator(self.decimation_mode)
+            self.y_queue[i] = RingBuffer(self.plot_len, overwrite=True)
+            if i in self.hidden_history:
+                self.hidden_history[i].clear()
+            if len(self.graph_curves) < self.plot_params.dimension:
+                self.graph_curves[i] = self.graph_widget.plot()
+                self.graph_curves[i] = pg.PlotDataItem(pen=({'color': self.lines_colors[i - (len(self.lines_colors)* int(i / len(self.lines_colors)))], 'width': 1}), skipFiniteCheck=True, ignoreBounds=True)
+                self.graph_widget.addItem(self.graph_curves[i])
+        self.hidden_ticks = 0
+
+    def get_window_ticks(self):
+        # plot timer ticks in the time window
+        return max(1, int(round(self.plot_params.time_window / self.timer_interval)))
+
+    def get_min_plot_len(self):
+        # at least a min/max pair for each plot timer tick in the time window
+        return 2 * self.get_window_ticks()
+
+    def set_plot_len(self, plot_len):
+        """
+        Change the number of plotted points, resampling the currently displayed window.
+        Args:
+            plot_len (int): new number of points of the time window
+        """
+        if plot_len == self.plot_len:
+            return
+        self.x_data = np.linspace(self.x_data[0], self.x_data[-1], plot_len)
+        for i in self.y_queue:
+            displayed = self.y_queue[i].latest(self.plot_len)
+            self.y_queue[i] = RingBuffer(plot_len, overwrite=True)
+            if len(displayed) > 0:
+                self.y_queue[i].write(Decimator(self.decimation_mode).decimate(displayed, min(plot_len, len(displayed) * plot_len // self.plot_len + 1)))
+        self.plot_len = plot_len
+        self.plot_t_interval_size = int(self.plot_len/(self.plot_params.time_window / self.timer_interval))
+        for i in self.one_t_interval_resampled:
+            self.one_t_interval_resampled[i] = np.zeros(self.plot_t_interval_size)
+
+    def set_decimation_mode(self, mode:DecimationMode):
+        self.decimation_mode = mode
+        for d in self.decimators.values():
+            d.mode = mode
+
+    def update_y_window(self, axis, ticks = 1):
+        """
+        Decimate the samples received since the last call and append them to the plotted window of an axis.
+        Args:
+            axis (int): axis index
+            ticks (int): plot timer ticks elapsed since the last call
+        Returns:
+            numpy.ndarray: consumed raw samples (empty if none)
+        """
+        raw_samples = self._data[axis].read()
+        if len(raw_samples) > 0:
+            # Decimate extracted raw data to have the same plot_timer_interval size (plot len / (time window / times interval(sec)))
+            self.one_t_interval_resampled[axis] = self.decimators[axis].decimate(raw_samples, self.plot_t_interval_size * ticks)
+            self.y_queue[axis].write(self.one_t_interval_resampled[axis])
+        else: #data queue is empty: an interval is added for each elapsed tick
+            if self.REPEAT_LAST_INTERVAL:
+                empty_interval = self.one_t_interval_resampled[axis][-self.plot_t_interval_size:]
+            else:
+                empty_interval = np.zeros(self.plot_t_interval_size)
+            for _ in range(ticks):
+                self.y_queue[axis].write(empty_interval)
+        return raw_samples
+
+    def plot_area_resized(self):
+        self.set_plot_len(self.get_adaptive_plot_len(self.get_min_plot_len()))
+
+    def update_hidden(self):
+        # Move the received samples into the hidden history (no decimation, no setData).
+        # Only the last time window is kept: older samples would not be displayed by restore_hidden_data
+        self.x_data = self.x_data + self.timer_interval
+        self.hidden_ticks += 1
+        window_ticks = self.get_window_ticks()
+        for i in range(self.plot_params.dimension):
+            if i not in self.hidden_history or self.hidden_history[i].maxlen != window_ticks:
+                self.hidden_history[i] = deque(self.hidden_history.get(i, ()), maxlen=window_ticks)
+            self.hidden_history[i].append(self._data[i].read().copy()) # read() views are only valid until the next read
+
+    def restore_hidden_data(self):
+        # Rebuild (once) the displayed window with the samples received while the widget was hidden
+        for i in self.hidden_history:
+            nof_ticks = len(self.hidden_history[i])
+            hidden_data = np.concatenate(self.hidden_history[i]) if nof_ticks > 0 else []
+            self.hidden_history[i].clear()
+            if i in self.y_queue and len(hidden_data) > 0:
+                self.y_queue[i].write(Decimator(self.decimation_mode).decimate(hidden_data, nof_ticks * self.plot_t_interval_size))
+        self.hidden_ticks = 0
+
+    def has_new_data(self):
+        # The time axis scrolls at every tick, also when no samples have been received (low rate or bursty sensors)
+        return True
+
+    def get_overflow_count(self):
+        return sum(self._data[i].overflow_cnt for i in self._data)
+
+    def add_data(self, data):
+        for i in range(self.plot_params.dimension):
+            self._data[i].write(data[i])
@@ -15,6 +15,7 @@
 
 import math
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 from PySide6.QtCore import Qt, Slot
 from PySide6.QtWidgets import QPushButton
@@ -61,11 +62,36 @@ class PlotBarFFTWidget(PlotBarWidget):
         self.fft_filters_status = False
         self.fft_filters_pushButton.setStyleSheet(STDTDL_PushButton.red)
         self.fft_filters_pushButton.clicked.connect(self.clicked_fft_filter_button)
+
+        # Exponential averaging toggle (block average of the spectra received in a plot tick when off)
+        self.fft_avg_pushButton = QPushButton("EA")
+        self.fft_avg_pushButton.setFixedSize(18, 18)
+        self.fft_avg_pushButton.setToolTip("Exponential spectrum averaging")
+        self.fft_avg_pushButton.setStyleSheet(STDTDL_PushButton.red)
+        self.fft_avg_pushButton.clicked.connect(self.clicked_fft_avg_button)
+        fft_settings_layout = self.fft_settings_frame.layout()
+        fft_settings_layout.insertWidget(fft_settings_layout.indexOf(self.fft_filters_pushButton) + 1, self.fft_avg_pushButton)
         
         self.x_values = np.arange(0, self.fft_width*(self.fft_len) ,self.fft_width,  dtype=int)
         self.y_values = None
         self.min_filtered_x = 0
         self.max_filtered_x = len(self.x_values)
+        self.y_filter_height = None
+
+        # Spectrum pipeline: averaging and dB conversion in preallocated buffers, vectorized peak search
+        self.fft_avg_alpha = None
+        self.fft_default_avg_alpha = 0.2 # weight of the new spectrum when exponential averaging is enabled
+        self.fft_peak_min_prominence = 3 # [dB]
+        self.fft_peak_prominence_bins = 8
+        self.__avg = None
+        self.__avg_tmp = None
+        self.__psd = np.zeros(0)
+        self.__db = np.zeros(0)
+        self.__psd_scale = 1.0 / (self.fft_len * self.fft_input_freq_hz)
+        self.__peak_mask_key = None
+        self.__peak_mask = None
+        self.__shown_peak_idx = None
+        self.__shown_peak_value = None
         
         self.bargraph.setY(fft_bottom_val)
         self.graph_widget.setYRange(fft_bottom_val, fft_top_val, padding=0)
@@ -118,68 +144,117 @@ class PlotBarFFTWidget(PlotBarWidget):
         self.graph_widget.setMouseEnabled(x=False, y=False)
         self.graph_widget.hideButtons()
     
-    def update_peak_line(self, y_values):
-        
+    def set_averaging(self, alpha = None):
+        """
+        Args:
+            alpha (float): exponential averaging weight of the new spectrum (0, 1].
+                If None, each update shows the block average of the spectra received in a plot tick
+        """
+        self.fft_avg_alpha = alpha
+        self.__avg = None
+
+    def __average(self, frame):
+        if self.fft_avg_alpha is None:
+            return frame
+        if self.__avg is None or self.__avg.shape != frame.shape:
+            self.__avg = np.array(frame, dtype=np.float64)
+            self.__avg_tmp = np.zeros(frame.shape)
+        else:
+            np.subtract(frame, self.__avg, out=self.__avg_tmp)
+            self.__avg_tmp *= self.fft_avg_alpha
+            self.__avg += self.__avg_tmp
+        return self.__avg
+
+    def __get_peak_mask(self, n):
+        # Frequency filter (low/high pass regions) mask, rebuilt only when the regions move
         if self.fft_filters_status:
             left_limit = self.low_pass_filter_region.lines[1].getXPos()
             right_limit = self.high_pass_filter_region.lines[0].getXPos()
-        
-            mag_filter_br = self.magnitude_filter_region.viewRect()
-            mag_filter_rng = self.magnitude_filter_region.getRegion()
-            mag_filter_br.setTop(mag_filter_rng[0])
-            mag_filter_br.setBottom(mag_filter_rng[1])
+            key = (n, left_limit, right_limit)
+        else:
+            key = (n,)
+        if key != self.__peak_mask_key:
+            if self.fft_filters_status:
+                self.min_filtered_x = math.floor(left_limit/self.fft_width)
+                self.max_filtered_x = math.ceil(right_limit/self.fft_width)
+                self.__peak_mask = np.zeros(n, dtype=bool)
+                self.__peak_mask[self.min_filtered_x:self.max_filtered_x] = True
+            else:
+                self.__peak_mask = np.ones(n, dtype=bool)
+            self.__peak_mask_key = key
+        return self.__peak_mask
 
-            mag_filter_br.setRight(right_limit)
-            mag_filter_br.setLeft(left_limit)
-        
-            self.min_filtered_x = math.floor(left_limit/self.fft_width)
-            self.max_filtered_x = math.ceil(right_limit/self.fft_width)
-        
-            x_filtered_y_values = y_values[self.min_filtered_x:self.max_filtered_x]
+    def find_peaks(self, y_values):
+        """
+        Local maxima of the spectrum inside the filter regions (if enabled) with a prominence of at least
+        fft_peak_min_prominence dB over the minima of the fft_peak_prominence_bins bins on each side (the higher of the two).
+        Returns:
+            numpy.ndarray: peak bin indexes
+        """
+        n = len(y_values)
+        w = self.fft_peak_prominence_bins
+        padded = np.pad(y_values, 1, mode='constant', constant_values=-np.inf)
+        candidates = (y_values > padded[:-2]) & (y_values >= padded[2:]) & self.__get_peak_mask(n)
+        if self.fft_filters_status:
             self.y_filter_height = self.magnitude_filter_region.lines[1].getYPos() - self.fft_bottom_val
-            y_filtered_y_values = x_filtered_y_values[x_filtered_y_values > self.y_filter_height]
-        else:
-            y_filtered_y_values = y_values
-        
+            candidates &= y_values > self.y_filter_height
+        peaks = np.flatnonzero(candidates)
+        if len(peaks) == 0:
+            return peaks
+        # windows[i] = y[i-w .. i-1], windows[i+w+1] = y[i+1 .. i+w]; at the spectrum edges only the inner side counts
+        windows = sliding_window_view(np.pad(y_values, w, mode='constant', constant_values=np.inf), w)
+        left = windows[peaks].min(axis=1)
+        right = windows[peaks + w + 1].min(axis=1)
+        bases = np.maximum(np.where(np.isinf(left), right, left), np.where(np.isinf(right), left, right))
+        return peaks[y_values[peaks] - bases >= self.fft_peak_min_prominence]
+
+    def update_peak_line(self, y_values):
+        peak_idx = None
         if self.fft_peak_status:
-            if len(y_filtered_y_values) > 0:
-                max_value = max(y_filtered_y_values)
-                max_idx, = np.where(np.isclose(y_values, max_value)) # floating-point
-                self.peak_v_line.setPos(self.x_values[max_idx][0])
-                self.peak_h_line.setPos(max_value + self.fft_bottom_val)
-                self.peak_h_line.label.setHtml("<p><strong><span style=\"font-size:18.0pt; color: #46b28e;\">{} Hz</span></strong></p>".format(self.x_values[max_idx][0]))
+            peaks = self.find_peaks(y_values)
+            if len(peaks) > 0:
+                peak_idx = int(peaks[np.argmax(y_values[peaks])])
+                peak_value = float(y_values[peak_idx])
+                if peak_value != self.__shown_peak_value:
+                    self.peak_h_line.setPos(peak_value + self.fft_bottom_val)
+                    self.__shown_peak_value = peak_value
+        # Lines and label are moved/rewritten only when the detected peak changes
+        if peak_idx != self.__shown_peak_idx:
+            if peak_idx is not None:
+                self.peak_v_line.setPos(self.x_values[peak_idx])
+                self.peak_h_line.label.setHtml("<p><strong><span style=\"font-size:18.0pt; color: #46b28e;\">{} Hz</span></strong></p>".format(self.x_values[peak_idx]))
             else:
                 self.peak_h_line.label.setHtml("<span style=color: transparent;\"></span>")
-        else:
-            self.peak_h_line.label.setHtml("<span style=color: transparent;\"></span>")
+            self.__shown_peak_idx = peak_idx
     
     def update_plot(self):
         if self.buffering_timer_counter == 0:
-            if len(self._data[0]) > 0: 
-                # Extract all data from the queue (pop)    
-                one_reduced_t_interval = [self._data[0].popleft() for _i in range(len(self._data[0]))]
-                y_raw_values = np.array(one_reduced_t_interval)
-                y_array_mean = np.mean(y_raw_values, axis = 0)
+            y_array_mean = self._data[0].take()
+            if y_array_mean is not None:
+                y_array_mean = self.__average(y_array_mean)
+                if self.__psd.shape != y_array_mean.shape:
+                    self.__psd = np.zeros(y_array_mean.shape)
+                    self.__db = np.zeros(y_array_mean.shape)
                 # Power spectral density
-                y_raw_values = np.square(y_array_mean)
-                y_raw_values =  y_raw_values / (self.fft_len * self.fft_input_freq_hz)
-                if y_raw_values.any():
-                    y_raw_values =  10 * np.log10(y_raw_values)
-                    self.y_values = y_raw_values - self.fft_bottom_val
+                np.square(y_array_mean, out=self.__psd)
+                self.__psd *= self.__psd_scale
+                if self.__psd.any():
+                    np.maximum(self.__psd, np.finfo(np.float64).tiny, out=self.__psd)
+                    np.log10(self.__psd, out=self.__db)
+                    self.__db *= 10
+                    self.__db -= self.fft_bottom_val
+                    # __db is overwritten at each update: y_values (and the bar heights) get their own copy
+                    self.y_values = self.__db.copy()
                     self.bargraph.setOpts(x = self.x_values, height = self.y_values, brush ='#a4c238', pen='#1B1D23')
-                else:
-                    self.bargraph.setOpts(brush=(0,0,0,0), pen=(0,0,0,0))
-                
-                if self.y_values is not None:
                     if not self.fft_peak_label_shown:
                         self.__show_hide_peak_reveal(True)
                         self.fft_peak_label_shown = True
                     self.update_peak_line(self.y_values)
-                if not any(y_raw_values):
+                else:
+                    self.bargraph.setOpts(brush=(0,0,0,0), pen=(0,0,0,0))
                     if self.fft_peak_label_shown:
                         self.__show_hide_peak_reveal(False)
                         self.fft_peak_label_shown = False
-            self.app_qt.processEvents()
         else:
             # Increment the buffering counter (skip a plot timer interval to bufferize data from sensors)
             self.buffering_timer_counter += 1
@@ -224,11 +299,22 @@ class PlotBarFFTWidget(PlotBarWidget):
     def clicked_fft_peak_button(self):
         self.fft_peak_status = not self.fft_peak_status
         self.__show_hide_peak_reveal(self.fft_peak_status)
+        if self.y_values is not None:
+            self.update_peak_line(self.y_values)
         if self.fft_peak_status:
             self.fft_peak_pushButton.setStyleSheet(STDTDL_PushButton.green)
         else:
             self.fft_peak_pushButton.setStyleSheet(STDTDL_PushButton.red)
     
+    @Slot()
+    def clicked_fft_avg_button(self):
+        if self.fft_avg_alpha is None:
+            self.set_averaging(self.fft_default_avg_alpha)
+            self.fft_avg_pushButton.setStyleSheet(STDTDL_PushButton.green)
+        else:
+            self.set_averaging(None)
+            self.fft_avg_pushButton.setStyleSheet(STDTDL_PushButton.red)
+
     @Slot()
     def clicked_fft_filter_button(self):
         self.fft_filters_status = not self.fft_filters_status
@@ -14,12 +14,12 @@
 #
 
 import numpy as np
-from collections import deque
 
 from PySide6.QtCore import Slot, QSize
 
 import pyqtgraph as pg
 
+from stdatalog_gui.Utils.FrameSlot import FrameSlot, FrameSlotMode
 from stdatalog_gui.Widgets.Plots.PlotWidget import PlotWidget
 
 class PlotBarWidget(PlotWidget):
@@ -32,8 +32,9 @@ class PlotBarWidget(PlotWidget):
         self.n_bars = n_bars
         self.bar_width = bar_width
         
-        self._data = dict() # dict of queues
-        self._data[0] = deque(maxlen=200000)
+        self._data = dict() # dict of frame slots
+        # Bars show the mean of the frames received in a plot tick (running sum, no frame queue)
+        self._data[0] = FrameSlot(FrameSlotMode.MEAN)
         
         # create list for y-axis
         y1 = np.zeros(n_bars)
@@ -64,6 +65,15 @@ class PlotBarWidget(PlotWidget):
     def update_plot_characteristics(self, plot_params):
         pass
 
+    def set_buffer_mode(self, mode:FrameSlotMode):
+        self._data[0].set_mode(mode)
+
+    def get_skipped_frames_count(self):
+        return self._data[0].skipped_cnt
+
+    def has_new_data(self):
+        return self._data[0].has_data()
+
     @Slot(bool, int)
     def s_is_logging(self, status: bool, interface: int):
         if interface == 1 or interface == 3:
@@ -83,16 +93,12 @@ class PlotBarWidget(PlotWidget):
     
     def update_plot(self):
         if self.buffering_timer_counter == 0:
-            if len(self._data[0]) > 0: 
-                # Extract all data from the queue (pop)    
-                one_reduced_t_interval = [self._data[0].popleft() for _i in range(len(self._data[0]))]
-                y_value = np.array(one_reduced_t_interval)
-                y_array_mean = np.mean(y_value, axis = 0)
+            y_array_mean = self._data[0].take()
+            if y_array_mean is not None:
                 self.bargraph.setOpts(x = self.x, height = y_array_mean)
-            self.app_qt.processEvents()
         else:
             # Increment the buffering counter (skip a plot timer interval to bufferize data from sensors)
             self.buffering_timer_counter += 1
 
     def add_data(self, data):
-        self._data[0].append(data[0])
+        self._data[0].put(data[0])
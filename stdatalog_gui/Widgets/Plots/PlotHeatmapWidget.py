@@ -13,18 +13,18 @@
 # ******************************************************************************
 #
 
-from collections import deque
 import time
 import numpy as np
 from functools import partial
 
-from PySide6.QtCore import Slot, Qt, QTimer, QPoint
-from PySide6.QtGui import QColor, QIcon, QIntValidator, QPainter, QPen, QBrush
+from PySide6.QtCore import Slot, Qt, QTimer, QPointF, QRectF
+from PySide6.QtGui import QColor, QIcon, QIntValidator, QPainter, QPen, QBrush, QFont, QStaticText, QTransform
 from PySide6.QtWidgets import QHBoxLayout, QVBoxLayout, QFrame, QPushButton, QLineEdit, QButtonGroup, QLabel, QGridLayout
 
 import pyqtgraph as pg
 from stdatalog_gui.UI.styles import STDTDL_Chip, STDTDL_LineEdit, STDTDL_PushButton
 from stdatalog_gui.Utils import UIUtils
+from stdatalog_gui.Utils.FrameSlot import FrameSlot, FrameSlotMode
 from stdatalog_gui.Widgets.Plots.PlotWidget import CustomPGPlotWidget, PlotWidget
 
 from PySide6.QtCore import Signal
@@ -63,6 +63,95 @@ class CustomHeatmapPlotWidget(CustomPGPlotWidget):
     def mouseMoveEvent(self, ev):
         pass
 
+class HeatmapValuesOverlay(pg.GraphicsObject):
+    """
+    Single scene item drawing all the heatmap cell values and the ROI cells in one paint() call
+    (instead of one TextItem and one ImageItem per cell).
+    Values are given as a NumPy array of strings; each distinct string is laid out once and cached as a QStaticText.
+    """
+    MAX_CACHED_TEXTS = 4096
+
+    def __init__(self, shape, default_color = QColor(200, 200, 200), valid_color = QColor(0, 255, 0), invalid_color = QColor(255, 0, 0)):
+        super().__init__()
+        self.default_color = default_color
+        self.valid_color = valid_color
+        self.invalid_color = invalid_color
+        self.font = QFont()
+        self.__texts = np.zeros(shape, dtype='i').astype(str)
+        self.__invalid = None
+        self.__roi_masks = {}
+        self.__static_texts = dict()
+        self.setAcceptedMouseButtons(Qt.MouseButton.NoButton) # clicks go to the heatmap image below
+        self.setZValue(10)
+
+    def set_values(self, texts, invalid = None):
+        """
+        Args:
+            texts (numpy.ndarray): cell labels, same shape of the heatmap image
+            invalid (numpy.ndarray): boolean mask of the invalid cells (red), the others are valid (green).
+                If None, all the labels are drawn in the default color
+        """
+        if texts.shape != self.__texts.shape:
+            self.prepareGeometryChange()
+        elif np.array_equal(texts, self.__texts) and \
+            (invalid is None and self.__invalid is None or invalid is not None and self.__invalid is not None and np.array_equal(invalid, self.__invalid)):
+            return
+        self.__texts = texts
+        self.__invalid = invalid
+        self.update()
+
+    def set_roi_masks(self, roi_masks):
+        """
+        Args:
+            roi_masks (dict): roi_id -> boolean mask of the cells belonging to the ROI
+        """
+        self.__roi_masks = {k: m.copy() for k, m in roi_masks.items()}
+        self.update()
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.__texts.shape[0], self.__texts.shape[1])
+
+    def __get_static_text(self, text):
+        st = self.__static_texts.get(text)
+        if st is None:
+            if len(self.__static_texts) >= self.MAX_CACHED_TEXTS:
+                self.__static_texts.clear()
+            st = QStaticText(text)
+            st.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+            st.prepare(QTransform(), self.font)
+            self.__static_texts[text] = st
+        return st
+
+    def paint(self, p, *args):
+        # ROI cells (data coordinates: cell (x,y) is the unit square with lower-left corner in (x,y))
+        for roi_id, mask in self.__roi_masks.items():
+            if not mask.any():
+                continue
+            pen = QPen(roi_qcolors[roi_id])
+            pen.setCosmetic(True)
+            pen.setWidth(2)
+            p.setPen(pen)
+            p.setBrush(QBrush(QColor(*roi_colors_rgba[roi_id])))
+            for x, y in np.argwhere(mask):
+                p.drawRect(QRectF(float(x), float(y), 1, 1))
+
+        # Cell values, drawn in device coordinates (not scaled with the view) at the lower-left corner of each cell
+        tr = p.transform()
+        p.save()
+        p.resetTransform()
+        p.setFont(self.font)
+        if self.__invalid is None:
+            groups = [(self.default_color, np.ones(self.__texts.shape, dtype=bool))]
+        else:
+            groups = [(self.valid_color, ~self.__invalid), (self.invalid_color, self.__invalid)]
+        for color, mask in groups:
+            p.setPen(color)
+            for i, j in np.argwhere(mask):
+                st = self.__get_static_text(self.__texts[i, j])
+                pt = tr.map(QPointF(float(i), float(j)))
+                p.drawStaticText(QPointF(pt.x(), pt.y() - st.size().height()), st)
+        p.restore()
+
 class Chip(QPushButton):
     
     def __init__(self, text, color, parent=None):
@@ -333,17 +422,21 @@ class PlotHeatmapWidget(PlotWidget):
         self.global_presence_status = False
         
         self.data = np.zeros(shape=(self.heatmap_shape), dtype='i')
-        self._data = deque(maxlen=200000)
+        # Only the last received frame is displayed (or the mean of the frames received in a plot tick, see set_buffer_mode)
+        self._data = FrameSlot(FrameSlotMode.LATEST)
 
         self.validity_mask = np.zeros(shape=(self.heatmap_shape), dtype='i')
         self.zones = PlotHeatmapWidget.create_matrix(self.heatmap_shape[0])
-        self.rois = {i: {} for i in range(ROI_NUMBER)}
+        self.roi_masks = {i: np.zeros(shape=(self.heatmap_shape), dtype=bool) for i in range(ROI_NUMBER)}
         self.underthresh = {i: [] for i in range(ROI_NUMBER)}
         self.global_underthresh = np.zeros(shape=(self.heatmap_shape), dtype='i')
         self.is_roi_flashing = {i:False for i in range(ROI_NUMBER)}
         
         self.selected_roi_id = 0
         self.a = 0
+
+        # Rotation/flip index permutations, cached by (shape, rotation, flips, transpose)
+        self.__permutations = dict()
         
         self.heatmap_img = pg.ImageItem()
         self.heatmap_img.setImage(self.data, levels=[MIN_DIST, MAX_DIST])
@@ -386,32 +479,14 @@ class PlotHeatmapWidget(PlotWidget):
         main_layout.addWidget(self.plot_frame)
         self.contents_frame.layout().addWidget(main_frame)
 
-        # Add text items for each pixel
-        self.text_items = []
-        self.fill_with_text_items()
+        # Cell values and ROIs overlay
+        self.values_overlay = HeatmapValuesOverlay(self.heatmap_shape, valid_color=self.green_color, invalid_color=self.red_color)
+        self.graph_widget.addItem(self.values_overlay)
 
         # Add a mouse click event handler to the imageItem
         self.heatmap_img.mouseClickEvent = self.image_item_clicked
         self.heatmap_img.getViewBox().setAspectLocked(True)
 
-    def fill_with_text_items(self):
-        #clean existing text items, if any
-        for ti in self.text_items:
-            for w in ti:
-                self.graph_widget.removeItem(w)
-                w.deleteLater()
-        self.text_items = []
-        
-        #add new text items
-        for i in range(self.heatmap_shape[0]):
-            row = []
-            for j in range(self.heatmap_shape[1]):
-                text_item = pg.TextItem(text= str(self.data[i, j]), color=(200, 200, 200), anchor=(0,1))
-                text_item.setPos(j, i)
-                self.graph_widget.addItem(text_item)
-                row.append(text_item)
-            self.text_items.append(row)
-
     def update_plot_characteristics(self, heatmap_shape):
         self.heatmap_shape = heatmap_shape
         self.zones = PlotHeatmapWidget.create_matrix(self.heatmap_shape[0])
@@ -419,10 +494,11 @@ class PlotHeatmapWidget(PlotWidget):
         self._data.clear()
         self.global_underthresh = np.zeros(shape=(self.heatmap_shape), dtype='i')
         self.validity_mask = np.zeros(shape=(self.heatmap_shape), dtype='i')
+        self.roi_masks = {i: np.zeros(shape=(self.heatmap_shape), dtype=bool) for i in range(ROI_NUMBER)}
         self.heatmap_img.setImage(self.data, levels=[MIN_DIST, MAX_DIST])
         self.graph_widget.getPlotItem()._updateView()
-        # Add text items for each pixel
-        self.fill_with_text_items()
+        self.values_overlay.set_values(self.data.astype(str))
+        self.values_overlay.set_roi_masks(self.roi_masks)
         if self.app_qt is not None:
             self.app_qt.processEvents()
 
@@ -439,47 +515,34 @@ class PlotHeatmapWidget(PlotWidget):
         else: # interface == 0
             print("Component {} is logging on SD Card: {}".format(self.comp_name,status))
 
+    def set_buffer_mode(self, mode:FrameSlotMode):
+        self._data.set_mode(mode)
+
+    def get_skipped_frames_count(self):
+        return self._data.skipped_cnt
+
+    def has_new_data(self):
+        return self._data.has_data()
+
     def update_plot(self):
-        # Extract all data from the queue (pop)
-        if len(self._data) > 0 :
-            l_data = self._data.popleft()
+        l_data = self._data.take()
+        if l_data is not None:
+            if self._data.mode == FrameSlotMode.MEAN:
+                l_data = np.rint(l_data).astype('i')
             if l_data.shape == self.heatmap_shape:
                 self.heatmap_img.setImage(l_data, levels=[MIN_DIST, MAX_DIST])
-                for i in range(self.heatmap_shape[0]):
-                    for j in range(self.heatmap_shape[1]):
-                        curr_data = l_data[i][j]
-                        curr_valid_mask = self.validity_mask[i][j]
-                        if curr_data > MAX_DIST:
-                            self.text_items[j][i].setText("X")
-                            curr_valid_mask = VALIDITY_MASK_INVALID_VALUE
-                            self.global_underthresh[i][j] = 0
-                        else:                    
-                            self.text_items[j][i].setText(str(curr_data))
-                        
-                        if curr_valid_mask == VALIDITY_MASK_INVALID_VALUE:
-                            self.text_items[j][i].setColor(self.red_color) #red, invalid
-                            self.global_underthresh[i][j] = 0
-                        else:
-                            self.text_items[j][i].setColor(self.green_color) #green, valid
-                            if curr_data != 0 and curr_data < self.presence_threshold:
-                                self.global_underthresh[i][j] = 1
-                            else:
-                                self.global_underthresh[i][j] = 0
-                        for k in range(ROI_NUMBER):
-                            if len(self.rois[k].keys()) == 0:
-                                self.underthresh[k] = []
-                            elif (i,j) in self.rois[k].keys():
-
-                                if curr_valid_mask == VALIDITY_MASK_INVALID_VALUE:
-                                    if (i,j) in self.underthresh[k]:
-                                        self.underthresh[k].remove((i,j))
-                                else:
-                                    if curr_data < self.roi_thresolds[k]:
-                                        if (i,j) not in self.underthresh[k]:
-                                            self.underthresh[k].append((i,j))
-                                    else:
-                                        if (i,j) in self.underthresh[k]:
-                                            self.underthresh[k].remove((i,j))
+                # Out of range distances are displayed as "X" and considered invalid
+                out_of_range = l_data > MAX_DIST
+                invalid = out_of_range | (self.validity_mask == VALIDITY_MASK_INVALID_VALUE)
+                valid = ~invalid
+                self.global_underthresh = (valid & (l_data != 0) & (l_data < self.presence_threshold)).astype('i')
+                self.values_overlay.set_values(np.where(out_of_range, "X", l_data.astype(str)), invalid) #red: invalid, green: valid
+                for k in range(ROI_NUMBER):
+                    if not self.roi_masks[k].any():
+                        self.underthresh[k] = []
+                    else:
+                        roi_underthresh = self.roi_masks[k] & valid & (l_data < self.roi_thresolds[k])
+                        self.underthresh[k] = [tuple(c) for c in np.argwhere(roi_underthresh)]
                 
                 if bool(np.any(self.global_underthresh)) == True and not np.all(0) and self.global_presence_status == False:
                     self.global_presence_status = True
@@ -503,34 +566,43 @@ class PlotHeatmapWidget(PlotWidget):
                             self.controller.sig_tof_presence_detected_in_roi.emit(False,x+1,"Target {}".format(x+1))
             else:
                 self.heatmap_img.setImage(l_data)
-        self._data.clear()
         
+    def __get_permutation(self, transpose):
+        # Flat indexes reproducing reshape (+ transpose), rot90 and flips of a frame with a single fancy indexing
+        key = (tuple(self.heatmap_shape), self.heatmap_rotation % 4, self.heatmap_is_x_flipped, self.heatmap_is_y_flipped, transpose)
+        perm = self.__permutations.get(key)
+        if perm is None:
+            perm = np.arange(self.heatmap_shape[0]*self.heatmap_shape[1]).reshape(self.heatmap_shape)
+            if transpose:
+                perm = perm.transpose()
+            perm = np.rot90(perm, k=-(self.heatmap_rotation % 4))
+            if self.heatmap_is_x_flipped:
+                perm = np.flip(perm, axis=0)
+            if self.heatmap_is_y_flipped:
+                perm = np.flip(perm, axis=1)
+            perm = np.ascontiguousarray(perm)
+            self.__permutations[key] = perm
+        return perm
+
     def add_data(self, data):
         data_shape = self.heatmap_shape[0]*self.heatmap_shape[1]
         if len(data) == 2:
             if len(data[0]) % (data_shape) == 0 and len(data[0]) != 0:
-                l_data = data[0][-data_shape:].reshape(self.heatmap_shape).transpose()
+                self._data.put(np.asarray(data[0][-data_shape:])[self.__get_permutation(True)])
+            
+            if len(data[1]) % (data_shape) == 0 and len(data[1]) != 0:
+                self.validity_mask = np.asarray(data[1][-data_shape:])[self.__get_permutation(False)]
+        if len(data) == self.heatmap_shape[0]:
+            l_data = np.asarray(data)
+            if l_data.size == data_shape:
+                l_data = l_data.reshape(-1)[self.__get_permutation(False)]
+            else:
                 l_data = np.rot90(l_data, k=-(self.heatmap_rotation % 4))
                 if self.heatmap_is_x_flipped:
                     l_data = np.flip(l_data, axis=0)
                 if self.heatmap_is_y_flipped:
                     l_data = np.flip(l_data, axis=1)
-                self._data.append(l_data)
-            
-            if len(data[1]) % (data_shape) == 0 and len(data[1]) != 0:
-                self.validity_mask = data[1][-data_shape:].reshape(self.heatmap_shape)
-                self.validity_mask = np.rot90(self.validity_mask, k=-(self.heatmap_rotation % 4))
-                if self.heatmap_is_x_flipped:
-                    self.validity_mask = np.flip(self.validity_mask, axis=0)
-                if self.heatmap_is_y_flipped:
-                    self.validity_mask = np.flip(self.validity_mask, axis=1)
-        if len(data) == self.heatmap_shape[0]:
-            l_data = np.rot90(data, k=-(self.heatmap_rotation % 4))
-            if self.heatmap_is_x_flipped:
-                l_data = np.flip(l_data, axis=0)
-            if self.heatmap_is_y_flipped:
-                l_data = np.flip(l_data, axis=1)
-            self._data.append(l_data)
+            self._data.put(l_data)
 
     @staticmethod
     def create_matrix(size):
@@ -585,15 +657,15 @@ class PlotHeatmapWidget(PlotWidget):
         # pixel_value = self.data[y, x]
         # print(f"Clicked on pixel ({x}, {y}) with value {pixel_value}")
 
+        if (x,y) not in self.zones:
+            return
+
         if self.zones[(x,y)] == False:
-            if (x,y) not in self.rois[self.selected_roi_id]:
-                mask = pg.ImageItem()
-                mask.setImage(np.ones((1, 1, 4)) * np.array(roi_colors_rgba[self.selected_roi_id]))
-                mask.setPos(QPoint(x,y))
-                self.rois[self.selected_roi_id][(x,y)] = mask
-            self.graph_widget.addItem(self.rois[self.selected_roi_id][(x,y)])
+            self.roi_masks[self.selected_roi_id][x, y] = True
             self.zones[(x,y)] = True
         else:
-            self.graph_widget.removeItem(self.rois[self.selected_roi_id][(x,y)])
-            del self.rois[self.selected_roi_id][(x,y)]
+            # A cell belongs to a single ROI: free it, whichever ROI it was assigned to
+            for k in range(ROI_NUMBER):
+                self.roi_masks[k][x, y] = False
             self.zones[(x,y)] = False
+        self.values_overlay.set_roi_masks(self.roi_masks)
@@ -13,17 +13,23 @@
 # ******************************************************************************
 #
 
-import numpy as np
-from collections import deque
+from threading import Lock, RLock
 
-from PySide6.QtCore import Slot
+from PySide6.QtCore import Signal, Slot
 
-import pyqtgraph as pg
 from stdatalog_gui.Utils.PlotParams import LinesPlotParams
+from stdatalog_gui.Utils.PlotDataPipeline import PlotDataPipeline
 
 from stdatalog_gui.Widgets.Plots.PlotWidget import PlotWidget
+from stdatalog_gui.Widgets.Plots.LinesPlotBuffers import LinesPlotBuffers
+
+import stdatalog_core.HSD_utils.logger as logger
+log = logger.get_logger(__name__)
+
+class PlotLinesWidget(LinesPlotBuffers, PlotWidget):
+
+    sig_plot_data_ready = Signal()
 
-class PlotLinesWidget(PlotWidget):
     def __init__(self, controller, comp_name, comp_display_name, plot_params, p_id = 0, parent=None):
         super().__init__(controller, comp_name, comp_display_name, p_id, parent, plot_params.unit)
         
@@ -33,36 +39,32 @@ class PlotLinesWidget(PlotWidget):
         self.plot_params = plot_params
         self.plot_t_interval_size = int(self.plot_len/(plot_params.time_window / self.timer_interval))     
         
-        self.lines_colors = ['#e6007e', '#a4c238', '#3cb4e6', '#ef4f4f', '#46b28e', '#e8ce0e', '#60b562', '#f99e20', '#41b3ba']
-        self.graph_curves = dict()
-        
-        self.one_t_interval_resampled = dict()
-        self._data = dict() # dict of queues
-        self.y_queue = dict() # dict of queues
+        self.init_lines_buffers()
         self.current_x = 0
 
+        # Plot data are prepared (prepare_plot_data) by the controller worker pool and rendered (render_plot_data)
+        # by the GUI thread. plot_data_lock protects the consumer side of the data buffers.
+        self.plot_data_lock = RLock()
+        self.__ticks_lock = Lock()
+        self.__pending_ticks = 0
+        self.__prepare_pending = False
+        self.__prepared_frames = [dict(), dict()] # double buffer: [front (rendered), back (being prepared)]
+        self.__frame_ready = False
+        self.sig_plot_data_ready.connect(self.__render_prepared_frame)
+
         self.update_plot_characteristics(plot_params)
 
     def update_plot_characteristics(self, plot_params:LinesPlotParams):
-        self.plot_params = plot_params
-
-        for i in range(self.plot_params.dimension):
-            self.one_t_interval_resampled[i] = np.zeros(self.plot_t_interval_size)
-        
-        self.x_data = np.linspace(-(plot_params.time_window) + self.current_x, self.current_x, self.plot_len)
-        for i in range(self.plot_params.dimension):
-            self._data[i] = deque(maxlen=200000)
-            self.y_queue[i] = deque(maxlen=self.plot_len)
-            self.y_queue[i].extend(np.zeros(self.plot_len))
-            if len(self.graph_curves) < self.plot_params.dimension:
-                self.graph_curves[i] = self.graph_widget.plot()
-                self.graph_curves[i] = pg.PlotDataItem(pen=({'color': self.lines_colors[i - (len(self.lines_colors)* int(i / len(self.lines_colors)))], 'width': 1}), skipFiniteCheck=True, ignoreBounds=True)
-                self.graph_widget.addItem(self.graph_curves[i])
-            
+        with self.plot_data_lock:
+            self.__update_plot_characteristics(plot_params)
         if self.app_qt is not None:
             self.app_qt.processEvents()
-        
-        self.plot_t_interval_size = int(self.plot_len/(plot_params.time_window / self.timer_interval))
+
+    def __update_plot_characteristics(self, plot_params:LinesPlotParams):
+        self.plot_params = plot_params
+        self.reset_lines_buffers(self.current_x)
+        with self.__ticks_lock:
+            self.__pending_ticks = 0
             
     @Slot(float)
     def s_time_window_updated(self, new_time_w):
@@ -90,37 +92,78 @@ class PlotLinesWidget(PlotWidget):
 
     def reset(self):
         pass
-    
-    def resample_linear1D(self, original, targetLen):
-        original = np.array(original, dtype=float)
-        index_arr = np.linspace(0, len(original)-1, num=targetLen, dtype=float)
-        index_floor = np.array(index_arr, dtype=int) #Round down
-        index_ceil = index_floor + 1
-        index_rem = index_arr - index_floor #Remain
-        
-        val1 = original[index_floor]
-        val2 = original[index_ceil % len(original)]
-        interp = val1 * (1.0-index_rem) + val2 * index_rem
-        assert(len(interp) == targetLen)
-        return interp
-    
+
+    def plot_area_resized(self):
+        with self.plot_data_lock:
+            super().plot_area_resized()
+
     def update_plot(self):
-        self.x_data = self.x_data + self.timer_interval
-        # for i in range(self.n_curves):
+        # A frame prepared by the previous job is rendered before its buffers can be reused by the next job
+        self.__render_prepared_frame()
+        with self.__ticks_lock:
+            self.__pending_ticks += 1
+        pipeline = self.controller.get_plot_data_pipeline()
+        if not pipeline.enabled:
+            self.__prepare_frame()
+            self.__render_prepared_frame()
+        elif not self.__prepare_pending:
+            # Ticks elapsed while a job is still running are handled (all together) by the next one
+            self.__prepare_pending = True
+            pipeline.submit(self.__prepare_frame)
+
+    def __prepare_frame(self):
+        try:
+            with self.__ticks_lock:
+                ticks = self.__pending_ticks
+                self.__pending_ticks = 0
+            if ticks > 0:
+                with self.plot_data_lock:
+                    self.prepare_plot_data(ticks, self.__prepared_frames[1])
+                self.__prepared_frames.reverse()
+                self.__frame_ready = True
+                self.sig_plot_data_ready.emit()
+        except Exception as e:
+            log.error("Error preparing {} plot data: {}".format(self.comp_name, e))
+        finally:
+            self.__prepare_pending = False
+
+    @Slot()
+    def __render_prepared_frame(self):
+        if self.__frame_ready:
+            self.__frame_ready = False
+            self.render_plot_data(self.__prepared_frames[0])
+
+    def consume_raw_samples(self, axis, samples):
+        # Worker side hook, called with the raw samples of each axis read in prepare_plot_data
+        pass
+
+    def prepare_plot_data(self, ticks, frame):
+        """
+        Worker side (no Qt calls): consume the received samples and fill frame with ready to render arrays.
+        Args:
+            ticks (int): plot timer ticks elapsed since the last call
+            frame (dict): back buffer to be filled, its arrays are reused across calls
+        """
+        if self.hidden_ticks > 0:
+            self.restore_hidden_data()
+        self.x_data = self.x_data + self.timer_interval * ticks
         for i in range(self.plot_params.dimension):
-            if len(self._data[i]) > 0: # If data queue is not empty
-                # Extract all data from the queue (pop)
-                one_reduced_t_interval = [self._data[i].popleft() for _i in range(len(self._data[i]))]
-                # Resample extracted raw data to have the same plot_timer_interval size (plot len / (time window / times interval(sec)))
-                self.one_t_interval_resampled[i] = self.resample_linear1D(one_reduced_t_interval, self.plot_t_interval_size)
-                # Put resampled data into the y data queue
-                self.y_queue[i].extend(self.one_t_interval_resampled[i])
-            else: #data queue is empty
-                self.y_queue[i].extend(self.one_t_interval_resampled[i])
-            # set extracted resampled data into the plot curve (for each axis) [x and y will have the same len = (plot len / (time window / times interval(sec)))
-            self.graph_curves[i].setData(x=self.x_data,y=np.array(self.y_queue[i]))
-        self.app_qt.processEvents()
-
-    def add_data(self, data):
+            raw_samples = self.update_y_window(i, ticks)
+            if len(raw_samples) > 0:
+                self.consume_raw_samples(i, raw_samples)
+        frame["x"] = PlotDataPipeline.copy_into(frame.get("x"), self.x_data)
+        frame_y = frame.setdefault("y", dict())
+        if len(frame_y) != self.plot_params.dimension:
+            frame_y.clear()
         for i in range(self.plot_params.dimension):
-            self._data[i].extend(data[i])
\ No newline at end of file
+            frame_y[i] = PlotDataPipeline.copy_into(frame_y.get(i), self.y_queue[i].latest(self.plot_len))
+
+    def render_plot_data(self, frame):
+        # GUI side: set the prepared x/y arrays into the plot curves
+        for i, y in frame["y"].items():
+            if i in self.graph_curves and len(y) == len(frame["x"]):
+                self.graph_curves[i].setData(x=frame["x"], y=y)
+
+    def update_hidden(self):
+        with self.plot_data_lock:
+            super().update_hidden()
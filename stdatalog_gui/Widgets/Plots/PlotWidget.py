@@ -23,6 +23,7 @@ from PySide6.QtUiTools import QUiLoader
 from PySide6.QtWidgets import QApplication
 from PySide6.QtDesigner import QPyDesignerCustomWidgetCollection
 
+import numpy as np
 import pyqtgraph as pg
 
 import stdatalog_gui
@@ -82,6 +83,11 @@ class PlotWidget(QWidget):
         
         self.timer_interval = 0.2
         self.plot_len = 3000
+        # Adaptive resolution: plot_len follows the plot area width (in device pixels)
+        self.adaptive_resolution = True
+        self.points_per_pixel = 2 # a min/max pair for each pixel column
+        self.min_plot_len = 200
+        self.max_plot_len = 8192
         
         self.stop_stream = False
         
@@ -149,53 +155,69 @@ class PlotWidget(QWidget):
                 
         #crosshair label in legend
         self.legend = self.graph_widget.addLegend()
-        style = pg.PlotDataItem(pen='w')
+        self.crosshair_style = pg.PlotDataItem(pen='w')
         self.legend.anchor((0,0), (0,0))
-        self.legend.addItem(style, 'coords')
+        self.legend.addItem(self.crosshair_style, 'coords')
         self.legend.items[0][0].deleteLater()
         
         #crosshair in signalgraph
         crosshair_pen=pg.mkPen(color='#484A4F', style=Qt.DashLine)
-        vLine = pg.InfiniteLine(angle=90, movable=False, pen=crosshair_pen)
-        hLine = pg.InfiniteLine(angle=0, movable=False, pen=crosshair_pen)
-        self.graph_widget.addItem(vLine, ignoreBounds=True)
-        self.graph_widget.addItem(hLine, ignoreBounds=True)
-        
-        # VB
-        vb = self.graph_widget.plotItem.vb
-
-        def mouseMoved(evt):
-            pos = evt
-            if self.graph_widget.sceneBoundingRect().contains(pos):
-                mousePoint = vb.mapSceneToView(pos)
-                if self.legend.getLabel(style) is not None:
-                    self.legend.getLabel(style).setText("""<span style='font-size: 9pt; 
-                                                            color: #20b2aa;
-                                                            font-weight: bold'>
-                                                            x=
-                                                            <span style='color: white;
-                                                            font-weight: normal'>
-                                                            %0.1f,
-                                                            <span style='color: #20b2aa;
-                                                            font-weight: bold;'>
-                                                            y=
-                                                            <span style='color: white;
-                                                            font-weight: normal;'>
-                                                            %0.1f
-                                                    </span>""" % (mousePoint.x(), mousePoint.y()))
-                vLine.setPos(mousePoint.x())
-                hLine.setPos(mousePoint.y())
-        
-        proxy = pg.SignalProxy(self.graph_widget.scene().sigMouseMoved, rateLimit=60, slot=mouseMoved)
-        self.graph_widget.scene().sigMouseMoved.connect(mouseMoved)
+        self.crosshair_v_line = pg.InfiniteLine(angle=90, movable=False, pen=crosshair_pen)
+        self.crosshair_h_line = pg.InfiniteLine(angle=0, movable=False, pen=crosshair_pen)
+        self.graph_widget.addItem(self.crosshair_v_line, ignoreBounds=True)
+        self.graph_widget.addItem(self.crosshair_h_line, ignoreBounds=True)
+        self.crosshair_text = None
+
+        # Mouse move events are coalesced at (at most) the display frame rate: only the last position is processed
+        self.crosshair_proxy = pg.SignalProxy(self.graph_widget.scene().sigMouseMoved, rateLimit=60, slot=self.crosshair_mouse_moved)
         
         self.contents_frame.layout().addWidget(self.graph_widget)
 
+        # Resize events (e.g. while dragging a splitter) are coalesced: plot_area_resized is called once resizing stops
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(150)
+        self.resize_timer.timeout.connect(self.plot_area_resized)
+        self.graph_widget.getPlotItem().vb.sigResized.connect(lambda *args: self.resize_timer.start())
+
         self.timer_interval_ms = self.timer_interval*1000
-        self.timer = QTimer() #to create a thread that calls a function at intervals
-        self.timer.setTimerType(Qt.PreciseTimer)
-        self.timer.timeout.connect(self.update_plot)#the update function keeps getting called at intervals
+        # update_plot is called at timer_interval by the controller render scheduler (shared frame clock)
+        self.timer = self.controller.get_render_scheduler().create_timer(self)
     
+    def crosshair_mouse_moved(self, evt):
+        pos = evt[0]
+        if not self.graph_widget.sceneBoundingRect().contains(pos):
+            return
+        mouse_point = self.graph_widget.plotItem.vb.mapSceneToView(pos)
+        x = mouse_point.x()
+        y = mouse_point.y()
+        self.crosshair_v_line.setPos(x)
+        self.crosshair_h_line.setPos(y)
+        label = self.legend.getLabel(self.crosshair_style)
+        if label is None:
+            return
+        text = """<span style='font-size: 9pt; color: #20b2aa; font-weight: bold'>x=
+                <span style='color: white; font-weight: normal'>%0.1f,</span>
+                y=<span style='color: white; font-weight: normal'>%0.1f</span>""" % (x, y)
+        text += "".join(self.__get_crosshair_values(x)) + "</span>"
+        # The (HTML) label is re-laid out only if the displayed values change
+        if text != self.crosshair_text:
+            label.setText(text)
+            self.crosshair_text = text
+
+    def __get_crosshair_values(self, x):
+        # Value of each visible curve at the crosshair x (curves x data are sorted)
+        values = []
+        for curve in self.graph_widget.getPlotItem().listDataItems():
+            if not curve.isVisible() or curve.xData is None or len(curve.xData) == 0:
+                continue
+            idx = min(int(np.searchsorted(curve.xData, x)), len(curve.xData) - 1)
+            if idx > 0 and x - curve.xData[idx - 1] < curve.xData[idx] - x:
+                idx -= 1
+            color = pg.mkPen(curve.opts['pen']).color().name()
+            values.append(" <span style='color: %s; font-weight: normal'>%0.2f</span>" % (color, curve.yData[idx]))
+        return values
+
     @Slot()
     def clicked_pop_out_button(self):
         if self.is_docked:
@@ -218,6 +240,49 @@ class PlotWidget(QWidget):
     def reset(self):
         pass
     
+    def is_render_visible(self):
+        # False if the widget (or one of its parents, e.g. a not current page of a stacked widget) is hidden,
+        # if its window is minimized or if it is scrolled out of the plots area viewport
+        if not self.isVisible():
+            return False
+        if self.window().isMinimized():
+            return False
+        return not self.visibleRegion().isEmpty()
+
+    def update_hidden(self):
+        # Called by the render scheduler instead of update_plot while the widget is not visible.
+        # Widgets draining their input queues in update_plot override this method to only ingest new data
+        pass
+
+    def get_adaptive_plot_len(self, min_len = 0):
+        """
+        Args:
+            min_len (int): minimum number of points required by the widget
+        Returns:
+            int: number of plotted points matching the plot area width (plot_len if not adaptive or not laid out yet)
+        """
+        if not self.adaptive_resolution:
+            return self.plot_len
+        width = self.graph_widget.getPlotItem().vb.width() * self.graph_widget.devicePixelRatioF()
+        if width <= 0:
+            return self.plot_len
+        plot_len = int(min(max(width * self.points_per_pixel, self.min_plot_len), self.max_plot_len))
+        return max(plot_len, min_len)
+
+    def plot_area_resized(self):
+        # Widgets whose plotted data resolution depends on the plot area size override this method
+        pass
+
+    def get_skipped_frames_count(self):
+        # Widgets displaying only the latest (or the mean) of the received frames (see FrameSlot) override this
+        # method: the count is reported in the render scheduler statistics
+        return 0
+
+    def has_new_data(self):
+        # Widgets able to tell if new data have been received since the last update_plot call override this
+        # method, so that the render scheduler can skip them
+        return True
+
     @abstractmethod
     def update_plot(self):
         pass
@@ -3,6 +3,7 @@ from PySide6.QtGui import QPixmap
 from stdatalog_gui.STDTDL_Controller import STDTDL_Controller
 from stdatalog_gui.UI.styles import STDTDL_PushButton
 from stdatalog_gui.Utils.PlotParams import LinesPlotParams, PlotLabelParams
+from stdatalog_gui.Utils.Decimator import DecimationMode
 from stdatalog_gui.Widgets.Plots.PlotWidget import PlotWidget
 from stdatalog_gui.Widgets.Plots.LabelPlotWidget import LabelPlotWidget
 from stdatalog_gui.Widgets.Plots.PlotLinesWidget import PlotLinesWidget
@@ -31,10 +32,11 @@ class PluginPlotWidget:
             PluginPlotWidget._add_plugin_icon(self.title_frame)
     class LinesWidget(PlotLinesWidget):
         
-        def __init__(self, plot_name, dimension, unit="", p_id=0, parent=None):
+        def __init__(self, plot_name, dimension, unit="", p_id=0, parent=None, decimation_mode=DecimationMode.MINMAX):
             self.controller = STDTDL_Controller()
             plot_params = LinesPlotParams(plot_name, True, dimension, unit)
             super().__init__(self.controller, plot_name, plot_name, plot_params, p_id, parent)
+            self.set_decimation_mode(decimation_mode)
             PluginPlotWidget._add_plugin_icon(self.title_frame)
     class LabelWidget(LabelPlotWidget):
         